@@ -110,7 +110,7 @@ def create_app():
     current_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(current_dir)
     db_path = os.path.join(project_root, 'database', 'dr_resume_dev.db')
-    upload_path = os.path.join(project_root, 'uploads')
+    upload_path = os.getenv('UPLOAD_FOLDER', os.path.join(project_root, 'uploads'))
 
     # Get environment variables with explicit debugging
     secret_key = os.getenv('SECRET_KEY', 'dev-secret-key')
@@ -141,6 +141,24 @@ def create_app():
     app.config['RESUME_UPLOAD_FOLDER'] = upload_path
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB
 
+    # Parse uploaded resumes on the background worker pool (set to 'false' to process in the request)
+    app.config['ASYNC_UPLOAD_PROCESSING'] = os.getenv('ASYNC_UPLOAD_PROCESSING', 'true').lower() == 'true'
+
+    # Token-bucket limits on expensive routes (bucket storage: RATE_LIMIT_STORAGE)
+    app.config['RATE_LIMIT_ENABLED'] = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+
+    # Reverse proxies in front of the app; their X-Forwarded-* headers give the real
+    # client address, so per-IP limits don't put every caller in the proxy's bucket
+    trusted_proxy_hops = int(os.getenv('TRUSTED_PROXY_HOPS', '0'))
+    if trusted_proxy_hops > 0:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxy_hops, x_proto=trusted_proxy_hops,
+                                x_host=trusted_proxy_hops)
+        print(f"✅ Trusting {trusted_proxy_hops} reverse proxy hop(s) for client addresses")
+
+    # Keep the per-stage analysis timings with each real-time scan in ScanHistory
+    app.config['STORE_STAGE_TIMINGS'] = os.getenv('STORE_STAGE_TIMINGS', 'true').lower() == 'true'
+
     # JWT Configuration
     from datetime import timedelta
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)  # 1 hour
@@ -189,7 +207,7 @@ def create_app():
 
     # Initialize database
     try:
-        from backend.models import db
+        from backend.models import db, sync_schema
         db.init_app(app)
 
         with app.app_context():
@@ -197,6 +215,18 @@ def create_app():
             db.create_all()
             print("✅ Database tables created successfully")
 
+            # Bring tables created by older releases up to date
+            for change in sync_schema():
+                print(f"🔧 Schema updated: {change}")
+
+            # Worker processes forked from a preloaded app (gunicorn --preload) open
+            # their own connections instead of sharing the master's pooled ones
+            if hasattr(os, 'register_at_fork'):
+                def dispose_engine_after_fork():
+                    with app.app_context():
+                        db.engine.dispose(close=False)
+                os.register_at_fork(after_in_child=dispose_engine_after_fork)
+
             # Test database connection
             try:
                 db.session.execute(db.text('SELECT 1'))
@@ -211,6 +241,25 @@ def create_app():
         import traceback
         traceback.print_exc()
 
+    # Validate the local NLTK data once, before any service uses it; extraction
+    # never calls the downloader. NLTK_STRICT=true stops startup when data is missing
+    from backend.services.nlp_resources import nltk_resources
+    if nltk_resources.bootstrap():
+        print(f"⚠️ {nltk_resources.describe_missing()}")
+    else:
+        print("✅ NLTK resources loaded")
+
+    # Load spaCy once here; with gunicorn --preload the workers share it copy-on-write
+    if os.getenv('NLP_PRELOAD', 'true').lower() == 'true':
+        try:
+            from backend.services.nlp_provider import nlp_provider
+            if nlp_provider.preload():
+                print("✅ SpaCy model preloaded")
+            else:
+                print("⚠️ SpaCy model not available - using basic keyword analysis")
+        except Exception as e:
+            print(f"❌ SpaCy preload failed: {e}")
+
     # Register Blueprints with better error handling
     print("🔧 Registering blueprints...")
 
@@ -265,6 +314,29 @@ def create_app():
     except Exception as e:
         print(f"❌ account_bp failed: {e}")
 
+    try:
+        from backend.routes.us06_metrics_routes import metrics_bp
+        app.register_blueprint(metrics_bp)
+        print("✅ metrics_bp registered successfully")
+    except Exception as e:
+        print(f"❌ metrics_bp failed: {e}")
+
+    # Start the upload processing pool and resume jobs interrupted by a restart
+    try:
+        from backend.services.processing_queue import resume_processing_queue
+        resume_processing_queue.init_app(app)
+        print("✅ Upload processing queue initialized")
+    except Exception as e:
+        print(f"❌ Upload processing queue failed: {e}")
+
+    # Corpus-level TF-IDF weights for keyword extraction (fitted in the background on first start)
+    try:
+        from backend.services.tfidf_model import corpus_tfidf_model
+        corpus_tfidf_model.init_app(app)
+        print("✅ TF-IDF model initialized")
+    except Exception as e:
+        print(f"❌ TF-IDF model failed: {e}")
+
     print("✅ Flask app created successfully")
 
     # Add security and cache-control headers to all responses
@@ -0,0 +1,267 @@
+"""
+Deterministic synthetic resume and job description corpus
+Documents are assembled from templates filled with the skill vocabularies the
+extractors themselves use, so every benchmark run with the same seed, size and
+vocabulary processes exactly the same text
+"""
+
+import hashlib
+import random
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Approximate word counts of the named document sizes
+DOCUMENT_SIZES = {
+    'small': 250,
+    'medium': 700,
+    'large': 2500,
+}
+
+FIRST_NAMES = ['Alex', 'Jordan', 'Priya', 'Chen', 'Maria', 'Samuel', 'Aisha', 'Lukas', 'Sofia', 'Kenji']
+LAST_NAMES = ['Rivera', 'Patel', 'Nguyen', 'Okafor', 'Schmidt', 'Kowalski', 'Haddad', 'Tanaka', 'Silva', 'Brown']
+CITIES = ['Austin, TX', 'Seattle, WA', 'Toronto, ON', 'Berlin', 'Bangalore', 'London', 'Remote']
+COMPANIES = ['Northwind Systems', 'Contoso Health', 'Fabrikam Retail', 'Tailspin Logistics',
+             'Adventure Works', 'Globex Analytics', 'Initech Labs', 'Umbrella Fintech']
+UNIVERSITIES = ['State University', 'Institute of Technology', 'City College', 'Polytechnic University']
+DEGREES = ['B.S.', 'M.S.', 'Bachelor', 'Master']
+ROLES = ['Software Engineer', 'Full Stack Developer', 'Backend Engineer', 'Frontend Developer',
+         'Senior .NET Developer', 'Data Engineer', 'DevOps Engineer', 'Platform Engineer']
+DOMAINS = ['payments', 'e-commerce', 'healthcare', 'logistics', 'analytics', 'identity', 'search']
+THINGS = ['a customer portal', 'an internal API gateway', 'a reporting dashboard', 'an order pipeline',
+          'a notification service', 'a document search engine', 'a billing module', 'a mobile backend']
+METRICS = ['page load time', 'infrastructure cost', 'deployment time', 'error rate', 'query latency']
+
+RESUME_BULLETS = [
+    'Built {thing} using {s1} and {s2}, reducing {metric} by {n}%.',
+    'Designed and implemented {s1} services backed by {s2} for {n}k daily users.',
+    'Migrated legacy modules to {s1}, introducing {s2} and {s3} along the way.',
+    'Led a team of {small} engineers, applying {soft} and {soft2} to deliver {thing} on time.',
+    'Automated testing and deployment with {s1} and {s2}, cutting {metric} by {n}%.',
+    'Collaborated with product and design on {thing}; owned the {s1} integration.',
+    'Optimized {s1} queries and caching with {s2}, improving {metric} by {n}%.',
+    'Mentored junior developers on {s1}, code review and {soft}.',
+]
+JD_RESPONSIBILITIES = [
+    'Design, build and maintain {thing} using {s1} and {s2}.',
+    'Own the {s1} codebase and drive improvements to {metric}.',
+    'Work closely with product managers, showing strong {soft} and {soft2}.',
+    'Write clean, tested code with {s1}, {s2} and {s3}.',
+    'Participate in code review, architecture discussions and on-call rotation.',
+    'Improve our CI/CD pipeline built on {s1} and {s2}.',
+]
+JD_REQUIREMENTS = [
+    '{years}+ years of professional experience with {s1}.',
+    'Hands-on experience with {s1} and {s2}.',
+    'Solid understanding of {s1}, {s2} and {s3}.',
+    'Excellent {soft} and {soft2} skills.',
+    'Experience with {s1} in a production environment.',
+]
+
+
+def _unique(terms: Iterable[str]) -> List[str]:
+    """Lowercased terms without duplicates, sorted so the order never depends on hashing"""
+    return sorted({term.strip().lower() for term in terms if term and term.strip()})
+
+
+def load_vocabulary() -> Dict[str, List[str]]:
+    """
+    Skill vocabularies of KeywordParser, AdvancedKeywordExtractor and RealTimeLLMService
+
+    Returns:
+        Dict with 'technical', 'soft' and 'industry' term lists
+    """
+    from backend.services.advanced_keyword_extractor import AdvancedKeywordExtractor
+    from backend.services.enhanced_matching_service import RealTimeLLMService
+    from backend.services.keyword_parser import KeywordParser
+
+    parser = KeywordParser()
+    advanced = AdvancedKeywordExtractor()
+    realtime = RealTimeLLMService()
+
+    soft = _unique(parser.soft_skills + advanced.SOFT_SKILLS)
+    technical = _unique(
+        [skill for skills in parser.technical_skills.values() for skill in skills]
+        + advanced.TECH_KEYWORDS
+        + [term for skill, synonyms in realtime.skill_synonyms.items() for term in [skill, *synonyms]]
+    )
+    return {
+        'technical': [term for term in technical if term not in soft],
+        'soft': soft,
+        'industry': _unique(parser.industry_keywords + advanced.INDUSTRY_TERMS),
+    }
+
+
+def document_words(size: Union[str, int]) -> int:
+    """Target word count of a named size ('small', 'medium', 'large') or an explicit count"""
+    if isinstance(size, int) or str(size).isdigit():
+        return int(size)
+    if size not in DOCUMENT_SIZES:
+        raise ValueError(f"Unknown document size '{size}' (use {', '.join(DOCUMENT_SIZES)} or a word count)")
+    return DOCUMENT_SIZES[size]
+
+
+def corpus_fingerprint(texts: Iterable[str]) -> str:
+    """Short hash identifying a generated corpus, stored with benchmark results"""
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+class CorpusGenerator:
+    """
+    Realistic resumes and job descriptions from a seeded random generator
+
+    A job description draws a skill profile from the technical vocabulary; the
+    resume paired with it shares part of that profile (match_ratio) and fills the
+    rest with other skills, so matching has realistic overlap to work on.
+    """
+
+    def __init__(self, seed: int = 42, vocabulary: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            seed: Random seed; equal seeds and vocabularies give equal corpora
+            vocabulary: Term lists as returned by load_vocabulary() (loaded when omitted)
+        """
+        self.vocabulary = vocabulary or load_vocabulary()
+        self.random = random.Random(seed)
+
+    # ------------------------------------------------------------------
+    # Documents
+    # ------------------------------------------------------------------
+
+    def skill_profile(self, count: int = 20) -> List[str]:
+        """Technical skills one document is about"""
+        return self.random.sample(self.vocabulary['technical'], min(count, len(self.vocabulary['technical'])))
+
+    def resume(self, size: Union[str, int] = 'medium', skills: Optional[List[str]] = None) -> str:
+        """
+        Generate a resume
+
+        Args:
+            size: Named size or approximate word count
+            skills: Technical skills to feature (a random profile when omitted)
+
+        Returns:
+            Resume text
+        """
+        rnd = self.random
+        target = document_words(size)
+        skills = skills or self.skill_profile()
+        name = f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}"
+        role = rnd.choice(ROLES)
+
+        lines = [
+            name,
+            f"{name.lower().replace(' ', '.')}@example.com | +1 555 {rnd.randint(100, 999)} {rnd.randint(1000, 9999)} | {rnd.choice(CITIES)}",
+            '',
+            'PROFESSIONAL SUMMARY',
+            f"{role} with {rnd.randint(2, 15)} years of experience building {rnd.choice(DOMAINS)} systems "
+            f"with {', '.join(skills[:3])}. Known for {self._soft()} and {self._soft()}, "
+            f"with a focus on {self._industry()} and {self._industry()} software.",
+            '',
+            'EXPERIENCE',
+        ]
+        year = 2024
+        while self._words(lines) < target * 0.95:
+            start = year - rnd.randint(1, 4)
+            lines.append(f"{rnd.choice(ROLES)} - {rnd.choice(COMPANIES)} ({start} - {year})")
+            for template in rnd.sample(RESUME_BULLETS, rnd.randint(3, 6)):
+                lines.append('- ' + self._fill(template, skills))
+            lines.append('')
+            year = start
+
+        lines += [
+            'EDUCATION',
+            f"{rnd.choice(DEGREES)} in Computer Science, {rnd.choice(UNIVERSITIES)}, {year - rnd.randint(0, 3)}",
+            '',
+            'SKILLS',
+            ', '.join(skills),
+            ', '.join(self.random.sample(self.vocabulary['soft'], 6)),
+        ]
+        return '\n'.join(lines)
+
+    def job_description(self, size: Union[str, int] = 'medium', skills: Optional[List[str]] = None) -> str:
+        """
+        Generate a job description
+
+        Args:
+            size: Named size or approximate word count
+            skills: Technical skills the role asks for (a random profile when omitted)
+
+        Returns:
+            Job description text
+        """
+        rnd = self.random
+        target = document_words(size)
+        skills = skills or self.skill_profile()
+        role = rnd.choice(ROLES)
+
+        lines = [
+            role,
+            f"{rnd.choice(COMPANIES)} - {rnd.choice(CITIES)}",
+            '',
+            'About the role',
+            f"We are looking for a {role} to join our {rnd.choice(DOMAINS)} team and help us build "
+            f"{rnd.choice(THINGS)} with {', '.join(skills[:4])}.",
+            '',
+        ]
+        sections = [('Responsibilities', JD_RESPONSIBILITIES), ('Requirements', JD_REQUIREMENTS),
+                    ('Nice to have', JD_REQUIREMENTS)]
+        while self._words(lines) < target * 0.95:
+            for title, templates in sections:
+                lines.append(title)
+                for template in rnd.sample(templates, rnd.randint(3, len(templates))):
+                    lines.append('- ' + self._fill(template, skills))
+                lines.append('')
+                if self._words(lines) >= target * 0.95:
+                    break
+
+        lines.append(f"We value {self._soft()}, {self._soft()} and {self._industry()}.")
+        return '\n'.join(lines)
+
+    def pairs(self, count: int, size: Union[str, int] = 'medium',
+              match_ratio: float = 0.6) -> List[Tuple[str, str]]:
+        """
+        Generate (resume, job description) pairs with overlapping skills
+
+        Args:
+            count: Number of pairs
+            size: Named size or approximate word count of every document
+            match_ratio: Share of the job's skills the resume also features
+
+        Returns:
+            List of (resume text, job description text)
+        """
+        pairs = []
+        for _ in range(count):
+            jd_skills = self.skill_profile()
+            shared = jd_skills[:int(len(jd_skills) * match_ratio)]
+            others = [s for s in self.skill_profile() if s not in shared]
+            resume_skills = shared + others[:len(jd_skills) - len(shared)]
+            self.random.shuffle(resume_skills)
+            pairs.append((self.resume(size, resume_skills), self.job_description(size, jd_skills)))
+        return pairs
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _soft(self) -> str:
+        return self.random.choice(self.vocabulary['soft'])
+
+    def _industry(self) -> str:
+        return self.random.choice(self.vocabulary['industry'])
+
+    def _fill(self, template: str, skills: List[str]) -> str:
+        rnd = self.random
+        s1, s2, s3 = rnd.sample(skills, 3)
+        return template.format(
+            s1=s1, s2=s2, s3=s3, soft=self._soft(), soft2=self._soft(), thing=rnd.choice(THINGS),
+            metric=rnd.choice(METRICS), n=rnd.randint(10, 80), small=rnd.randint(3, 9),
+            years=rnd.randint(2, 8)
+        )
+
+    @staticmethod
+    def _words(lines: List[str]) -> int:
+        return sum(len(line.split()) for line in lines)
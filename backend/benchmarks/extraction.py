@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Extraction and analysis benchmark suite
+
+Times the keyword extractors and analysis services on a deterministic synthetic
+corpus (see corpus.py) and compares the run with a saved baseline:
+
+    keyword_parser.extract_keywords                    one resume or JD per call
+    advanced_extractor.extract_keywords_comprehensive  one resume or JD per call
+    realtime.analyze_resume_realtime                   one resume/JD pair per call
+    suggestions.generate_basic_suggestions             one stored resume/JD pair per call
+
+Every call gets a document no earlier call has seen, so the per-text caches of
+the services never turn a measurement into a cache hit. The app runs against a
+temporary SQLite database and a TF-IDF model fitted on a separate generated corpus.
+
+Usage:
+    python -m backend.benchmarks.extraction
+    python -m backend.benchmarks.extraction --size large --documents 50 --output results.json
+    python -m backend.benchmarks.extraction --save-baseline      # on the reference machine
+    python -m backend.benchmarks.extraction --tolerance 0.3      # exit status 1 on regressions
+
+Baselines are only comparable on the same hardware and configuration; they are
+stored in backend/benchmarks/baselines/ unless --baseline points elsewhere.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+
+# Add the project root to Python path for imports
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.benchmarks.corpus import CorpusGenerator, corpus_fingerprint, load_vocabulary
+from backend.benchmarks.fixtures import create_benchmark_app, fit_tfidf_model, seed_user
+from backend.benchmarks.harness import (
+    baseline_mismatches, build_report, compare_to_baseline, default_baseline_path,
+    load_report, print_results, time_calls, write_report
+)
+
+SUITE = 'extraction'
+BENCHMARKS = (
+    'keyword_parser.extract_keywords',
+    'advanced_extractor.extract_keywords_comprehensive',
+    'realtime.analyze_resume_realtime',
+    'suggestions.generate_basic_suggestions',
+)
+
+
+def text_calls(generator: CorpusGenerator, count: int, size) -> list:
+    """Alternating resume and job description texts, one argument tuple per call"""
+    calls = []
+    for resume, job_description in generator.pairs((count + 1) // 2, size):
+        calls += [(resume,), (job_description,)]
+    return calls[:count]
+
+
+def suggestions_benchmark(app, service):
+    """generate_basic_suggestions inside an app context, as the route runs it"""
+    def generate(resume_id, job_description_id, user_id):
+        with app.app_context():
+            return service.generate_basic_suggestions(resume_id, job_description_id, user_id)
+    return generate
+
+
+def run(args) -> dict:
+    """Run the selected benchmarks; returns the report"""
+    temp_dir = tempfile.TemporaryDirectory()
+    try:
+        app = create_benchmark_app(temp_dir.name, ASYNC_UPLOAD_PROCESSING='false')
+
+        from backend.services.advanced_keyword_extractor import AdvancedKeywordExtractor
+        from backend.services.dynamic_suggestions_service import DynamicSuggestionsService
+        from backend.services.enhanced_matching_service import RealTimeLLMService
+        from backend.services.processing_queue import get_keyword_parser
+
+        vocabulary = load_vocabulary()
+        fit_tfidf_model(vocabulary, args.seed + 1, args.size)
+
+        generator = CorpusGenerator(args.seed, vocabulary)
+        selected = [name for name in BENCHMARKS if not args.only or name in args.only]
+        measured, texts = {}, []
+
+        for name in selected:
+            # Inputs are generated in a fixed order, so each benchmark sees the same documents every run
+            if name == 'keyword_parser.extract_keywords':
+                function = get_keyword_parser().extract_keywords
+                calls = text_calls(generator, args.warmup + args.documents, args.size)
+                documents = [text for (text,) in calls]
+            elif name == 'advanced_extractor.extract_keywords_comprehensive':
+                function = AdvancedKeywordExtractor().extract_keywords_comprehensive
+                calls = text_calls(generator, args.warmup + args.documents, args.size)
+                documents = [text for (text,) in calls]
+            elif name == 'realtime.analyze_resume_realtime':
+                function = RealTimeLLMService().analyze_resume_realtime
+                calls = generator.pairs(args.warmup + args.documents, args.size)
+                documents = [text for pair in calls for text in pair]
+            else:
+                pairs = generator.pairs(args.warmup + args.documents, args.size)
+                user_id, stored = seed_user(app, 'benchmark@example.com', pairs)
+                calls = [(resume_id, jd_id, user_id) for resume_id, jd_id in stored]
+                documents = [text for pair in pairs for text in pair]
+                function = suggestions_benchmark(app, DynamicSuggestionsService())
+
+            texts += documents
+            print(f"⏱️  {name} ({args.documents} calls)...", file=sys.stderr)
+            measured[name] = time_calls(function, calls[args.warmup:], warmup=calls[:args.warmup])
+
+        config = {
+            'seed': args.seed,
+            'size': args.size,
+            'documents': args.documents,
+            'warmup': args.warmup,
+            'corpus_fingerprint': corpus_fingerprint(texts),
+        }
+        return build_report(SUITE, config, measured)
+    finally:
+        temp_dir.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extraction and analysis benchmark suite')
+    parser.add_argument('--size', default='medium', help='small, medium, large or a word count (default medium)')
+    parser.add_argument('--documents', type=int, default=20, help='measured calls per benchmark (default 20)')
+    parser.add_argument('--warmup', type=int, default=3, help='unmeasured calls first (default 3)')
+    parser.add_argument('--seed', type=int, default=42, help='corpus seed (default 42)')
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help='run only these benchmarks')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help=f'baseline file (default {default_baseline_path(SUITE)})')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative slowdown before a regression is reported (default 0.25)')
+    args = parser.parse_args()
+
+    # Service logging would drown the report
+    logging.disable(logging.WARNING)
+    report = run(args)
+    logging.disable(logging.NOTSET)
+
+    baseline_path = args.baseline or default_baseline_path(SUITE)
+    baseline = None if args.save_baseline else load_report(baseline_path)
+
+    print_results(report['results'], baseline)
+    if args.output:
+        write_report(report, args.output)
+        print(f"\n📄 Results written to {args.output}")
+
+    if args.save_baseline:
+        write_report(report, baseline_path)
+        print(f"\n📌 Baseline saved to {baseline_path}")
+        return 0
+    if baseline is None:
+        print(f"\nℹ️ No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+
+    for note in baseline_mismatches(report, baseline):
+        print(f"⚠️ Not comparable with the baseline: {note}")
+    regressions = compare_to_baseline(report, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"❌ Regression: {regression}")
+    if not regressions:
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%} against {baseline_path}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
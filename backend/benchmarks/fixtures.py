@@ -0,0 +1,109 @@
+"""
+App and data setup shared by the benchmark suites
+The app runs against a throwaway SQLite database, upload folder and TF-IDF model
+inside a temporary directory, seeded with generated documents stored the way
+uploads store them
+"""
+
+import contextlib
+import io
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend.benchmarks.corpus import CorpusGenerator
+
+# Generated resume/JD pairs the TF-IDF model is fitted on before timing
+TFIDF_TRAINING_PAIRS = 50
+BENCHMARK_PASSWORD = 'Benchmark-Passw0rd!'
+
+
+def benchmark_environment(temp_dir: str) -> Dict[str, str]:
+    """Environment variables pointing every persistent store of the app into temp_dir"""
+    return {
+        'DATABASE_URL': f"sqlite:///{os.path.join(temp_dir, 'benchmark.db')}",
+        'UPLOAD_FOLDER': os.path.join(temp_dir, 'uploads'),
+        'TFIDF_MODEL_PATH': os.path.join(temp_dir, 'tfidf_model.joblib'),
+        'TFIDF_BUILD_ON_START': 'false',
+    }
+
+
+def create_benchmark_app(temp_dir: str, **environment):
+    """
+    create_app() with nothing shared outside temp_dir
+
+    Args:
+        temp_dir: Directory holding the database, uploads and TF-IDF model
+        **environment: Further environment variables, e.g. ASYNC_UPLOAD_PROCESSING='false'
+
+    Returns:
+        Flask app
+    """
+    os.environ.update(benchmark_environment(temp_dir))
+    os.environ.update(environment)
+    os.environ.pop('ANALYSIS_CACHE_DB', None)  # a shared cache tier would turn calls into hits
+
+    # create_app() is chatty; only the results go to stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        from backend.app import create_app
+        return create_app()
+
+
+def fit_tfidf_model(vocabulary: Dict[str, List[str]], seed: int, size) -> None:
+    """Fit the TF-IDF model on a generated corpus separate from the measured documents"""
+    from backend.services.tfidf_model import corpus_tfidf_model, TFIDF_MODEL_AVAILABLE
+
+    if TFIDF_MODEL_AVAILABLE:
+        training = CorpusGenerator(seed, vocabulary).pairs(TFIDF_TRAINING_PAIRS, size)
+        corpus_tfidf_model.rebuild(text for pair in training for text in pair)
+
+
+def seed_user(app, email: str, pairs: Sequence[Tuple[str, str]],
+              role: str = 'basic', free_scans: Optional[int] = None) -> Tuple[int, List[Tuple[int, int]]]:
+    """
+    Create a user (password BENCHMARK_PASSWORD) owning resume/JD pairs stored the
+    way uploads store them, keywords and analysis artifacts included
+
+    Args:
+        app: Flask app
+        email: Login of the user (reused if it exists)
+        pairs: (resume text, job description text) to store
+        role: 'basic', 'premium' or 'admin'
+        free_scans: Scans the user may run (the model default when omitted)
+
+    Returns:
+        Tuple of (user id, [(resume id, job description id), ...])
+    """
+    from backend.models import db, User, Resume, JobDescription
+    from backend.services.document_analysis import refresh_analysis_artifacts
+    from backend.services.processing_queue import get_keyword_parser
+
+    parser = get_keyword_parser()
+    with app.app_context():
+        user = User.query.filter_by(email=email).first()
+        if user is None:
+            user = User(first_name='Bench', last_name='Mark', email=email, password=BENCHMARK_PASSWORD)
+            user.role = role
+            db.session.add(user)
+            db.session.flush()
+        if free_scans is not None:
+            user.free_scans_remaining = free_scans
+
+        documents = []
+        for i, (resume_text, jd_text) in enumerate(pairs):
+            resume = Resume(user_id=user.id, original_filename=f'resume{i}.pdf',
+                            file_path=f'/tmp/resume{i}.pdf', file_size=len(resume_text), file_type='pdf')
+            resume.extracted_text = resume_text
+            resume.upload_status = 'completed'
+            job_description = JobDescription(user_id=user.id, title=f'Role {i}', job_text=jd_text)
+            for document, text in ((resume, resume_text), (job_description, jd_text)):
+                keywords = parser.extract_keywords(text)
+                document.set_keywords(technical_skills=keywords['technical_skills'],
+                                      soft_skills=keywords['soft_skills'],
+                                      other_keywords=keywords['other_keywords'])
+            documents.append((resume, job_description))
+
+        db.session.add_all([document for pair in documents for document in pair])
+        db.session.flush()
+        refresh_analysis_artifacts([document for pair in documents for document in pair])
+        db.session.commit()
+        return user.id, [(resume.id, job_description.id) for resume, job_description in documents]
@@ -0,0 +1,210 @@
+"""
+Benchmark timing, result files and baseline comparison
+Shared by the benchmark suites: latency samples are summarized into throughput
+and percentiles, written as JSON together with the run configuration, and
+compared against a baseline saved from an earlier run on the same hardware
+"""
+
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Metrics a regression is reported on, with the direction that is better
+GATED_METRICS = {
+    'p50_ms': 'lower',
+    'throughput_per_s': 'higher',
+}
+# Reported next to the gated metrics, but too noisy on small samples to fail a run
+INFORMATIONAL_METRICS = ('p99_ms',)
+
+# Columns of the printed results table
+DEFAULT_COLUMNS = ('calls', 'throughput_per_s', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms')
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Percentile with linear interpolation between the closest ranks
+
+    Args:
+        sorted_values: Samples in ascending order
+        q: Percentile between 0 and 100
+
+    Returns:
+        Interpolated value (0.0 for no samples)
+    """
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(durations: Sequence[float], wall_seconds: Optional[float] = None) -> Dict:
+    """
+    Throughput and latency distribution of a list of call durations
+
+    Args:
+        durations: Seconds per call
+        wall_seconds: Elapsed time of the whole run (sum of durations when omitted;
+                      pass it for concurrent runs, where calls overlap)
+
+    Returns:
+        Dict with calls, throughput_per_s and mean/min/p50/p90/p99/max in milliseconds
+    """
+    samples = sorted(durations)
+    if wall_seconds is None:
+        wall_seconds = sum(samples)
+    to_ms = 1000.0
+    return {
+        'calls': len(samples),
+        'throughput_per_s': round(len(samples) / wall_seconds, 3) if wall_seconds else 0.0,
+        'mean_ms': round(sum(samples) / len(samples) * to_ms, 3) if samples else 0.0,
+        'min_ms': round(samples[0] * to_ms, 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50) * to_ms, 3),
+        'p90_ms': round(percentile(samples, 90) * to_ms, 3),
+        'p99_ms': round(percentile(samples, 99) * to_ms, 3),
+        'max_ms': round(samples[-1] * to_ms, 3) if samples else 0.0,
+    }
+
+
+def time_calls(function: Callable, calls: Sequence[tuple], warmup: Sequence[tuple] = ()) -> Dict:
+    """
+    Call a function once per argument tuple and summarize the durations
+
+    Args:
+        function: Code under test
+        calls: Argument tuples of the measured calls
+        warmup: Argument tuples of unmeasured calls made first
+
+    Returns:
+        summarize() of the measured calls
+    """
+    for args in warmup:
+        function(*args)
+
+    gc.collect()
+    durations = []
+    started = time.perf_counter()
+    for args in calls:
+        call_started = time.perf_counter()
+        function(*args)
+        durations.append(time.perf_counter() - call_started)
+    return summarize(durations, time.perf_counter() - started)
+
+
+def environment() -> Dict:
+    """Host description stored with results; baselines are only comparable on the same one"""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def build_report(suite: str, config: Dict, results: Dict[str, Dict]) -> Dict:
+    """Machine-readable report of one run"""
+    return {
+        'suite': suite,
+        'created_at': datetime.utcnow().isoformat() + 'Z',
+        'environment': environment(),
+        'config': config,
+        'results': results,
+    }
+
+
+def write_report(report: Dict, path: str) -> None:
+    """Write a report (or baseline) as JSON, creating the directory"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_report(path: str) -> Optional[Dict]:
+    """Saved report, or None when the file does not exist"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def default_baseline_path(suite: str) -> str:
+    """backend/benchmarks/baselines/<suite>.json"""
+    return os.path.join(BASELINE_DIR, f'{suite}.json')
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Regressions of a run against a baseline
+
+    Args:
+        report: Current run (build_report)
+        baseline: Earlier run of the same suite
+        tolerance: Allowed relative slowdown, e.g. 0.25 for 25%
+
+    Returns:
+        One message per benchmark and gated metric that got worse than allowed
+    """
+    regressions = []
+    for name, current in sorted(report['results'].items()):
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        for metric, better in GATED_METRICS.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            if better == 'lower':
+                worse = new > old * (1 + tolerance)
+            else:
+                worse = new < old / (1 + tolerance)
+            if worse:
+                regressions.append(f"{name}: {metric} {old:g} -> {new:g} ({(new - old) / old:+.0%})")
+    return regressions
+
+
+def baseline_mismatches(report: Dict, baseline: Dict) -> List[str]:
+    """Differences in configuration or host that make a comparison unreliable"""
+    notes = []
+    for key in sorted(set(report['config']) | set(baseline.get('config', {}))):
+        if report['config'].get(key) != baseline.get('config', {}).get(key):
+            notes.append(f"config {key}: baseline {baseline.get('config', {}).get(key)!r}, "
+                         f"now {report['config'].get(key)!r}")
+    for key in ('python', 'machine', 'cpu_count'):
+        if report['environment'].get(key) != baseline.get('environment', {}).get(key):
+            notes.append(f"{key}: baseline {baseline.get('environment', {}).get(key)!r}, "
+                         f"now {report['environment'].get(key)!r}")
+    return notes
+
+
+def print_results(results: Dict[str, Dict], baseline: Optional[Dict] = None, stream=None,
+                  columns: Sequence[str] = DEFAULT_COLUMNS) -> None:
+    """Human-readable table of a run, with the change against the baseline when given"""
+    stream = stream or sys.stdout
+    width = max([len(name) for name in results] + [9])
+    print(f"{'benchmark':<{width}}  " + '  '.join(f'{c:>16}' for c in columns), file=stream)
+    for name, result in results.items():
+        cells = []
+        previous = (baseline or {}).get('results', {}).get(name, {})
+        for column in columns:
+            value = result.get(column, 0)
+            cell = f'{value:g}'
+            if column in GATED_METRICS or column in INFORMATIONAL_METRICS:
+                if previous.get(column):
+                    cell += f' ({(value - previous[column]) / previous[column]:+.0%})'
+            cells.append(f'{cell:>16}')
+        print(f"{name:<{width}}  " + '  '.join(cells), file=stream)
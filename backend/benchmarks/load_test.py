@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+HTTP load test of the Flask app
+
+Starts create_app() on a temporary SQLite database, seeds users (with enough free
+scans for any run) owning generated resumes and job descriptions, serves the app
+on a local port and drives mixed traffic from concurrent virtual users over real
+HTTP:
+
+    login              POST /api/login
+    upload_resume      POST /api/upload_resume (generated DOCX)
+    analyze_realtime   POST /api/analyze_realtime
+    calculate_match    POST /api/calculate_match
+    basic_suggestions  POST /api/basic_suggestions
+    history            GET  /api/history (keyset paging, following next_cursor)
+
+Each virtual user logs in once, then picks operations at random with the
+weights of --mix until --duration seconds or --requests requests are done.
+Throughput and latency percentiles are reported per endpoint.
+
+The app is served by a threaded werkzeug server in this process, or with
+--server gunicorn by gunicorn worker processes (--workers, --threads), which is
+what capacity planning for a gunicorn fleet needs. Rate limits are disabled
+unless --rate-limits is given.
+
+Usage:
+    python -m backend.benchmarks.load_test
+    python -m backend.benchmarks.load_test --concurrency 16 --duration 60 --output load.json
+    python -m backend.benchmarks.load_test --server gunicorn --workers 4 --concurrency 32
+    python -m backend.benchmarks.load_test --mix analyze_realtime=1,history=1 --requests 500
+"""
+
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+# Add the project root to Python path for imports
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.benchmarks.corpus import CorpusGenerator, load_vocabulary
+from backend.benchmarks.fixtures import BENCHMARK_PASSWORD, create_benchmark_app, fit_tfidf_model, seed_user
+from backend.benchmarks.harness import build_report, print_results, summarize, write_report
+
+SUITE = 'load_test'
+OPERATIONS = ('login', 'upload_resume', 'analyze_realtime', 'calculate_match', 'basic_suggestions', 'history')
+DEFAULT_MIX = 'login=1,upload_resume=1,analyze_realtime=3,calculate_match=4,basic_suggestions=3,history=4'
+RESULT_COLUMNS = ('calls', 'errors', 'throughput_per_s', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms')
+HISTORY_PAGE_SIZE = 10
+# Free scans of every seeded user, so analyze_realtime never runs out during a run
+UNLIMITED_SCANS = 10 ** 9
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+DOCX_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def docx_bytes(text: str) -> bytes:
+    """Minimal DOCX file with one paragraph per line of text"""
+    paragraphs = ''.join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in text.split('\n')
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr('[Content_Types].xml', DOCX_CONTENT_TYPES)
+        docx.writestr('_rels/.rels', DOCX_RELATIONSHIPS)
+        docx.writestr('word/document.xml', document)
+    return buffer.getvalue()
+
+
+def multipart_body(fields: Dict[str, str], file_field: str, filename: str, content: bytes) -> Tuple[bytes, str]:
+    """multipart/form-data body and its Content-Type header"""
+    boundary = uuid.uuid4().hex
+    parts = [
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields.items()
+    ]
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+        f'Content-Type: application/vnd.openxmlformats-officedocument.wordprocessingml.document\r\n\r\n'.encode()
+        + content + b'\r\n'
+    )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """'login=1,history=4' -> {'login': 1.0, 'history': 4.0}"""
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}' (use {', '.join(OPERATIONS)})")
+        weights[name] = float(weight or 1)
+    if not any(weights.values()):
+        raise ValueError('The traffic mix needs at least one operation with a positive weight')
+    return weights
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+# ----------------------------------------------------------------------
+# Servers
+# ----------------------------------------------------------------------
+
+class WerkzeugServer:
+    """The app on a threaded werkzeug server in this process"""
+
+    def __init__(self, app):
+        from werkzeug.serving import make_server
+        self._server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, name='load-test-server', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+
+
+class GunicornServer:
+    """The app in gunicorn worker processes sharing the benchmark database"""
+
+    def __init__(self, workers: int, threads: int, log_path: str):
+        self.port = free_port()
+        self.workers = workers
+        self.threads = threads
+        self.log_path = log_path
+        self._process = None
+        self._log = None
+
+    def start(self, timeout: float = 120):
+        command = [sys.executable, '-m', 'gunicorn', '--preload', '--workers', str(self.workers),
+                   '--bind', f'127.0.0.1:{self.port}', '--timeout', '120']
+        if self.threads > 1:
+            command += ['--worker-class', 'gthread', '--threads', str(self.threads)]
+        self._log = open(self.log_path, 'w')
+        self._process = subprocess.Popen(command + ['backend.app:create_app()'], cwd=project_root,
+                                         stdout=self._log, stderr=subprocess.STDOUT, env=dict(os.environ))
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f'gunicorn exited with status {self._process.returncode}, see {self.log_path}')
+            try:
+                with socket.create_connection(('127.0.0.1', self.port), timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f'gunicorn did not start within {timeout:.0f}s, see {self.log_path}')
+
+    def stop(self):
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        if self._log is not None:
+            self._log.close()
+
+
+# ----------------------------------------------------------------------
+# Traffic
+# ----------------------------------------------------------------------
+
+class Recorder:
+    """Durations and status codes per operation, shared by the virtual users"""
+
+    def __init__(self):
+        self.durations = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, seconds: float, status) -> None:
+        with self._lock:
+            self.durations[operation].append(seconds)
+            self.statuses[operation][str(status)] += 1
+
+    def results(self, wall_seconds: float) -> Dict[str, Dict]:
+        """summarize() per operation plus 'all', with error counts and status codes"""
+        results = {}
+        everything, all_statuses = [], Counter()
+        for operation in OPERATIONS:
+            if operation not in self.durations:
+                continue
+            everything += self.durations[operation]
+            all_statuses.update(self.statuses[operation])
+            results[operation] = self._summary(self.durations[operation], self.statuses[operation], wall_seconds)
+        results['all'] = self._summary(everything, all_statuses, wall_seconds)
+        return results
+
+    @staticmethod
+    def _summary(durations: List[float], statuses: Counter, wall_seconds: float) -> Dict:
+        summary = summarize(durations, wall_seconds)
+        summary['errors'] = sum(count for status, count in statuses.items() if not status.startswith('2'))
+        summary['status_codes'] = dict(sorted(statuses.items()))
+        return summary
+
+
+class Budget:
+    """Requests left across all virtual users (unlimited when total is None)"""
+
+    def __init__(self, total: Optional[int]):
+        self.left = total
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        if self.left is None:
+            return True
+        with self._lock:
+            if self.left <= 0:
+                return False
+            self.left -= 1
+            return True
+
+
+class VirtualUser:
+    """One client session: an account, its stored documents and a token"""
+
+    def __init__(self, port: int, account: Dict, texts: List[Tuple[str, str]], uploads: List[bytes],
+                 rnd: random.Random, recorder: Optional[Recorder], timeout: float):
+        self.port = port
+        self.account = account
+        self.texts = texts
+        self.uploads = uploads
+        self.random = rnd
+        self.recorder = recorder
+        self.timeout = timeout
+        self.token = None
+        self.history_cursor = ''
+
+    def request(self, operation: str, method: str, path: str, body=None,
+                content_type: str = 'application/json') -> Tuple[object, Optional[Dict]]:
+        """Send one request on a new connection, recording its latency and status"""
+        headers = {}
+        if body is not None:
+            if content_type == 'application/json':
+                body = json.dumps(body).encode()
+            headers['Content-Type'] = content_type
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+
+        started = time.perf_counter()
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=self.timeout)
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException) as e:
+            payload, status = None, type(e).__name__
+        finally:
+            connection.close()
+        if self.recorder is not None:
+            self.recorder.record(operation, time.perf_counter() - started, status)
+
+        try:
+            return status, json.loads(payload) if payload else None
+        except ValueError:
+            return status, None
+
+    def login(self):
+        self.token = None
+        _, body = self.request('login', 'POST', '/api/login',
+                               {'email': self.account['email'], 'password': BENCHMARK_PASSWORD})
+        self.token = ((body or {}).get('tokens') or {}).get('access_token')
+
+    def upload_resume(self):
+        content = self.random.choice(self.uploads)
+        body, content_type = multipart_body({'title': 'Load test resume'}, 'resume', 'resume.docx', content)
+        self.request('upload_resume', 'POST', '/api/upload_resume', body, content_type)
+
+    def analyze_realtime(self):
+        resume_text, jd_text = self.random.choice(self.texts)
+        self.request('analyze_realtime', 'POST', '/api/analyze_realtime',
+                     {'resume_text': resume_text, 'job_description_text': jd_text})
+
+    def calculate_match(self):
+        resume_id, jd_id = self.random.choice(self.account['documents'])
+        self.request('calculate_match', 'POST', '/api/calculate_match',
+                     {'resume_id': resume_id, 'job_description_id': jd_id})
+
+    def basic_suggestions(self):
+        resume_id, jd_id = self.random.choice(self.account['documents'])
+        self.request('basic_suggestions', 'POST', '/api/basic_suggestions',
+                     {'resume_id': resume_id, 'job_description_id': jd_id})
+
+    def history(self):
+        _, body = self.request('history', 'GET',
+                               f'/api/history?per_page={HISTORY_PAGE_SIZE}&cursor={self.history_cursor}')
+        # Page through the history, starting over after the last page
+        self.history_cursor = ((body or {}).get('pagination') or {}).get('next_cursor') or ''
+
+
+def run_virtual_user(index: int, args, port: int, accounts: List[Dict], texts, uploads, weights: Dict[str, float],
+                     recorder: Recorder, budget: Budget, start: threading.Barrier, deadline: List[float]) -> None:
+    rnd = random.Random(args.seed * 1000 + index)
+    user = VirtualUser(port, accounts[index % len(accounts)], texts, uploads, rnd, None, args.timeout)
+    operations, operation_weights = list(weights), list(weights.values())
+
+    # Unrecorded warm-up requests, so lazily initialized code is not measured
+    try:
+        user.login()
+        for _ in range(args.warmup):
+            getattr(user, rnd.choices(operations, operation_weights)[0])()
+    except Exception:
+        start.abort()  # fail the run instead of leaving the others waiting
+        raise
+    start.wait()
+
+    user.recorder = recorder
+    user.login()
+    while time.monotonic() < deadline[0] and budget.take():
+        getattr(user, rnd.choices(operations, operation_weights)[0])()
+
+
+def run(args) -> Dict:
+    """Seed, serve and drive the app; returns the report"""
+    weights = parse_mix(args.mix)
+    temp_dir = tempfile.TemporaryDirectory()
+    server = None
+    try:
+        # Uploads are parsed on the background pool, as in production
+        app = create_benchmark_app(temp_dir.name, ASYNC_UPLOAD_PROCESSING='true',
+                                   RATE_LIMIT_ENABLED='true' if args.rate_limits else 'false')
+
+        print('🌱 Seeding users and documents...', file=sys.stderr)
+        vocabulary = load_vocabulary()
+        fit_tfidf_model(vocabulary, args.seed + 1, args.size)
+        generator = CorpusGenerator(args.seed, vocabulary)
+        accounts = []
+        for u in range(args.users):
+            email = f'load-test-{u}@example.com'
+            _, documents = seed_user(app, email, generator.pairs(args.documents, args.size),
+                                     free_scans=UNLIMITED_SCANS)
+            accounts.append({'email': email, 'documents': documents})
+        texts = generator.pairs(args.text_pool, args.size)
+        uploads = [docx_bytes(resume) for resume, _ in texts[:max(1, args.text_pool // 4)]]
+
+        if args.server == 'gunicorn':
+            server = GunicornServer(args.workers, args.threads, os.path.join(temp_dir.name, 'gunicorn.log'))
+        else:
+            server = WerkzeugServer(app)
+        server.start()
+        print(f"🚀 {args.concurrency} virtual users against {args.server} on port {server.port}...", file=sys.stderr)
+
+        recorder, budget = Recorder(), Budget(args.requests)
+        start = threading.Barrier(args.concurrency + 1)
+        deadline = [float('inf')]
+        threads = [
+            threading.Thread(target=run_virtual_user, name=f'virtual-user-{i}', daemon=True,
+                             args=(i, args, server.port, accounts, texts, uploads, weights,
+                                   recorder, budget, start, deadline))
+            for i in range(args.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        started = time.monotonic()
+        if args.requests is None:
+            deadline[0] = started + args.duration
+        for thread in threads:
+            thread.join()
+        wall_seconds = time.monotonic() - started
+
+        config = {
+            'server': args.server,
+            'workers': args.workers if args.server == 'gunicorn' else 1,
+            'threads': args.threads if args.server == 'gunicorn' else None,
+            'concurrency': args.concurrency,
+            'duration_s': round(wall_seconds, 3),
+            'requests': args.requests,
+            'mix': weights,
+            'users': args.users,
+            'documents_per_user': args.documents,
+            'size': args.size,
+            'rate_limits': args.rate_limits,
+            'seed': args.seed,
+        }
+        return build_report(SUITE, config, recorder.results(wall_seconds))
+    finally:
+        if server is not None:
+            server.stop()
+        temp_dir.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP load test of the Flask app')
+    parser.add_argument('--concurrency', type=int, default=8, help='virtual users (default 8)')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of traffic (default 30)')
+    parser.add_argument('--requests', type=int, help='stop after this many requests instead of --duration')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'operation weights (default {DEFAULT_MIX})')
+    parser.add_argument('--users', type=int, default=4, help='seeded accounts (default 4)')
+    parser.add_argument('--documents', type=int, default=5, help='resume/JD pairs per account (default 5)')
+    parser.add_argument('--text-pool', type=int, default=40,
+                        help='resume/JD texts analyze_realtime and uploads draw from (default 40)')
+    parser.add_argument('--size', default='medium', help='small, medium, large or a word count (default medium)')
+    parser.add_argument('--warmup', type=int, default=2, help='unrecorded requests per virtual user (default 2)')
+    parser.add_argument('--server', choices=('werkzeug', 'gunicorn'), default='werkzeug',
+                        help='threaded werkzeug server in this process, or gunicorn workers (default werkzeug)')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes (default 2)')
+    parser.add_argument('--threads', type=int, default=1, help='threads per gunicorn worker (default 1)')
+    parser.add_argument('--rate-limits', action='store_true', help='keep the route rate limits enabled')
+    parser.add_argument('--timeout', type=float, default=120, help='per-request timeout in seconds (default 120)')
+    parser.add_argument('--seed', type=int, default=42, help='corpus and traffic seed (default 42)')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Request logging of the server and services would drown the report
+    logging.disable(logging.WARNING)
+    with contextlib.redirect_stdout(sys.stderr):  # routes print debug lines; keep stdout for the results
+        report = run(args)
+    logging.disable(logging.NOTSET)
+
+    print_results(report['results'], columns=RESULT_COLUMNS)
+    for operation, result in report['results'].items():
+        if result['errors']:
+            print(f"⚠️ {operation}: status codes {result['status_codes']}")
+    if args.output:
+        write_report(report, args.output)
+        print(f"\n📄 Results written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,14 +4,154 @@ Enhanced JWT protection with role-based access control
 """
 
 from functools import wraps
-from flask import jsonify, request, current_app
+from flask import jsonify, request, current_app, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, verify_jwt_in_request
 from backend.models import User, db
+from backend.middleware.rate_limiter import rate_limiter
 import logging
+import os
+import threading
+import time
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+DEFAULT_PRINCIPAL_TTL = 30  # seconds a cached principal may lag changes made by other workers
+
+
+class UserPrincipal:
+    """
+    Read-only snapshot of the user fields needed to authorize a request
+
+    Mirrors the role and scan quota helpers of User, so routes that only check who
+    the caller is and what they may do never have to load the row.
+    """
+
+    __slots__ = ('id', 'role', 'is_active', 'free_scans_remaining', 'total_scans_used')
+
+    def __init__(self, id, role, is_active, free_scans_remaining, total_scans_used):
+        self.id = id
+        self.role = role
+        self.is_active = is_active
+        self.free_scans_remaining = free_scans_remaining
+        self.total_scans_used = total_scans_used
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.role, bool(user.is_active),
+                   user.free_scans_remaining, user.total_scans_used)
+
+    def is_premium(self):
+        """Check if user has premium access"""
+        return self.role in ['premium', 'admin']
+
+    def is_admin(self):
+        """Check if user is admin"""
+        return self.role == 'admin'
+
+    def can_perform_scan(self):
+        """Check if user can perform a scan"""
+        return self.free_scans_remaining > 0 or self.role in ['premium', 'admin']
+
+    def get_scan_status(self):
+        """Get current scan status for user"""
+        return {
+            'free_scans_remaining': self.free_scans_remaining,
+            'total_scans_used': self.total_scans_used,
+            'can_scan': self.can_perform_scan(),
+            'is_premium': self.role in ['premium', 'admin']
+        }
+
+
+class PrincipalCache:
+    """
+    Short-TTL cache of UserPrincipal by user id
+
+    Entries are dropped by invalidate() whenever this process changes a user's
+    role, active flag or scan quota; the TTL bounds how long other workers keep
+    serving the old values.
+    """
+
+    def __init__(self, ttl=None):
+        """
+        Args:
+            ttl: Seconds an entry stays valid (env AUTH_PRINCIPAL_CACHE_TTL, 0 disables caching)
+        """
+        if ttl is None:
+            ttl = float(os.getenv('AUTH_PRINCIPAL_CACHE_TTL', DEFAULT_PRINCIPAL_TTL))
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """
+        Principal of a user, loaded from the database on a miss
+
+        Returns:
+            UserPrincipal, or None if the user does not exist
+        """
+        user_id = int(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+
+        principal = UserPrincipal.from_user(user)
+        if self.ttl > 0:
+            with self._lock:
+                self._entries[user_id] = (principal, now + self.ttl)
+        return principal
+
+    def invalidate(self, user_id):
+        """Drop a user's cached principal (call after committing changes to it)"""
+        with self._lock:
+            self._entries.pop(int(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+def get_current_principal():
+    """
+    Principal of the authenticated caller, cached on the request
+
+    Works behind enhanced_jwt_required (which already resolved it) and behind a
+    plain jwt_required.
+
+    Returns:
+        UserPrincipal, or None without a valid identity or for an unknown user
+    """
+    principal = getattr(request, 'current_principal', None)
+    if principal is None:
+        current_user_id = get_jwt_identity()
+        principal = principal_cache.get(current_user_id) if current_user_id else None
+        request.current_principal = principal
+    return principal
+
+
+def load_current_user():
+    """
+    ORM User of the authenticated caller, for routes that read or change more than the principal
+
+    Loaded at most once per request.
+    """
+    user = getattr(request, 'current_user', None)
+    if user is None:
+        current_user_id = getattr(request, 'current_user_id', None) or get_jwt_identity()
+        user = db.session.get(User, int(current_user_id)) if current_user_id else None
+        request.current_user = user
+    return user
+
+
 def enhanced_jwt_required(optional=False, premium_required=False):
     """
     Enhanced JWT decorator with role-based access control
@@ -30,21 +170,23 @@ def enhanced_jwt_required(optional=False, premium_required=False):
                     try:
                         verify_jwt_in_request(optional=True)
                         current_user_id = get_jwt_identity()
-                        current_user = None
+                        principal = None
                         
                         if current_user_id:
-                            current_user = User.query.get(current_user_id)
-                            if not current_user or not current_user.is_active:
-                                current_user = None
+                            principal = principal_cache.get(current_user_id)
+                            if not principal or not principal.is_active:
+                                principal = None
                                 current_user_id = None
                         
-                        # Add user info to request context
+                        # Add user info to request context (the User row is loaded on demand)
                         request.current_user_id = current_user_id
-                        request.current_user = current_user
+                        request.current_principal = principal
+                        request.current_user = None
                         
                     except Exception as e:
                         logger.warning(f"Optional JWT verification failed: {e}")
                         request.current_user_id = None
+                        request.current_principal = None
                         request.current_user = None
                 else:
                     # For required routes, strict verification
@@ -58,30 +200,31 @@ def enhanced_jwt_required(optional=False, premium_required=False):
                             'error': 'missing_token'
                         }), 401
                     
-                    # Get user from database
-                    current_user = User.query.get(current_user_id)
+                    # Cached principal instead of loading the user row on every request
+                    principal = principal_cache.get(current_user_id)
                     
-                    if not current_user:
+                    if not principal:
                         return jsonify({
                             'success': False,
                             'message': 'User not found',
                             'error': 'invalid_user'
                         }), 401
                     
-                    if not current_user.is_active:
+                    if not principal.is_active:
                         return jsonify({
                             'success': False,
                             'message': 'Account is deactivated',
                             'error': 'account_deactivated'
                         }), 401
                     
-                    # Add user info to request context
+                    # Add user info to request context; load_current_user() loads the row if needed
                     request.current_user_id = current_user_id
-                    request.current_user = current_user
+                    request.current_principal = principal
+                    request.current_user = None
                     
                     # Check premium access if required
                     if premium_required:
-                        if not hasattr(current_user, 'role') or current_user.role != 'premium':
+                        if principal.role != 'premium':
                             return jsonify({
                                 'success': False,
                                 'message': 'Premium subscription required',
@@ -133,9 +276,7 @@ def admin_required(f):
     @wraps(f)
     @enhanced_jwt_required()
     def decorated_function(*args, **kwargs):
-        current_user = request.current_user
-        
-        if not hasattr(current_user, 'role') or current_user.role != 'admin':
+        if request.current_principal.role != 'admin':
             return jsonify({
                 'success': False,
                 'message': 'Administrator access required',
@@ -146,17 +287,49 @@ def admin_required(f):
     
     return decorated_function
 
-def rate_limit_check(max_requests=100, window_minutes=60):
+def rate_limit_check(max_requests=100, window_minutes=60, per='user', cost=1):
     """
-    Simple rate limiting decorator
+    Token-bucket rate limiting decorator
+
+    Place it below jwt_required/protected_route so unauthenticated requests are
+    rejected before they use up tokens.
+
+    Args:
+        max_requests: Requests allowed per window (also the allowed burst)
+        window_minutes: Window length
+        per: 'user' buckets by authenticated user (by IP without a token), 'ip' by client address
+        cost: Tokens one request takes
     """
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # For now, just log the request
-            # In production, implement proper rate limiting with Redis
-            logger.info(f"API call to {f.__name__} from user {getattr(request, 'current_user_id', 'anonymous')}")
-            return f(*args, **kwargs)
+            if not current_app.config.get('RATE_LIMIT_ENABLED', True):
+                return f(*args, **kwargs)
+
+            identity = None
+            if per == 'user':
+                try:
+                    verify_jwt_in_request(optional=True)
+                    identity = get_jwt_identity()
+                except Exception:
+                    identity = None
+            client = f'user:{identity}' if identity else f'ip:{request.remote_addr}'
+
+            result = rate_limiter.hit(f'{f.__name__}:{client}', max_requests, window_minutes * 60, cost)
+            if not result.allowed:
+                logger.warning(f"Rate limit exceeded: {f.__name__} | {client}")
+                response = jsonify({
+                    'success': False,
+                    'message': f'Too many requests. Please retry in {result.retry_after} seconds.',
+                    'error': 'rate_limited',
+                    'retry_after': result.retry_after
+                })
+                response.status_code = 429
+            else:
+                response = make_response(f(*args, **kwargs))
+
+            response.headers.extend(result.headers())
+            return response
         return decorated_function
     return decorator
 
@@ -199,8 +372,8 @@ def monitored_route(f):
     """Route with access logging"""
     return log_api_access(f)
 
-def rate_limited_route(max_requests=100, window_minutes=60):
+def rate_limited_route(max_requests=100, window_minutes=60, per='user', cost=1):
     """Route with rate limiting"""
     def decorator(f):
-        return rate_limit_check(max_requests, window_minutes)(f)
+        return rate_limit_check(max_requests, window_minutes, per, cost)(f)
     return decorator
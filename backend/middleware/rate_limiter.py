@@ -0,0 +1,252 @@
+"""
+US-10: Token-bucket rate limiting
+Per-user / per-IP buckets kept in process memory, in a SQLite file shared by the
+workers on one host, or in Redis (or any server speaking its protocol) for a cluster
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+BUCKET_IDLE_SECONDS = 24 * 3600  # buckets untouched this long are full again and can be dropped
+SQLITE_PRUNE_INTERVAL = 500  # writes between removals of idle buckets
+
+
+def refill_and_take(tokens: Optional[float], updated_at: Optional[float], capacity: float,
+                    refill_rate: float, now: float, cost: float) -> Tuple[bool, float]:
+    """
+    Token bucket step shared by every store
+
+    Args:
+        tokens: Tokens left after the previous request (None for a new bucket)
+        updated_at: Time of the previous request
+        capacity: Bucket size (the allowed burst)
+        refill_rate: Tokens added per second
+        now: Current time in seconds
+        cost: Tokens this request needs
+
+    Returns:
+        Tuple of (allowed, tokens left)
+    """
+    if tokens is None:
+        tokens = capacity
+    else:
+        tokens = min(capacity, tokens + max(0.0, now - updated_at) * refill_rate)
+
+    if tokens >= cost:
+        return True, tokens - cost
+    return False, tokens
+
+
+class MemoryBucketStore:
+    """Buckets in a dict; each worker process counts on its own"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill_rate, now, cost):
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (None, None))
+            allowed, tokens = refill_and_take(tokens, updated_at, capacity, refill_rate, now, cost)
+            self._buckets[key] = (tokens, now)
+
+            # Full buckets carry no state, so idle ones are dropped as the dict grows
+            if len(self._buckets) > 10000:
+                cutoff = now - BUCKET_IDLE_SECONDS
+                for stale in [k for k, (_, t) in self._buckets.items() if t < cutoff]:
+                    del self._buckets[stale]
+        return allowed, tokens
+
+
+class SQLiteBucketStore:
+    """Buckets in a SQLite file; the database write lock serializes workers on the host"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._writes = 0
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_buckets ('
+                'bucket_key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Connection holding the write lock (BEGIN IMMEDIATE) until commit"""
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+
+    def take(self, key, capacity, refill_rate, now, cost):
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT tokens, updated_at FROM rate_buckets WHERE bucket_key = ?', (key,)
+            ).fetchone()
+            tokens, updated_at = row if row else (None, None)
+            allowed, tokens = refill_and_take(tokens, updated_at, capacity, refill_rate, now, cost)
+            conn.execute(
+                'INSERT INTO rate_buckets (bucket_key, tokens, updated_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(bucket_key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at',
+                (key, tokens, now)
+            )
+
+            self._writes += 1
+            if self._writes % SQLITE_PRUNE_INTERVAL == 0:
+                conn.execute('DELETE FROM rate_buckets WHERE updated_at < ?', (now - BUCKET_IDLE_SECONDS,))
+        return allowed, tokens
+
+
+class RedisBucketStore:
+    """Buckets in Redis hashes, updated atomically by a Lua script"""
+
+    TAKE_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local capacity, rate, now, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local tokens = tonumber(state[1])
+if tokens == nil then
+    tokens = capacity
+else
+    tokens = math.min(capacity, tokens + math.max(0, now - tonumber(state[2])) * rate)
+end
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HMSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, url: str):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError('redis package is not installed')
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(self.TAKE_SCRIPT)
+
+    def take(self, key, capacity, refill_rate, now, cost):
+        # Expire once the bucket would be full again
+        ttl = max(1, math.ceil(capacity / refill_rate))
+        allowed, tokens = self._take(keys=[f'rate_limit:{key}'],
+                                     args=[capacity, refill_rate, now, cost, ttl])
+        return bool(allowed), float(tokens)
+
+
+class RateLimitResult:
+    """Outcome of one rate limit check, with the values for the response headers"""
+
+    def __init__(self, allowed: bool, limit: int, remaining: float, refill_rate: float, now: float, cost: float):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = max(0, int(remaining))
+        # Seconds until the request would succeed, and until the bucket is full again
+        self.retry_after = 0 if allowed else max(1, math.ceil((cost - remaining) / refill_rate))
+        self.reset_at = int(math.ceil(now + (limit - remaining) / refill_rate))
+
+    def headers(self):
+        headers = {
+            'X-RateLimit-Limit': str(self.limit),
+            'X-RateLimit-Remaining': str(self.remaining),
+            'X-RateLimit-Reset': str(self.reset_at)
+        }
+        if not self.allowed:
+            headers['Retry-After'] = str(self.retry_after)
+        return headers
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with a pluggable store
+
+    A bucket holds max_requests tokens and refills at max_requests per window, so
+    a client may burst up to the limit and then continues at the average rate.
+    """
+
+    def __init__(self, storage: Optional[str] = None):
+        """
+        Args:
+            storage: 'memory', 'sqlite:///path/to/file.db' or 'redis://host:port/db'
+                     (env RATE_LIMIT_STORAGE, default memory)
+        """
+        self.storage = storage
+        self._store = None
+        self._store_lock = threading.Lock()
+
+    @property
+    def store(self):
+        """Bucket store, created on first use so the environment can be set after import"""
+        if self._store is None:
+            with self._store_lock:
+                if self._store is None:
+                    self._store = self._create_store(self.storage or os.getenv('RATE_LIMIT_STORAGE', 'memory'))
+        return self._store
+
+    @staticmethod
+    def _create_store(storage: str):
+        try:
+            if storage.startswith('sqlite:///'):
+                store = SQLiteBucketStore(storage[len('sqlite:///'):])
+            elif storage.startswith(('redis://', 'rediss://', 'unix://')):
+                store = RedisBucketStore(storage)
+            else:
+                store = MemoryBucketStore()
+            logger.info(f"Rate limiter using {type(store).__name__}")
+            return store
+        except Exception as e:
+            logger.error(f"Could not open rate limit storage {storage}, counting in memory instead: {e}")
+            return MemoryBucketStore()
+
+    def hit(self, key: str, max_requests: int, window_seconds: float, cost: float = 1) -> RateLimitResult:
+        """
+        Take tokens from a bucket
+
+        Args:
+            key: Bucket identity, e.g. 'analyze_realtime:user:42'
+            max_requests: Bucket size and requests allowed per window
+            window_seconds: Time in which an empty bucket refills completely
+            cost: Tokens this request needs
+
+        Returns:
+            RateLimitResult; requests are allowed if the store fails
+        """
+        refill_rate = max_requests / window_seconds
+        now = time.time()
+        try:
+            allowed, remaining = self.store.take(key, max_requests, refill_rate, now, cost)
+        except Exception as e:
+            # Fail open: an unavailable store must not take the API down with it
+            logger.warning(f"Rate limit store error for {key}: {e}")
+            allowed, remaining = True, max_requests
+        return RateLimitResult(allowed, max_requests, remaining, refill_rate, now, cost)
+
+
+rate_limiter = RateLimiter()
@@ -8,6 +8,42 @@ import json
 
 db = SQLAlchemy()
 
+def sync_schema():
+    """
+    Add columns and indexes that were introduced after a table was created
+
+    db.create_all() only creates missing tables, so databases created by an
+    older release would otherwise lack newer nullable columns.
+
+    Returns:
+        list: Human-readable descriptions of the changes applied
+    """
+    from sqlalchemy import inspect
+
+    inspector = inspect(db.engine)
+    changes = []
+
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            db.session.execute(db.text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            changes.append(f'added column {table.name}.{column.name}')
+
+        existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=db.engine)
+                changes.append(f'created index {index.name}')
+
+    db.session.commit()
+    return changes
+
 def get_current_user_id():
     """Helper function to get current user ID as integer from JWT"""
     from flask_jwt_extended import get_jwt_identity
@@ -19,6 +55,55 @@ def get_current_user():
     user_id = get_current_user_id()
     return User.query.get(user_id) if user_id else None
 
+KEYWORD_FIELDS = ('technical_skills', 'soft_skills', 'other_keywords')
+
+def _request_keyword_memo():
+    """Per-request map of (table, row id) -> (raw keyword columns, decoded keywords)"""
+    from flask import g, has_app_context
+    if not has_app_context():
+        return None
+    memo = g.get('_decoded_keywords')
+    if memo is None:
+        memo = g._decoded_keywords = {}
+    return memo
+
+def decode_keywords(document):
+    """
+    Decoded keyword columns of a Resume or JobDescription
+
+    The JSON columns are decoded at most once per request: the result is memoized on
+    the instance and in a request-scoped map keyed by row, and is only reused while
+    the raw column values are unchanged.
+
+    Returns:
+        dict: Fresh lists per category (callers may mutate them)
+    """
+    raw = tuple(getattr(document, field) for field in KEYWORD_FIELDS)
+    cached = getattr(document, '_keywords_memo', None)
+
+    if cached is None or cached[0] != raw:
+        memo = _request_keyword_memo() if document.id is not None else None
+        key = (document.__tablename__, document.id)
+        cached = memo.get(key) if memo is not None else None
+
+        if cached is None or cached[0] != raw:
+            cached = (raw, {
+                field: json.loads(value) if value else []
+                for field, value in zip(KEYWORD_FIELDS, raw)
+            })
+            if memo is not None:
+                memo[key] = cached
+        document._keywords_memo = cached
+
+    return {field: list(values) for field, values in cached[1].items()}
+
+def forget_decoded_keywords(document):
+    """Drop memoized keywords after the keyword columns were written"""
+    document._keywords_memo = None
+    memo = _request_keyword_memo()
+    if memo is not None:
+        memo.pop((document.__tablename__, document.id), None)
+
 class User(db.Model):
     __tablename__ = 'users'
     
@@ -215,6 +300,10 @@ class User(db.Model):
 
 class Resume(db.Model):
     __tablename__ = 'resumes'
+    __table_args__ = (
+        # Owner lookups and "newest first" lists of active resumes
+        db.Index('idx_resumes_user_active_created', 'user_id', 'is_active', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -234,6 +323,9 @@ class Resume(db.Model):
     soft_skills = db.Column(db.Text)       # JSON string of soft skills
     other_keywords = db.Column(db.Text)    # JSON string of other keywords
     keyword_count = db.Column(db.Integer, default=0)
+
+    # Versioned analysis artifact (see services/document_analysis.py)
+    analysis_artifact = db.Column(db.JSON)
     
     # Metadata
     title = db.Column(db.String(255))
@@ -292,14 +384,11 @@ class Resume(db.Model):
         
         self.keyword_count = total_keywords
         self.keywords_extracted = True
+        forget_decoded_keywords(self)
     
     def get_keywords(self):
-        """Get extracted keywords as Python objects"""
-        return {
-            'technical_skills': json.loads(self.technical_skills) if self.technical_skills else [],
-            'soft_skills': json.loads(self.soft_skills) if self.soft_skills else [],
-            'other_keywords': json.loads(self.other_keywords) if self.other_keywords else []
-        }
+        """Get extracted keywords as Python objects (decoded at most once per request)"""
+        return decode_keywords(self)
     
     def to_dict(self, include_keywords=False):
         """Convert resume object to dictionary"""
@@ -330,8 +419,59 @@ class Resume(db.Model):
     def __repr__(self):
         return f'<Resume {self.original_filename} by User {self.user_id}>'
 
+class ProcessingJob(db.Model):
+    """
+    Background processing job for an uploaded resume (parse, keywords, analysis)
+    The table doubles as the durable queue - see services/processing_queue.py
+    """
+    __tablename__ = 'processing_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False, index=True)
+    job_type = db.Column(db.String(50), default='resume_upload')
+
+    # queued -> running -> completed / failed
+    status = db.Column(db.String(20), default='queued', index=True)
+    stage = db.Column(db.String(50), default='queued')
+    progress = db.Column(db.Integer, default=0)  # 0-100
+    error_message = db.Column(db.Text)
+    attempts = db.Column(db.Integer, default=0)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    resume = db.relationship('Resume', backref=db.backref('processing_jobs', lazy=True, cascade='all, delete-orphan'))
+
+    def to_dict(self):
+        """Convert processing job to dictionary for API responses"""
+        return {
+            'id': self.id,
+            'resume_id': self.resume_id,
+            'job_type': self.job_type,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': self.progress,
+            'error_message': self.error_message,
+            'attempts': self.attempts,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f'<ProcessingJob {self.id} {self.status} for Resume {self.resume_id}>'
+
 class JobDescription(db.Model):
     __tablename__ = 'job_descriptions'
+    __table_args__ = (
+        # Owner lookups, "newest first" lists and the keyword index signature
+        db.Index('idx_jd_user_active_created', 'user_id', 'is_active', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -348,6 +488,9 @@ class JobDescription(db.Model):
     other_keywords = db.Column(db.Text)    # JSON string of other keywords
     keyword_count = db.Column(db.Integer, default=0)
 
+    # Versioned analysis artifact (see services/document_analysis.py)
+    analysis_artifact = db.Column(db.JSON)
+
     # Metadata
     is_active = db.Column(db.Boolean, default=True)
     word_count = db.Column(db.Integer, default=0)
@@ -391,14 +534,11 @@ class JobDescription(db.Model):
 
         self.keyword_count = total_keywords
         self.keywords_extracted = True
+        forget_decoded_keywords(self)
 
     def get_keywords(self):
-        """Get extracted keywords as Python objects"""
-        return {
-            'technical_skills': json.loads(self.technical_skills) if self.technical_skills else [],
-            'soft_skills': json.loads(self.soft_skills) if self.soft_skills else [],
-            'other_keywords': json.loads(self.other_keywords) if self.other_keywords else []
-        }
+        """Get extracted keywords as Python objects (decoded at most once per request)"""
+        return decode_keywords(self)
 
     @staticmethod
     def validate_job_description(title, job_text, company_name=None):
@@ -462,6 +602,11 @@ class MatchScore(db.Model):
     US-06: Model for storing resume-job description matching scores
     """
     __tablename__ = 'match_scores'
+    __table_args__ = (
+        # Existing-score probe of _save_match_score and the batch outer join
+        db.Index('idx_match_lookup', 'user_id', 'resume_id', 'job_description_id', 'is_active'),
+        db.Index('idx_match_user_date', 'user_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -541,6 +686,12 @@ class ScanHistory(db.Model):
     This replaces the need to use MatchScore for history tracking
     """
     __tablename__ = 'scan_history'
+    __table_args__ = (
+        # History pages (sorted by date or score) and the dashboard watermark/recent counts
+        db.Index('idx_scan_user_date', 'user_id', 'created_at'),
+        db.Index('idx_scan_user_score', 'user_id', 'overall_match_score'),
+        db.Index('idx_scan_user_latest', 'user_id', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -565,6 +716,7 @@ class ScanHistory(db.Model):
     scan_type = db.Column(db.String(20), default='realtime')  # 'realtime' or 'stored'
     algorithm_used = db.Column(db.String(50), default='llm_enhanced')
     scan_duration = db.Column(db.Float, nullable=True)  # in seconds
+    stage_timings = db.Column(db.JSON, nullable=True)  # milliseconds per analysis stage (STORE_STAGE_TIMINGS)
 
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -575,17 +727,22 @@ class ScanHistory(db.Model):
     resume = db.relationship('Resume', backref=db.backref('scan_history', lazy=True))
     job_description = db.relationship('JobDescription', backref=db.backref('scan_history', lazy=True))
 
-    def get_score_category(self):
-        """Get score category for color coding"""
-        if self.overall_match_score >= 80:
+    @staticmethod
+    def score_category_for(score):
+        """Score category (excellent/good/fair/poor) of a match score"""
+        if score >= 80:
             return 'excellent'
-        elif self.overall_match_score >= 60:
+        elif score >= 60:
             return 'good'
-        elif self.overall_match_score >= 40:
+        elif score >= 40:
             return 'fair'
         else:
             return 'poor'
 
+    def get_score_category(self):
+        """Get score category for color coding"""
+        return self.score_category_for(self.overall_match_score)
+
     def to_dict(self, include_details=False):
         """Convert scan history object to dictionary"""
         data = {
@@ -609,6 +766,7 @@ class ScanHistory(db.Model):
                 'detailed_analysis': self.detailed_analysis or {},
                 'recommendations': self.recommendations or [],
                 'keyword_analysis': self.keyword_analysis or {},
+                'stage_timings': self.stage_timings or {},
                 'resume_title': self.resume.title if self.resume else 'Real-time Scan',
                 'job_title': self.job_description.title if self.job_description else 'Real-time Scan',
                 'company_name': self.job_description.company_name if self.job_description else None
@@ -620,12 +778,48 @@ class ScanHistory(db.Model):
         return f'<ScanHistory {self.overall_match_score}% for User {self.user_id}>'
 
 
+class UserStats(db.Model):
+    """
+    Materialized per-user summary of ScanHistory for the dashboard
+    Updated with every scan written (see services/user_stats_service.py)
+    """
+    __tablename__ = 'user_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+
+    # Running aggregates over the user's scans
+    total_scans = db.Column(db.Integer, default=0, nullable=False)
+    score_sum = db.Column(db.Float, default=0.0, nullable=False)
+    min_score = db.Column(db.Float, nullable=True)
+    max_score = db.Column(db.Float, nullable=True)
+
+    # Score distribution (same buckets as ScanHistory.get_score_category)
+    excellent_count = db.Column(db.Integer, default=0, nullable=False)
+    good_count = db.Column(db.Integer, default=0, nullable=False)
+    fair_count = db.Column(db.Integer, default=0, nullable=False)
+    poor_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # {resume_id: [scan_count, score_sum]} for scans of stored resumes
+    resume_scores = db.Column(db.JSON, nullable=True)
+
+    # Newest ScanHistory id folded in - a mismatch means the summary must be rebuilt
+    last_scan_id = db.Column(db.Integer, nullable=True)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<UserStats {self.total_scans} scans for User {self.user_id}>'
+
+
 class Suggestion(db.Model):
     """
     Resume Suggestions Model - Stores individual suggestion recommendations
     Schema matches your exact specification
     """
     __tablename__ = 'resume_suggestions'
+    __table_args__ = (
+        db.Index('idx_suggestions_user', 'user_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
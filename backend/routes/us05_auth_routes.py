@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, create_access_token
 from backend.models import db, User
+from backend.middleware.auth_middleware import rate_limited_route
 import re
 
 # Create blueprint for authentication routes
@@ -37,6 +38,7 @@ def refresh():
         return jsonify({'success': False, 'message': 'Token refresh failed', 'error': str(e)}), 500
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limited_route(max_requests=5, window_minutes=1, per='ip')
 def register():
     """Register a new user (same as US-03)"""
     try:
@@ -108,6 +110,7 @@ def register():
         return jsonify({'success': False, 'message': 'Registration failed. Please try again.', 'error': str(e)}), 500
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limited_route(max_requests=5, window_minutes=1, per='ip')
 def login():
     """Login user and return JWT tokens (same as US-03)"""
     try:
@@ -168,6 +171,7 @@ def login():
         return jsonify({'success': False, 'message': 'Login failed. Please try again.', 'error': str(e)}), 500
 
 @auth_bp.route('/check-email', methods=['POST'])
+@rate_limited_route(max_requests=30, window_minutes=1, per='ip')
 def check_email():
     """Check if email is already registered"""
     try:
@@ -225,6 +229,7 @@ def verify_email():
         return jsonify({'success': False, 'message': 'Email verification failed', 'error': str(e)}), 500
 
 @auth_bp.route('/resend-verification', methods=['POST'])
+@rate_limited_route(max_requests=5, window_minutes=1, per='ip')
 def resend_verification():
     """Resend email verification token"""
     try:
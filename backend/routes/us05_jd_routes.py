@@ -1,8 +1,13 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.models import db, User, JobDescription
+from backend.models import db, JobDescription
+from backend.middleware.auth_middleware import get_current_principal, rate_limited_route
 from backend.services.keyword_parser import KeywordParser
 from backend.services.file_parser import FileParser
+from backend.services.document_analysis import get_analysis_artifact, is_artifact_current, refresh_analysis_artifact
+from backend.services.keyword_index import job_keyword_index
+from backend.services.pagination import InvalidCursor, keyset_page, list_count_cache
+from backend.services.tfidf_model import corpus_tfidf_model
 from datetime import datetime
 
 # Create blueprint for job description routes
@@ -14,6 +19,7 @@ file_parser = FileParser()
 
 @jd_bp.route('/upload_jd', methods=['POST'])
 @jwt_required()
+@rate_limited_route(max_requests=100, window_minutes=60)
 def upload_job_description():
     """
     Upload/create a new job description
@@ -32,7 +38,7 @@ def upload_job_description():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
         
         if not user:
             return jsonify({
@@ -120,6 +126,8 @@ def upload_job_description():
         
         db.session.add(job_description)
         db.session.commit()
+        list_count_cache.invalidate(current_user_id, 'job_descriptions')
+        corpus_tfidf_model.add_document(job_text)
 
         # US-05: Automatically extract keywords after successful job description creation
         try:
@@ -136,6 +144,16 @@ def upload_job_description():
             current_app.logger.error(f"Failed to extract keywords for job description {job_description.id}: {keyword_error}")
             # Don't fail the creation if keyword extraction fails
 
+        # Store the analysis artifact so matching never re-parses this text
+        try:
+            refresh_analysis_artifact(job_description)
+            db.session.commit()
+        except Exception as analysis_error:
+            db.session.rollback()
+            current_app.logger.error(f"Failed to analyze job description {job_description.id}: {analysis_error}")
+
+        job_keyword_index.update_job_description(job_description)
+
         # Note: Suggestions are now generated manually by clicking buttons, not automatically
 
         return jsonify({
@@ -156,20 +174,54 @@ def upload_job_description():
 @jd_bp.route('/job_descriptions', methods=['GET'])
 @jwt_required()
 def get_user_job_descriptions():
-    """Get all job descriptions for the current user"""
+    """
+    Get job descriptions for the current user, newest first
+
+    Query Parameters:
+    - limit: Page size (max: 100); without limit or cursor every job description is returned
+    - cursor: next_cursor of the previous page
+    - include_total: Also return the (cached) total_count
+    """
     try:
         current_user_id = get_jwt_identity()
         
-        job_descriptions = JobDescription.query.filter_by(
+        query = JobDescription.query.filter_by(
             user_id=current_user_id,
             is_active=True
-        ).order_by(JobDescription.created_at.desc()).all()
-        
-        return jsonify({
+        )
+
+        if 'limit' not in request.args and 'cursor' not in request.args:
+            job_descriptions = query.order_by(JobDescription.created_at.desc()).all()
+            return jsonify({
+                'success': True,
+                'job_descriptions': [jd.to_dict() for jd in job_descriptions],
+                'count': len(job_descriptions)
+            }), 200
+
+        limit = max(min(request.args.get('limit', 20, type=int), 100), 1)
+        try:
+            job_descriptions, next_cursor = keyset_page(
+                query, JobDescription.created_at, JobDescription.id, 'created_at', True,
+                limit, request.args.get('cursor') or None
+            )
+        except InvalidCursor as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+
+        response = {
             'success': True,
             'job_descriptions': [jd.to_dict() for jd in job_descriptions],
-            'count': len(job_descriptions)
-        }), 200
+            'count': len(job_descriptions),
+            'next_cursor': next_cursor,
+            'has_next': next_cursor is not None
+        }
+        if request.args.get('include_total', 'false').lower() == 'true':
+            response['total_count'] = list_count_cache.get_or_count(
+                current_user_id, 'job_descriptions', (), query.count
+            )
+        return jsonify(response), 200
         
     except Exception as e:
         return jsonify({
@@ -272,7 +324,16 @@ def update_job_description(jd_id):
             current_app.logger.error(f"Failed to re-extract keywords for job description {job_description.id}: {keyword_error}")
             # Don't fail the update if keyword extraction fails
 
+        # Rebuild the analysis artifact only when the text actually changed
+        if not is_artifact_current(job_description.analysis_artifact, job_text):
+            try:
+                refresh_analysis_artifact(job_description)
+            except Exception as analysis_error:
+                job_description.analysis_artifact = None
+                current_app.logger.error(f"Failed to re-analyze job description {job_description.id}: {analysis_error}")
+
         db.session.commit()
+        job_keyword_index.update_job_description(job_description)
 
         return jsonify({
             'success': True,
@@ -310,6 +371,8 @@ def delete_job_description(jd_id):
         # Delete database record
         db.session.delete(job_description)
         db.session.commit()
+        list_count_cache.invalidate(current_user_id, 'job_descriptions')
+        job_keyword_index.remove_job_description(current_user_id, jd_id)
         
         return jsonify({
             'success': True,
@@ -350,9 +413,17 @@ def duplicate_job_description(jd_id):
             job_text=original_jd.job_text,
             company_name=original_jd.company_name
         )
+
+        # Same text, so the original's analysis artifact can be reused as is
+        try:
+            duplicate_jd.analysis_artifact = get_analysis_artifact(original_jd)
+        except Exception as analysis_error:
+            current_app.logger.error(f"Failed to reuse analysis for job description {original_jd.id}: {analysis_error}")
         
         db.session.add(duplicate_jd)
         db.session.commit()
+        list_count_cache.invalidate(current_user_id, 'job_descriptions')
+        corpus_tfidf_model.add_document(duplicate_jd.job_text)
 
         # US-05: Automatically extract keywords for duplicated job description
         try:
@@ -369,6 +440,8 @@ def duplicate_job_description(jd_id):
             current_app.logger.error(f"Failed to extract keywords for duplicated job description {duplicate_jd.id}: {keyword_error}")
             # Don't fail the duplication if keyword extraction fails
 
+        job_keyword_index.update_job_description(duplicate_jd)
+
         return jsonify({
             'success': True,
             'message': 'Job description duplicated successfully',
@@ -387,13 +460,13 @@ def duplicate_job_description(jd_id):
 
 @jd_bp.route('/extract_job_text', methods=['POST'])
 @jwt_required()
+@rate_limited_route(max_requests=10, window_minutes=60)
 def extract_job_text():
     """
     Extract text from uploaded job description file (PDF, DOC, DOCX)
     """
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
 
         if not user:
             return jsonify({
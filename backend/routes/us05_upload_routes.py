@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
-from backend.models import db, User, Resume
+from backend.models import db, Resume, ProcessingJob
+from backend.middleware.auth_middleware import get_current_principal, rate_limited_route
 from backend.services.file_parser import FileParser
-from backend.services.keyword_parser import KeywordParser
+from backend.services.processing_queue import process_resume_upload, resume_processing_queue
+from backend.services.pagination import InvalidCursor, keyset_page, list_count_cache
 import os
 import uuid
 from datetime import datetime
@@ -11,11 +13,9 @@ from datetime import datetime
 # Create blueprint for upload routes
 upload_bp = Blueprint('upload', __name__, url_prefix='/api')
 
-# Initialize keyword parser
-keyword_parser = KeywordParser()
-
 @upload_bp.route('/upload_resume', methods=['POST'])
 @jwt_required()
+@rate_limited_route(max_requests=10, window_minutes=60)
 def upload_resume():
     """
     Upload and parse resume file
@@ -30,7 +30,7 @@ def upload_resume():
 
         current_user_id = get_jwt_identity()
         current_app.logger.info(f"👤 User ID: {current_user_id}")
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
         
         if not user:
             return jsonify({
@@ -87,33 +87,28 @@ def upload_resume():
         )
         
         db.session.add(resume)
-        db.session.commit()
-        
-        # Parse file in background (for now, we'll do it synchronously)
-        success, extracted_text, parse_error = FileParser.parse_resume_file(file_path, file_type)
-        
-        if success:
-            resume.extracted_text = extracted_text
-            resume.upload_status = 'completed'
 
-            # US-05: Automatically extract keywords after successful text extraction
-            try:
-                keywords = keyword_parser.extract_keywords(extracted_text)
-                resume.set_keywords(
-                    technical_skills=keywords['technical_skills'],
-                    soft_skills=keywords['soft_skills'],
-                    other_keywords=keywords['other_keywords']
-                )
-                current_app.logger.info(f"Keywords automatically extracted for resume {resume.id}")
-            except Exception as keyword_error:
-                current_app.logger.error(f"Failed to extract keywords for resume {resume.id}: {keyword_error}")
-                # Don't fail the upload if keyword extraction fails
+        # Parse, extract keywords and analyze off the request thread
+        if current_app.config.get('ASYNC_UPLOAD_PROCESSING'):
+            job = resume_processing_queue.create_job(resume)
+            db.session.commit()
+            list_count_cache.invalidate(current_user_id, 'resumes')
+            resume_processing_queue.enqueue(job.id)
 
-        else:
-            resume.upload_status = 'failed'
-            resume.error_message = parse_error
+            return jsonify({
+                'success': True,
+                'message': 'Resume uploaded, processing started',
+                'resume': resume.to_dict(include_keywords=True),
+                'processing_job': job.to_dict(),
+                'status_url': f'/api/resumes/{resume.id}/processing_status',
+                'keywords_extracted': False
+            }), 202
 
         db.session.commit()
+        list_count_cache.invalidate(current_user_id, 'resumes')
+
+        success, parse_error = process_resume_upload(resume)
+        db.session.commit()
 
         # Note: Suggestions are now generated manually by clicking buttons, not automatically
 
@@ -173,20 +168,54 @@ def upload_resume():
 @upload_bp.route('/resumes', methods=['GET'])
 @jwt_required()
 def get_user_resumes():
-    """Get all resumes for the current user"""
+    """
+    Get resumes for the current user, newest first
+
+    Query Parameters:
+    - limit: Page size (max: 100); without limit or cursor every resume is returned
+    - cursor: next_cursor of the previous page
+    - include_total: Also return the (cached) total_count
+    """
     try:
         current_user_id = get_jwt_identity()
         
-        resumes = Resume.query.filter_by(
+        query = Resume.query.filter_by(
             user_id=current_user_id,
             is_active=True
-        ).order_by(Resume.created_at.desc()).all()
-        
-        return jsonify({
+        )
+
+        if 'limit' not in request.args and 'cursor' not in request.args:
+            resumes = query.order_by(Resume.created_at.desc()).all()
+            return jsonify({
+                'success': True,
+                'resumes': [resume.to_dict() for resume in resumes],
+                'count': len(resumes)
+            }), 200
+
+        limit = max(min(request.args.get('limit', 20, type=int), 100), 1)
+        try:
+            resumes, next_cursor = keyset_page(
+                query, Resume.created_at, Resume.id, 'created_at', True,
+                limit, request.args.get('cursor') or None
+            )
+        except InvalidCursor as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+
+        response = {
             'success': True,
             'resumes': [resume.to_dict() for resume in resumes],
-            'count': len(resumes)
-        }), 200
+            'count': len(resumes),
+            'next_cursor': next_cursor,
+            'has_next': next_cursor is not None
+        }
+        if request.args.get('include_total', 'false').lower() == 'true':
+            response['total_count'] = list_count_cache.get_or_count(
+                current_user_id, 'resumes', (), query.count
+            )
+        return jsonify(response), 200
         
     except Exception as e:
         return jsonify({
@@ -232,6 +261,45 @@ def get_resume_details(resume_id):
             'error': str(e)
         }), 500
 
+@upload_bp.route('/resumes/<int:resume_id>/processing_status', methods=['GET'])
+@jwt_required()
+def get_resume_processing_status(resume_id):
+    """Get the processing status (stage, progress, errors) of an uploaded resume"""
+    try:
+        current_user_id = get_jwt_identity()
+
+        resume = Resume.query.filter_by(
+            id=resume_id,
+            user_id=current_user_id
+        ).first()
+
+        if not resume:
+            return jsonify({
+                'success': False,
+                'message': 'Resume not found'
+            }), 404
+
+        job = ProcessingJob.query.filter_by(
+            resume_id=resume.id
+        ).order_by(ProcessingJob.id.desc()).first()
+
+        return jsonify({
+            'success': True,
+            'resume_id': resume.id,
+            'upload_status': resume.upload_status,
+            'error_message': resume.error_message,
+            'keywords_extracted': bool(resume.keywords_extracted),
+            'processing_job': job.to_dict() if job else None,
+            'resume': resume.to_dict(include_keywords=True) if resume.upload_status != 'processing' else None
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Error fetching processing status',
+            'error': str(e)
+        }), 500
+
 @upload_bp.route('/resumes/<int:resume_id>', methods=['DELETE'])
 @jwt_required()
 def delete_resume(resume_id):
@@ -256,6 +324,7 @@ def delete_resume(resume_id):
         # Delete database record
         db.session.delete(resume)
         db.session.commit()
+        list_count_cache.invalidate(current_user_id, 'resumes')
         
         return jsonify({
             'success': True,
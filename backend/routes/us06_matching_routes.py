@@ -5,9 +5,13 @@ API endpoints for calculating and retrieving resume-job description matching sco
 
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.models import db, User, Resume, JobDescription, MatchScore, ScanHistory
+from backend.models import db, Resume, JobDescription, MatchScore, ScanHistory
 from backend.services.matching_service import MatchingService
 from backend.services.enhanced_matching_service import RealTimeLLMService
+from backend.services.user_stats_service import UserStatsService
+from backend.services.pagination import list_count_cache
+from backend.services.scoring_engine import SCORING_ALGORITHMS, DEFAULT_SCORING_ALGORITHM
+from backend.middleware.auth_middleware import get_current_principal, load_current_user, principal_cache, rate_limited_route
 from datetime import datetime
 import time
 
@@ -17,17 +21,44 @@ matching_bp = Blueprint('matching', __name__, url_prefix='/api')
 # Initialize services
 matching_service = MatchingService()
 realtime_llm_service = RealTimeLLMService()
+user_stats_service = UserStatsService()
+
+# Upper bound on explicit job description ids per batch request
+MAX_BATCH_JOB_DESCRIPTIONS = 200
+
+# Upper bound on results per best_matching_jobs request
+MAX_BEST_MATCHING_JOBS = 50
+
+
+def _invalid_algorithm(algorithm):
+    """Error message for an unknown scoring algorithm name, None if it is usable (or not given)"""
+    if algorithm is None or (isinstance(algorithm, str) and algorithm.strip().lower() in SCORING_ALGORITHMS):
+        return None
+    return f"algorithm must be one of: {', '.join(sorted(SCORING_ALGORITHMS))}"
+
+
+@matching_bp.route('/scoring_algorithms', methods=['GET'])
+@jwt_required()
+def scoring_algorithms():
+    """List the scoring algorithms accepted by the matching endpoints"""
+    return jsonify({
+        'success': True,
+        'algorithms': sorted(SCORING_ALGORITHMS),
+        'default': DEFAULT_SCORING_ALGORITHM
+    }), 200
 
 
 @matching_bp.route('/calculate_match', methods=['POST'])
 @jwt_required()
+@rate_limited_route(max_requests=100, window_minutes=60)
 def calculate_match_score():
     """
     Calculate matching score between resume and job description
     Expected JSON payload:
     {
         "resume_id": 1,
-        "job_description_id": 2
+        "job_description_id": 2,
+        "algorithm": "jaccard"  // optional: jaccard, weighted_jaccard, cosine, bm25
     }
     """
     try:
@@ -48,12 +79,21 @@ def calculate_match_score():
                 'success': False,
                 'message': 'Both resume_id and job_description_id are required'
             }), 400
+
+        algorithm = data.get('algorithm')
+        algorithm_error = _invalid_algorithm(algorithm)
+        if algorithm_error:
+            return jsonify({
+                'success': False,
+                'message': algorithm_error
+            }), 400
         
         # Calculate match score
         result = matching_service.calculate_match_score(
             resume_id=resume_id,
             job_description_id=job_description_id,
-            user_id=current_user_id
+            user_id=current_user_id,
+            algorithm=algorithm
         )
         
         if not result['success']:
@@ -66,6 +106,7 @@ def calculate_match_score():
         return jsonify({
             'success': True,
             'message': 'Match score calculated successfully',
+            'algorithm': result['algorithm'],
             'match_score': result['match_score'],
             'detailed_scores': result['detailed_scores'],
             'keyword_analysis': result['keyword_analysis']
@@ -80,8 +121,163 @@ def calculate_match_score():
         }), 500
 
 
+@matching_bp.route('/batch_match', methods=['POST'])
+@jwt_required()
+@rate_limited_route(max_requests=100, window_minutes=60)
+def batch_match():
+    """
+    Calculate matching scores between one resume and many job descriptions
+    Expected JSON payload:
+    {
+        "resume_id": 1,
+        "job_description_ids": [2, 3, 4],  // optional, defaults to all active JDs
+        "algorithm": "bm25"  // optional, see /api/scoring_algorithms
+    }
+    """
+    try:
+        current_user_id = get_jwt_identity()
+        data = request.get_json()
+
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+
+        resume_id = data.get('resume_id')
+        job_description_ids = data.get('job_description_ids')
+
+        if not resume_id:
+            return jsonify({
+                'success': False,
+                'message': 'resume_id is required'
+            }), 400
+
+        if job_description_ids is not None:
+            if not isinstance(job_description_ids, list) or \
+                    not all(isinstance(jd_id, int) for jd_id in job_description_ids):
+                return jsonify({
+                    'success': False,
+                    'message': 'job_description_ids must be a list of integers'
+                }), 400
+
+            if len(job_description_ids) > MAX_BATCH_JOB_DESCRIPTIONS:
+                return jsonify({
+                    'success': False,
+                    'message': f'At most {MAX_BATCH_JOB_DESCRIPTIONS} job descriptions can be scored per request'
+                }), 400
+
+            # Preserve order, drop duplicates
+            job_description_ids = list(dict.fromkeys(job_description_ids))
+
+        algorithm = data.get('algorithm')
+        algorithm_error = _invalid_algorithm(algorithm)
+        if algorithm_error:
+            return jsonify({
+                'success': False,
+                'message': algorithm_error
+            }), 400
+
+        result = matching_service.calculate_batch_match_scores(
+            resume_id=resume_id,
+            user_id=current_user_id,
+            job_description_ids=job_description_ids,
+            algorithm=algorithm
+        )
+
+        if not result['success']:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to calculate match scores',
+                'error': result.get('error')
+            }), 400
+
+        return jsonify({
+            'success': True,
+            'message': f"Match scores calculated for {len(result['results'])} job descriptions",
+            'resume_id': result['resume_id'],
+            'algorithm': result['algorithm'],
+            'results': result['results'],
+            'skipped': result['skipped'],
+            'count': len(result['results'])
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error in batch_match: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Error calculating match scores',
+            'error': str(e)
+        }), 500
+
+
+@matching_bp.route('/best_matching_jobs', methods=['GET'])
+@jwt_required()
+@rate_limited_route(max_requests=100, window_minutes=60)
+def best_matching_jobs():
+    """
+    Get the user's job descriptions that best fit a resume
+
+    Query Parameters:
+    - resume_id: Resume to match (required)
+    - limit: Number of job descriptions to return (default: 5, max: 50)
+    - algorithm: Scoring algorithm used to rank the candidates (optional)
+    """
+    try:
+        current_user_id = get_jwt_identity()
+
+        resume_id = request.args.get('resume_id', type=int)
+        limit = min(max(request.args.get('limit', 5, type=int), 1), MAX_BEST_MATCHING_JOBS)
+        algorithm = request.args.get('algorithm')
+
+        if not resume_id:
+            return jsonify({
+                'success': False,
+                'message': 'resume_id is required'
+            }), 400
+
+        algorithm_error = _invalid_algorithm(algorithm)
+        if algorithm_error:
+            return jsonify({
+                'success': False,
+                'message': algorithm_error
+            }), 400
+
+        result = matching_service.find_best_matching_jobs(
+            resume_id=resume_id,
+            user_id=int(current_user_id),
+            limit=limit,
+            algorithm=algorithm
+        )
+
+        if not result['success']:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to find matching job descriptions',
+                'error': result.get('error')
+            }), 400
+
+        return jsonify({
+            'success': True,
+            'resume_id': result['resume_id'],
+            'algorithm': result['algorithm'],
+            'results': result['results'],
+            'candidates_considered': result['candidates_considered'],
+            'count': len(result['results'])
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error in best_matching_jobs: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Error finding matching job descriptions',
+            'error': str(e)
+        }), 500
+
+
 @matching_bp.route('/analyze_realtime', methods=['POST'])
 @jwt_required()
+@rate_limited_route(max_requests=100, window_minutes=60)
 def analyze_realtime():
     """
     Real-time analysis of resume text against job description text
@@ -93,7 +289,7 @@ def analyze_realtime():
     """
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_current_user()
 
         if not user:
             return jsonify({
@@ -128,6 +324,7 @@ def analyze_realtime():
 
         # Use one free scan before performing analysis
         scan_used = user.use_free_scan()
+        principal_cache.invalidate(user.id)
         if not scan_used:
             return jsonify({
                 'success': False,
@@ -151,6 +348,7 @@ def analyze_realtime():
             user.free_scans_remaining += 1
             user.total_scans_used -= 1
             db.session.commit()
+            principal_cache.invalidate(user.id)
 
             return jsonify({
                 'success': False,
@@ -173,11 +371,15 @@ def analyze_realtime():
                 ats_compatibility=analysis_result.get('ats_compatibility', 0),
                 scan_type='realtime',
                 algorithm_used='llm_enhanced',
-                scan_duration=scan_duration
+                scan_duration=scan_duration,
+                stage_timings=(analysis_result.get('stage_timings')
+                               if current_app.config.get('STORE_STAGE_TIMINGS') else None)
             )
 
             db.session.add(scan_history)
+            user_stats_service.record_scan(scan_history)
             db.session.commit()
+            list_count_cache.invalidate(current_user_id, 'history')
 
             current_app.logger.info(f"Scan history saved with ID {scan_history.id} for user {current_user_id}")
 
@@ -212,8 +414,7 @@ def analyze_realtime():
 def get_scan_status():
     """Get current scan status for user"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
 
         if not user:
             return jsonify({
@@ -237,6 +438,7 @@ def get_scan_status():
 
 @matching_bp.route('/enhanced_match', methods=['POST'])
 @jwt_required()
+@rate_limited_route(max_requests=100, window_minutes=60)
 def calculate_enhanced_match():
     """
     Calculate enhanced matching score using the new LLM service
@@ -279,6 +481,9 @@ def calculate_enhanced_match():
                 'error': result.get('error')
             }), 400
 
+        # Keep analysis artifacts backfilled while matching
+        db.session.commit()
+
         return jsonify({
             'success': True,
             'message': 'Enhanced match score calculated successfully',
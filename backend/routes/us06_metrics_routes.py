@@ -0,0 +1,46 @@
+"""
+US-06: Analysis Metrics Routes
+API endpoints exposing the per-stage timing histograms of the analysis pipeline
+"""
+
+from flask import Blueprint, request, jsonify, current_app
+from backend.middleware.auth_middleware import admin_required
+from backend.services.stage_timer import stage_metrics
+
+# Create blueprint for metrics routes
+metrics_bp = Blueprint('metrics', __name__, url_prefix='/api')
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+@admin_required
+def get_metrics():
+    """
+    Stage timing histograms of this worker process (admin only)
+
+    Query parameters:
+        operation: Only this operation, e.g. analyze_resume_realtime (repeatable)
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'metrics': stage_metrics.snapshot(request.args.getlist('operation') or None)
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Error in get_metrics: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Error retrieving metrics',
+            'error': str(e)
+        }), 500
+
+
+@metrics_bp.route('/metrics/reset', methods=['POST'])
+@admin_required
+def reset_metrics():
+    """Drop the stage timing histograms of this worker process (admin only)"""
+    stage_metrics.reset()
+    return jsonify({
+        'success': True,
+        'message': 'Metrics reset'
+    }), 200
@@ -4,10 +4,11 @@ API endpoints for generating keyword suggestions and recommendations
 """
 
 from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.models import User, Resume, JobDescription, MatchScore, Suggestion
-from backend.middleware.auth_middleware import protected_route, premium_route, monitored_route
+from flask_jwt_extended import jwt_required
+from backend.models import db, Resume, JobDescription, MatchScore, Suggestion
+from backend.middleware.auth_middleware import protected_route, premium_route, monitored_route, rate_limited_route, get_current_principal
 from backend.services.dynamic_suggestions_service import DynamicSuggestionsService
+from backend.services.pagination import InvalidCursor, keyset_page, list_count_cache
 try:
     from backend.services.premium_suggestions_service import PremiumSuggestionsService
     premium_service = PremiumSuggestionsService()
@@ -29,6 +30,7 @@ dynamic_suggestions_service = DynamicSuggestionsService()
 
 @suggestions_bp.route('/basic_suggestions', methods=['POST'])
 @protected_route
+@rate_limited_route(max_requests=50, window_minutes=60)
 def generate_basic_suggestions():
     """
     Generate basic suggestions by identifying missing keywords
@@ -41,8 +43,7 @@ def generate_basic_suggestions():
     """
     try:
         # Get current user
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
         
         if not user:
             return jsonify({
@@ -118,6 +119,8 @@ def generate_basic_suggestions():
                 'message': suggestions_result.get('message', 'Failed to generate suggestions')
             }), 500
 
+        # Keep analysis artifacts backfilled while generating
+        db.session.commit()
         logger.info(f"Generated basic suggestions for user {user.id}, resume {resume_id}, JD {job_description_id}")
 
         return jsonify({
@@ -140,6 +143,7 @@ def generate_basic_suggestions():
 @suggestions_bp.route('/premium_suggestions', methods=['POST'])
 @protected_route
 @monitored_route
+@rate_limited_route(max_requests=50, window_minutes=60)
 def generate_premium_suggestions():
     """
     Generate premium AI-powered suggestions using OpenAI API
@@ -153,8 +157,7 @@ def generate_premium_suggestions():
     """
     try:
         # Get current user
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
         
         if not user:
             return jsonify({
@@ -239,6 +242,8 @@ def generate_premium_suggestions():
                 'message': premium_result.get('message', 'Failed to generate premium suggestions')
             }), 500
 
+        # Keep analysis artifacts backfilled while generating
+        db.session.commit()
         logger.info(f"Generated premium suggestions for user {user.id}, resume {resume_id}, JD {job_description_id}")
 
         return jsonify({
@@ -262,12 +267,16 @@ def generate_premium_suggestions():
 @jwt_required()
 def get_suggestion_history():
     """
-    Get user's suggestion history
+    Get user's suggestion history, newest first
+
+    Query Parameters:
+    - limit: Items per page (default: 10, max: 50)
+    - cursor: next_cursor of the previous page
+    - include_total: Report every suggestion of the user in total_count, not just this page
     """
     try:
         # Get current user
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
         
         if not user:
             return jsonify({
@@ -277,31 +286,44 @@ def get_suggestion_history():
         
         # Get query parameters
         limit = request.args.get('limit', 10, type=int)
-        limit = min(limit, 50)  # Cap at 50
+        limit = max(min(limit, 50), 1)  # Cap at 50
         
         # Get suggestion history from database directly
-        history = []
         try:
-            suggestions = Suggestion.query.filter_by(user_id=user.id).order_by(
-                Suggestion.created_at.desc()
-            ).limit(limit).all()
-
-            for suggestion in suggestions:
-                history.append({
-                    'id': suggestion.id,
-                    'resume_id': suggestion.resume_id,
-                    'job_description_id': suggestion.job_description_id,
-                    'suggestion_type': suggestion.suggestion_type,
-                    'created_at': suggestion.created_at.isoformat(),
-                    'match_score': suggestion.match_score
-                })
-        except Exception as e:
-            logger.error(f"Error getting suggestion history: {str(e)}")
+            suggestions, next_cursor = keyset_page(
+                Suggestion.query.filter_by(user_id=user.id),
+                Suggestion.created_at, Suggestion.id, 'created_at', True,
+                limit, request.args.get('cursor') or None
+            )
+        except InvalidCursor as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+
+        history = [{
+            'id': suggestion.id,
+            'resume_id': suggestion.resume_id,
+            'job_description_id': suggestion.jd_id,
+            'suggestion_type': suggestion.suggestion_type,
+            'priority': suggestion.priority,
+            'title': suggestion.title,
+            'tier': suggestion.tier,
+            'created_at': suggestion.created_at.isoformat() if suggestion.created_at else None
+        } for suggestion in suggestions]
+        
+        total_count = len(history)
+        if request.args.get('include_total', 'false').lower() == 'true':
+            total_count = list_count_cache.get_or_count(
+                user.id, 'suggestions', (), Suggestion.query.filter_by(user_id=user.id).count
+            )
         
         return jsonify({
             'success': True,
             'suggestion_history': history,
-            'total_count': len(history)
+            'total_count': total_count,
+            'next_cursor': next_cursor,
+            'has_next': next_cursor is not None
         }), 200
         
     except Exception as e:
@@ -320,8 +342,7 @@ def get_available_suggestions():
     """
     try:
         # Get current user
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
         
         if not user:
             return jsonify({
@@ -386,8 +407,7 @@ def get_latest_suggestions():
     """
     try:
         # Get current user
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
 
         if not user:
             return jsonify({
@@ -447,6 +467,9 @@ def get_latest_suggestions():
                 'has_job_description': True
             }), 500
 
+        # Keep analysis artifacts backfilled while generating
+        db.session.commit()
+
         return jsonify({
             'success': True,
             'message': 'Latest suggestions retrieved successfully',
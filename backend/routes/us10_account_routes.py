@@ -5,7 +5,7 @@ API endpoints for updating user account information
 
 from flask import Blueprint, request, jsonify, current_app
 from backend.models import db, User
-from backend.middleware.auth_middleware import protected_route, monitored_route
+from backend.middleware.auth_middleware import protected_route, monitored_route, rate_limited_route, load_current_user, principal_cache
 from werkzeug.security import check_password_hash
 import re
 import logging
@@ -20,6 +20,7 @@ account_bp = Blueprint('account', __name__, url_prefix='/api')
 @account_bp.route('/update_account', methods=['PUT'])
 @protected_route
 @monitored_route
+@rate_limited_route(max_requests=5, window_minutes=1)
 def update_account():
     """
     Update user account information
@@ -43,7 +44,7 @@ def update_account():
             }), 400
         
         # Get current user from middleware
-        user = request.current_user
+        user = load_current_user()
         
         # Track what's being updated
         updates = {}
@@ -149,6 +150,7 @@ def update_account():
         # Save changes
         user.updated_at = db.func.now()
         db.session.commit()
+        principal_cache.invalidate(user.id)
         
         logger.info(f"Account updated for user {user.id}: {list(updates.keys())}")
         
@@ -172,6 +174,7 @@ def update_account():
 @account_bp.route('/change_password', methods=['PUT'])
 @protected_route
 @monitored_route
+@rate_limited_route(max_requests=5, window_minutes=1)
 def change_password():
     """
     Dedicated endpoint for password changes with enhanced security
@@ -193,7 +196,7 @@ def change_password():
             }), 400
         
         # Get current user from middleware
-        user = request.current_user
+        user = load_current_user()
         
         # Validate required fields
         required_fields = ['current_password', 'new_password', 'confirm_password']
@@ -266,7 +269,7 @@ def get_account_info():
     Get current user account information
     """
     try:
-        user = request.current_user
+        user = load_current_user()
         
         return jsonify({
             'success': True,
@@ -285,6 +288,7 @@ def get_account_info():
 @account_bp.route('/delete_account', methods=['DELETE'])
 @protected_route
 @monitored_route
+@rate_limited_route(max_requests=5, window_minutes=1)
 def delete_account():
     """
     Delete user account (soft delete - deactivate)
@@ -304,7 +308,7 @@ def delete_account():
                 'message': 'No data provided'
             }), 400
         
-        user = request.current_user
+        user = load_current_user()
         
         # Verify password
         password = data.get('password')
@@ -331,6 +335,7 @@ def delete_account():
         user.is_active = False
         user.updated_at = db.func.now()
         db.session.commit()
+        principal_cache.invalidate(user.id)
         
         logger.warning(f"Account deactivated for user {user.id} ({user.email})")
         
@@ -5,14 +5,85 @@ API endpoints for retrieving user's scan history, statistics, and dashboard data
 
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.models import db, User, Resume, JobDescription, MatchScore, ScanHistory
-from sqlalchemy import desc, func
-from datetime import datetime, timedelta
+from backend.models import db, Resume, JobDescription, MatchScore, ScanHistory
+from backend.middleware.auth_middleware import get_current_principal
+from backend.services.user_stats_service import UserStatsService
+from backend.services.pagination import InvalidCursor, keyset_page, list_count_cache
+from sqlalchemy import and_, desc, func, cast, Text
+from sqlalchemy.orm import joinedload, load_only
 import json
+import math
 
 # Create blueprint for history routes
 history_bp = Blueprint('history', __name__, url_prefix='/api')
 
+# Initialize services
+user_stats_service = UserStatsService()
+
+# Columns needed to list scans - the raw texts and analysis JSON are never loaded for lists
+SCAN_LIST_COLUMNS = (
+    ScanHistory.id, ScanHistory.user_id, ScanHistory.resume_id, ScanHistory.job_description_id,
+    ScanHistory.overall_match_score, ScanHistory.category_scores, ScanHistory.recommendations,
+    ScanHistory.ats_compatibility, ScanHistory.scan_type, ScanHistory.algorithm_used,
+    ScanHistory.scan_duration, ScanHistory.created_at
+)
+
+# Serialized JSON values that bool(detailed_analysis) treats as empty
+EMPTY_JSON_TEXTS = ('null', '{}', '[]', '""', 'false', '0')
+
+# bool(detailed_analysis) without loading it. CAST(... AS TEXT) gives the JSON text on
+# SQLite and PostgreSQL (CHAR on MySQL), and SQLAlchemy always writes it with json.dumps
+HAS_DETAILED_ANALYSIS = and_(
+    ScanHistory.detailed_analysis.isnot(None),
+    cast(ScanHistory.detailed_analysis, Text).notin_(EMPTY_JSON_TEXTS)
+)
+
+
+def _scan_list_query(user_id, *columns):
+    """
+    ScanHistory rows of a user with their resume and job description loaded in the same query
+
+    Args:
+        user_id: Owner of the scans
+        *columns: Extra SQL expressions to select next to each scan
+
+    Returns:
+        Query (not yet ordered or limited)
+    """
+    return db.session.query(ScanHistory, *columns).options(
+        load_only(*SCAN_LIST_COLUMNS),
+        joinedload(ScanHistory.resume).load_only(
+            Resume.id, Resume.title, Resume.original_filename, Resume.created_at
+        ),
+        joinedload(ScanHistory.job_description).load_only(
+            JobDescription.id, JobDescription.title, JobDescription.company_name, JobDescription.created_at
+        )
+    ).filter(ScanHistory.user_id == user_id)
+
+
+def _score_filter(filter_score):
+    """Conditions on ScanHistory.overall_match_score for a score category (empty for no filter)"""
+    score = ScanHistory.overall_match_score
+    if filter_score == 'excellent':
+        return [score >= 80]
+    if filter_score == 'good':
+        return [score >= 60, score < 80]
+    if filter_score == 'fair':
+        return [score >= 40, score < 60]
+    if filter_score == 'poor':
+        return [score < 40]
+    return []
+
+
+def _count_scans(user_id, filter_score):
+    """Number of scans of a user in a score category, cached between page loads"""
+    return list_count_cache.get_or_count(
+        user_id, 'history', (filter_score,),
+        lambda: db.session.query(func.count(ScanHistory.id)).filter(
+            ScanHistory.user_id == user_id, *_score_filter(filter_score)
+        ).scalar()
+    )
+
 
 @history_bp.route('/history', methods=['GET'])
 @jwt_required()
@@ -26,11 +97,14 @@ def get_scan_history():
     - sort_by: Sort field (default: 'created_at')
     - sort_order: Sort order 'asc' or 'desc' (default: 'desc')
     - filter_score: Filter by score range 'excellent', 'good', 'fair', 'poor'
+    - cursor: Switches to keyset pagination; empty for the first page, then the
+      next_cursor of the previous response (page is ignored)
+    - include_total: With cursor, also return the (cached) total_items
     """
     try:
         # Get current user
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
         
         if not user:
             return jsonify({
@@ -39,52 +113,74 @@ def get_scan_history():
             }), 404
         
         # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 10, type=int), 50)
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = max(min(request.args.get('per_page', 10, type=int), 50), 1)
         sort_by = request.args.get('sort_by', 'created_at')
         sort_order = request.args.get('sort_order', 'desc')
         filter_score = request.args.get('filter_score', None)
+        cursor = request.args.get('cursor')
         
-        # Build query
-        query = db.session.query(ScanHistory).filter_by(user_id=current_user_id)
-
-        # Apply score filter
-        if filter_score:
-            if filter_score == 'excellent':
-                query = query.filter(ScanHistory.overall_match_score >= 80)
-            elif filter_score == 'good':
-                query = query.filter(ScanHistory.overall_match_score >= 60, ScanHistory.overall_match_score < 80)
-            elif filter_score == 'fair':
-                query = query.filter(ScanHistory.overall_match_score >= 40, ScanHistory.overall_match_score < 60)
-            elif filter_score == 'poor':
-                query = query.filter(ScanHistory.overall_match_score < 40)
-
-        # Apply sorting
-        if sort_by == 'overall_score':
-            sort_column = ScanHistory.overall_match_score
-        elif hasattr(ScanHistory, sort_by):
-            sort_column = getattr(ScanHistory, sort_by)
-        else:
-            sort_column = ScanHistory.created_at
+        # Build query (resume and job description are joined in, one round-trip per page)
+        query = _scan_list_query(current_user_id, HAS_DETAILED_ANALYSIS).filter(*_score_filter(filter_score))
 
-        if sort_order == 'asc':
-            query = query.order_by(sort_column.asc())
+        if cursor is not None:
+            # Keyset mode: only orderings backed by an index can be continued from a cursor
+            if sort_by == 'overall_score':
+                sort_column = ScanHistory.overall_match_score
+            else:
+                sort_by, sort_column = 'created_at', ScanHistory.created_at
+
+            try:
+                items, next_cursor = keyset_page(
+                    query, sort_column, ScanHistory.id, sort_by, sort_order != 'asc',
+                    per_page, cursor or None, row_of=lambda item: item[0]
+                )
+            except InvalidCursor as e:
+                return jsonify({
+                    'success': False,
+                    'message': str(e)
+                }), 400
+
+            pagination_info = {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None
+            }
+            if request.args.get('include_total', 'false').lower() == 'true':
+                pagination_info['total_items'] = _count_scans(current_user_id, filter_score)
         else:
-            query = query.order_by(sort_column.desc())
-        
-        # Paginate results
-        pagination = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
+            # Apply sorting
+            if sort_by == 'overall_score':
+                sort_column = ScanHistory.overall_match_score
+            elif hasattr(ScanHistory, sort_by):
+                sort_column = getattr(ScanHistory, sort_by)
+            else:
+                sort_column = ScanHistory.created_at
+
+            if sort_order == 'asc':
+                query = query.order_by(sort_column.asc())
+            else:
+                query = query.order_by(sort_column.desc())
+
+            # Page numbers keep OFFSET paging; the total comes from the count cache
+            items = query.offset((page - 1) * per_page).limit(per_page).all()
+            total = _count_scans(current_user_id, filter_score)
+            total_pages = math.ceil(total / per_page)
+            pagination_info = {
+                'page': page,
+                'per_page': per_page,
+                'total_pages': total_pages,
+                'total_items': total,
+                'has_next': page < total_pages,
+                'has_prev': page > 1
+            }
         
         # Format scan history
         scan_history = []
-        for scan in pagination.items:
-            # Get resume and job description details (if available)
-            resume = Resume.query.get(scan.resume_id) if scan.resume_id else None
-            job_description = JobDescription.query.get(scan.job_description_id) if scan.job_description_id else None
+        for scan, has_detailed_analysis in items:
+            # Resume and job description details (if available)
+            resume = scan.resume
+            job_description = scan.job_description
 
             # Extract category scores
             category_scores = scan.category_scores or {}
@@ -114,7 +210,7 @@ def get_scan_history():
                     'company_name': job_description.company_name if job_description else 'Real-time Analysis',
                     'created_date': job_description.created_at.isoformat() if job_description and job_description.created_at else None
                 },
-                'has_detailed_analysis': bool(scan.detailed_analysis),
+                'has_detailed_analysis': bool(has_detailed_analysis),
                 'has_recommendations': bool(scan.recommendations),
                 'recommendations_count': len(scan.recommendations) if scan.recommendations else 0,
                 'suggestions_available': True,  # All scans can generate suggestions
@@ -125,14 +221,7 @@ def get_scan_history():
         return jsonify({
             'success': True,
             'scan_history': scan_history,
-            'pagination': {
-                'page': pagination.page,
-                'per_page': pagination.per_page,
-                'total_pages': pagination.pages,
-                'total_items': pagination.total,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev
-            },
+            'pagination': pagination_info,
             'filters': {
                 'sort_by': sort_by,
                 'sort_order': sort_order,
@@ -158,7 +247,7 @@ def get_dashboard_stats():
     try:
         # Get current user
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
         
         if not user:
             return jsonify({
@@ -169,67 +258,19 @@ def get_dashboard_stats():
         # Get basic counts
         total_resumes = Resume.query.filter_by(user_id=current_user_id, is_active=True).count()
         total_job_descriptions = JobDescription.query.filter_by(user_id=current_user_id, is_active=True).count()
-        total_scans = ScanHistory.query.filter_by(user_id=current_user_id).count()
-
-        # Get score statistics
-        score_stats = db.session.query(
-            func.avg(ScanHistory.overall_match_score).label('avg_score'),
-            func.max(ScanHistory.overall_match_score).label('max_score'),
-            func.min(ScanHistory.overall_match_score).label('min_score')
-        ).filter_by(user_id=current_user_id).first()
-
-        # Get score distribution
-        excellent_count = ScanHistory.query.filter_by(user_id=current_user_id).filter(ScanHistory.overall_match_score >= 80).count()
-        good_count = ScanHistory.query.filter_by(user_id=current_user_id).filter(ScanHistory.overall_match_score >= 60, ScanHistory.overall_match_score < 80).count()
-        fair_count = ScanHistory.query.filter_by(user_id=current_user_id).filter(ScanHistory.overall_match_score >= 40, ScanHistory.overall_match_score < 60).count()
-        poor_count = ScanHistory.query.filter_by(user_id=current_user_id).filter(ScanHistory.overall_match_score < 40).count()
-
-        # Get recent activity (last 7 days)
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        recent_scans = ScanHistory.query.filter_by(user_id=current_user_id).filter(ScanHistory.created_at >= seven_days_ago).count()
-
-        # Get top performing resume (only for stored resumes, not real-time scans)
-        top_resume_query = db.session.query(
-            Resume.id,
-            Resume.title,
-            Resume.original_filename,
-            func.avg(ScanHistory.overall_match_score).label('avg_score'),
-            func.count(ScanHistory.id).label('scan_count')
-        ).join(ScanHistory).filter(
-            Resume.user_id == current_user_id,
-            Resume.is_active == True,
-            ScanHistory.resume_id.isnot(None)  # Only stored resumes, not real-time scans
-        ).group_by(Resume.id).order_by(func.avg(ScanHistory.overall_match_score).desc()).first()
-        
-        top_resume = None
-        if top_resume_query:
-            top_resume = {
-                'id': top_resume_query.id,
-                'title': top_resume_query.title or 'Untitled Resume',
-                'filename': top_resume_query.original_filename,
-                'average_score': round(top_resume_query.avg_score, 2),
-                'scan_count': top_resume_query.scan_count
-            }
-        
+
+        # Scan statistics come from the materialized per-user summary
+        scan_stats = user_stats_service.get_stats(current_user_id)
+
+        # Keep the stats summary rebuilt while reading it
+        db.session.commit()
+
         return jsonify({
             'success': True,
             'stats': {
                 'total_resumes': total_resumes,
                 'total_job_descriptions': total_job_descriptions,
-                'total_scans': total_scans,
-                'recent_scans_7_days': recent_scans,
-                'score_statistics': {
-                    'average_score': round(score_stats.avg_score, 2) if score_stats.avg_score else 0,
-                    'highest_score': round(score_stats.max_score, 2) if score_stats.max_score else 0,
-                    'lowest_score': round(score_stats.min_score, 2) if score_stats.min_score else 0
-                },
-                'score_distribution': {
-                    'excellent': excellent_count,  # 80-100%
-                    'good': good_count,           # 60-79%
-                    'fair': fair_count,           # 40-59%
-                    'poor': poor_count            # 0-39%
-                },
-                'top_performing_resume': top_resume
+                **scan_stats
             }
         }), 200
         
@@ -251,7 +292,7 @@ def get_recent_activity():
     try:
         # Get current user
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_principal()
         
         if not user:
             return jsonify({
@@ -260,18 +301,24 @@ def get_recent_activity():
             }), 404
         
         # Get recent scans (last 5)
-        recent_scans = db.session.query(ScanHistory).filter_by(
-            user_id=current_user_id
-        ).order_by(ScanHistory.created_at.desc()).limit(5).all()
+        recent_scans = _scan_list_query(current_user_id).order_by(
+            ScanHistory.created_at.desc()
+        ).limit(5).all()
 
         # Get recent resumes (last 3)
-        recent_resumes = Resume.query.filter_by(
+        recent_resumes = Resume.query.options(load_only(
+            Resume.id, Resume.title, Resume.original_filename,
+            Resume.keywords_extracted, Resume.keyword_count, Resume.created_at
+        )).filter_by(
             user_id=current_user_id,
             is_active=True
         ).order_by(Resume.created_at.desc()).limit(3).all()
 
         # Get recent job descriptions (last 3)
-        recent_jds = JobDescription.query.filter_by(
+        recent_jds = JobDescription.query.options(load_only(
+            JobDescription.id, JobDescription.title, JobDescription.company_name,
+            JobDescription.keywords_extracted, JobDescription.keyword_count, JobDescription.created_at
+        )).filter_by(
             user_id=current_user_id,
             is_active=True
         ).order_by(JobDescription.created_at.desc()).limit(3).all()
@@ -279,8 +326,8 @@ def get_recent_activity():
         # Format recent scans
         formatted_scans = []
         for scan in recent_scans:
-            resume = Resume.query.get(scan.resume_id) if scan.resume_id else None
-            job_description = JobDescription.query.get(scan.job_description_id) if scan.job_description_id else None
+            resume = scan.resume
+            job_description = scan.job_description
 
             formatted_scans.append({
                 'id': scan.id,
@@ -0,0 +1 @@
+# Marks scripts as a Python package
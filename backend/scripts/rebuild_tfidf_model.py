@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Rebuild the corpus TF-IDF model from every stored resume and job description
+
+The running app only adds new documents to the model. Edited and deleted
+documents are still counted until the model is rebuilt, so run this
+periodically (e.g. nightly from cron). Running processes pick up the new
+model within a minute.
+
+Usage:
+    python -m backend.scripts.rebuild_tfidf_model
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+# Add the project root to Python path for imports
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+
+def main():
+    os.environ.setdefault('ASYNC_UPLOAD_PROCESSING', 'false')
+    os.environ['TFIDF_BUILD_ON_START'] = 'false'  # the rebuild below replaces the startup fit
+
+    # create_app() is chatty; only the result goes to stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        from backend.app import create_app
+        app = create_app()
+
+    from backend.services.tfidf_model import corpus_tfidf_model, TFIDF_MODEL_AVAILABLE
+    if not TFIDF_MODEL_AVAILABLE:
+        print("❌ scikit-learn is not installed")
+        return 1
+
+    with app.app_context():
+        documents = corpus_tfidf_model.rebuild_from_database()
+
+    print(f"✅ TF-IDF model rebuilt from {documents} documents "
+          f"({len(corpus_tfidf_model.idf)} weighted terms) -> {corpus_tfidf_model.path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Rebuild the analysis artifacts of stored resumes and job descriptions
+
+Artifacts that are stale (older ANALYSIS_ARTIFACT_VERSION, changed text, or a spaCy
+model that was installed or removed since) are otherwise rebuilt one by one on the
+first request that reads them. This backfills them in batches instead, running
+spaCy over each batch with nlp.pipe.
+
+Usage:
+    python -m backend.scripts.refresh_analysis_artifacts
+    python -m backend.scripts.refresh_analysis_artifacts --all --batch-size 64
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+# Add the project root to Python path for imports
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--all', action='store_true', help='rebuild current artifacts as well')
+    parser.add_argument('--batch-size', type=int, default=32, help='documents per batch (default 32)')
+    args = parser.parse_args()
+
+    os.environ.setdefault('ASYNC_UPLOAD_PROCESSING', 'false')
+    os.environ['TFIDF_BUILD_ON_START'] = 'false'
+
+    # create_app() is chatty; only the result goes to stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        from backend.app import create_app
+        app = create_app()
+
+    from backend.models import db, Resume, JobDescription
+    from backend.services.document_analysis import (
+        document_text, is_artifact_current, refresh_analysis_artifacts
+    )
+
+    refreshed = 0
+    with app.app_context():
+        for model in (Resume, JobDescription):
+            ids = [row_id for (row_id,) in db.session.query(model.id).filter(model.is_active == True)]
+            for start in range(0, len(ids), args.batch_size):
+                documents = model.query.filter(model.id.in_(ids[start:start + args.batch_size])).all()
+                if not args.all:
+                    documents = [d for d in documents
+                                 if not is_artifact_current(d.analysis_artifact, document_text(d))]
+                if documents:
+                    refreshed += refresh_analysis_artifacts(documents)
+                    db.session.commit()
+                db.session.expunge_all()
+
+    print(f"✅ Rebuilt {refreshed} analysis artifacts")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
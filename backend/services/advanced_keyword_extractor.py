@@ -6,6 +6,7 @@ Implements the exact algorithm specified with regex patterns, normalization, and
 
 import re
 from typing import Dict, List, Set, Tuple
+from backend.services.text_normalizer import keyword_text, stemmed_text
 
 class AdvancedKeywordExtractor:
     """Advanced keyword extraction with comprehensive pattern matching"""
@@ -30,34 +31,6 @@ class AdvancedKeywordExtractor:
             'medium': ['html', 'css', 'git', 'docker', 'kubernetes']
         }
 
-    def get_all_variations(self, keyword: str) -> List[str]:
-        """Get all variations of a keyword"""
-        keyword_lower = keyword.lower()
-        if keyword_lower in self.keyword_variations:
-            return self.keyword_variations[keyword_lower]
-        return [keyword_lower]
-
-    def normalize_keyword(self, keyword: str) -> str:
-        """Normalize a keyword to its canonical form"""
-        keyword_lower = keyword.lower().strip()
-
-        # Find the canonical form
-        for canonical, variations in self.keyword_variations.items():
-            if keyword_lower in [v.lower() for v in variations]:
-                return canonical
-
-        return keyword_lower
-
-    def get_priority_level(self, keyword: str, context_text: str = "") -> str:
-        """Get priority level of a keyword"""
-        keyword_lower = keyword.lower()
-
-        for priority, keywords in self.priority_keywords.items():
-            if keyword_lower in [k.lower() for k in keywords]:
-                return priority
-
-        return "medium"  # Default priority
-        
         # Comprehensive technical keywords list
         self.TECH_KEYWORDS = [
             "asp.net core", "c#", "entity framework", "sql server", "angular", "typescript",
@@ -100,7 +73,35 @@ class AdvancedKeywordExtractor:
             "automation", "testing", "quality", "production", "development", "software",
             "application", "system", "platform", "solution", "service", "technology"
         ]
-    
+
+    def get_all_variations(self, keyword: str) -> List[str]:
+        """Get all variations of a keyword"""
+        keyword_lower = keyword.lower()
+        if keyword_lower in self.keyword_variations:
+            return self.keyword_variations[keyword_lower]
+        return [keyword_lower]
+
+    def normalize_keyword(self, keyword: str) -> str:
+        """Normalize a keyword to its canonical form"""
+        keyword_lower = keyword.lower().strip()
+
+        # Find the canonical form
+        for canonical, variations in self.keyword_variations.items():
+            if keyword_lower in [v.lower() for v in variations]:
+                return canonical
+
+        return keyword_lower
+
+    def get_priority_level(self, keyword: str, context_text: str = "") -> str:
+        """Get priority level of a keyword"""
+        keyword_lower = keyword.lower()
+
+        for priority, keywords in self.priority_keywords.items():
+            if keyword_lower in [k.lower() for k in keywords]:
+                return priority
+
+        return "medium"  # Default priority
+
     def extract_keywords(self, text: str, keyword_list: List[str]) -> Set[str]:
         """Extract keywords using regex patterns with normalization"""
         text_lower = text.lower()
@@ -158,35 +159,15 @@ class AdvancedKeywordExtractor:
         return found
     
     def normalize_text(self, text: str) -> str:
-        """Normalize text by removing punctuation and extra spaces"""
-        # Remove extra punctuation but keep important ones
-        text = re.sub(r'[^\w\s\.\-#\+]', ' ', text)
-        # Normalize multiple spaces
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        """Normalize text by removing punctuation and extra spaces (lowercased, cached per document)"""
+        return keyword_text(text)
     
     def extract_with_stemming(self, text: str, keyword_list: List[str]) -> Set[str]:
         """Extract keywords with basic stemming (RESTful → REST)"""
-        text_lower = text.lower()
         found = set()
         
-        # Basic stemming patterns
-        stemming_patterns = {
-            r'\brestful\b': 'rest',
-            r'\bapis?\b': 'api',
-            r'\bdatabases?\b': 'database',
-            r'\bframeworks?\b': 'framework',
-            r'\bservices?\b': 'service',
-            r'\bcomponents?\b': 'component',
-            r'\bmicroservices?\b': 'microservices',
-            r'\bcontainers?\b': 'container',
-            r'\btechnologies?\b': 'technology'
-        }
-        
-        # Apply stemming
-        normalized_text = text_lower
-        for pattern, replacement in stemming_patterns.items():
-            normalized_text = re.sub(pattern, replacement, normalized_text)
+        # Apply stemming (all variants in one pass, see text_normalizer.STEMS)
+        normalized_text = stemmed_text(text)
         
         # Extract from normalized text
         for kw in keyword_list:
@@ -0,0 +1,228 @@
+"""
+Content-addressed cache for real-time resume/job description analysis
+Keeps per-document analyses and pair-level match results keyed by a hash of the text
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the analysis output changes shape so stale disk entries are ignored
+ANALYSIS_CACHE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024  # 32MB of serialized entries per process
+DEFAULT_DISK_MAX_ENTRIES = 50000
+DISK_PRUNE_INTERVAL = 100  # writes between size checks of the SQLite tier
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before hashing/analysis (surrounding whitespace and line endings)"""
+    return (text or '').replace('\r\n', '\n').replace('\r', '\n').strip()
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of the normalized text"""
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Two-tier LRU cache for analysis results
+
+    Tier 1 is an in-process LRU bounded by the total size of the serialized
+    entries. Tier 2 is an optional SQLite file shared by every gunicorn worker on
+    the host. Values are stored as JSON strings, so callers always receive a fresh
+    copy they are free to mutate.
+    """
+
+    DOCUMENT = 'doc'
+    PAIR = 'pair'
+
+    def __init__(self, max_bytes: Optional[int] = None, db_path: Optional[str] = None,
+                 disk_max_entries: Optional[int] = None):
+        """
+        Args:
+            max_bytes: Memory cap for tier 1 (env ANALYSIS_CACHE_MAX_BYTES, 0 disables it)
+            db_path: SQLite file for tier 2 (env ANALYSIS_CACHE_DB, unset disables it)
+            disk_max_entries: Row cap for tier 2 (env ANALYSIS_CACHE_DISK_MAX_ENTRIES)
+        """
+        if max_bytes is None:
+            max_bytes = int(os.getenv('ANALYSIS_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        if db_path is None:
+            db_path = os.getenv('ANALYSIS_CACHE_DB') or None
+        if disk_max_entries is None:
+            disk_max_entries = int(os.getenv('ANALYSIS_CACHE_DISK_MAX_ENTRIES', DEFAULT_DISK_MAX_ENTRIES))
+
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.disk_max_entries = disk_max_entries
+
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._current_bytes = 0
+        self._disk_writes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+        if self.db_path:
+            self._init_disk_tier()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_document(self, text_hash: str) -> Optional[Dict]:
+        """Cached semantic analysis of a single document, or None"""
+        return self._get(self._key(self.DOCUMENT, text_hash))
+
+    def set_document(self, text_hash: str, analysis: Dict) -> None:
+        """Store the semantic analysis of a single document"""
+        self._set(self._key(self.DOCUMENT, text_hash), analysis)
+
+    def get_pair(self, resume_hash: str, jd_hash: str) -> Optional[Dict]:
+        """Cached match result for a resume/job description pair, or None"""
+        return self._get(self._key(self.PAIR, f'{resume_hash}:{jd_hash}'))
+
+    def set_pair(self, resume_hash: str, jd_hash: str, result: Dict) -> None:
+        """Store the match result for a resume/job description pair"""
+        self._set(self._key(self.PAIR, f'{resume_hash}:{jd_hash}'), result)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (the disk tier is left untouched)"""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _key(kind: str, digest: str) -> str:
+        return f'v{ANALYSIS_CACHE_VERSION}:{kind}:{digest}'
+
+    def _get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+
+        if payload is None and self.db_path:
+            payload = self._disk_get(key)
+            if payload is not None:
+                self.stats['disk_hits'] += 1
+                self._remember(key, payload)
+
+        if payload is None:
+            self.stats['misses'] += 1
+            return None
+
+        return json.loads(payload)
+
+    def _set(self, key: str, value: Dict) -> None:
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Analysis result not cacheable: {e}")
+            return
+
+        self._remember(key, payload)
+        if self.db_path:
+            self._disk_set(key, payload)
+
+    def _remember(self, key: str, payload: str) -> None:
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= len(previous)
+
+            self._entries[key] = payload
+            self._current_bytes += size
+
+            # Evict least recently used entries until we are back under the cap
+            while self._current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._current_bytes -= len(evicted)
+                self.stats['evictions'] += 1
+
+    # ------------------------------------------------------------------
+    # SQLite tier
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection committed on success and always closed"""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_disk_tier(self) -> None:
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS analysis_cache ('
+                    'cache_key TEXT PRIMARY KEY, payload TEXT NOT NULL, accessed_at REAL NOT NULL)'
+                )
+                conn.execute(
+                    'CREATE INDEX IF NOT EXISTS idx_analysis_cache_accessed ON analysis_cache (accessed_at)'
+                )
+            logger.info(f"Analysis cache disk tier enabled at {self.db_path}")
+        except sqlite3.Error as e:
+            logger.error(f"Could not open analysis cache database {self.db_path}: {e}")
+            self.db_path = None
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT payload FROM analysis_cache WHERE cache_key = ?', (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    'UPDATE analysis_cache SET accessed_at = ? WHERE cache_key = ?', (time.time(), key)
+                )
+                return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache read failed: {e}")
+            return None
+
+    def _disk_set(self, key: str, payload: str) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO analysis_cache (cache_key, payload, accessed_at) VALUES (?, ?, ?)',
+                    (key, payload, time.time())
+                )
+
+                # Keep the shared file bounded - drop the least recently used rows
+                self._disk_writes += 1
+                if self._disk_writes % DISK_PRUNE_INTERVAL:
+                    return
+                conn.execute(
+                    'DELETE FROM analysis_cache WHERE cache_key IN ('
+                    'SELECT cache_key FROM analysis_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                    (self.disk_max_entries,)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache write failed: {e}")
@@ -0,0 +1,160 @@
+"""
+Per-document analysis artifacts
+Computes the text analysis of a resume or job description once and stores it with the row,
+so matching and suggestions compare stored results instead of re-parsing text per request
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence
+
+from backend.models import db, Resume
+from backend.services.analysis_cache import content_hash, normalize_text
+from backend.services.nlp_provider import nlp_provider
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the artifact layout or the analysis behind it changes
+ANALYSIS_ARTIFACT_VERSION = 1
+
+# Created lazily: both services import this module, so importing them here would be circular
+_semantic_service = None
+_suggestions_service = None
+
+
+def _get_semantic_service():
+    """Shared RealTimeLLMService used for semantic analysis"""
+    global _semantic_service
+    if _semantic_service is None:
+        from backend.services.enhanced_matching_service import RealTimeLLMService
+        _semantic_service = RealTimeLLMService()
+    return _semantic_service
+
+
+def _get_suggestions_service():
+    """Shared DynamicSuggestionsService used for NLP keyword extraction"""
+    global _suggestions_service
+    if _suggestions_service is None:
+        from backend.services.dynamic_suggestions_service import DynamicSuggestionsService
+        _suggestions_service = DynamicSuggestionsService()
+    return _suggestions_service
+
+
+def document_text(document) -> str:
+    """Text a Resume or JobDescription is analyzed from"""
+    if isinstance(document, Resume):
+        return document.extracted_text or ''
+    return document.job_text or ''
+
+
+def build_analysis_artifact(text: str) -> Dict:
+    """
+    Analyze a document's text
+
+    Args:
+        text: Resume or job description text
+
+    Returns:
+        Dict with the semantic analysis (skill frequency maps, experience and
+        education context, key phrases, text metrics) and the NLP keywords used
+        by the suggestions service, tagged with version and text hash
+    """
+    return build_analysis_artifacts([text])[0]
+
+
+def build_analysis_artifacts(texts: Sequence[str]) -> List[Dict]:
+    """
+    build_analysis_artifact for many texts, running spaCy over them in nlp.pipe batches
+
+    Args:
+        texts: Resume or job description texts
+
+    Returns:
+        One artifact per text, in input order
+    """
+    suggestions_service = _get_suggestions_service()
+    nlp_enabled = nlp_provider.available
+    if nlp_enabled:
+        nlp_keywords = suggestions_service._extract_nlp_keywords_many(texts)
+    else:
+        nlp_keywords = [{'technical': [], 'soft_skills': [], 'other': []} for _ in texts]
+
+    artifacts = []
+    for text, keywords in zip(texts, nlp_keywords):
+        normalized = normalize_text(text)
+        text_hash = content_hash(normalized)
+        artifacts.append({
+            'version': ANALYSIS_ARTIFACT_VERSION,
+            'text_hash': text_hash,
+            'nlp_enabled': nlp_enabled,
+            'semantic': _get_semantic_service()._get_document_analysis(normalized, text_hash),
+            'nlp_keywords': keywords
+        })
+    return artifacts
+
+
+def is_artifact_current(artifact: Optional[Dict], text: str) -> bool:
+    """Whether a stored artifact was built from this text by the current analyzer"""
+    if not artifact or artifact.get('version') != ANALYSIS_ARTIFACT_VERSION:
+        return False
+    if artifact.get('text_hash') != content_hash(text):
+        return False
+    # A model that became available (or went away) changes the NLP keywords
+    return artifact.get('nlp_enabled') == nlp_provider.available
+
+
+def refresh_analysis_artifact(document) -> Optional[Dict]:
+    """
+    Rebuild the artifact of a Resume or JobDescription (the caller commits)
+
+    Returns:
+        The new artifact, or None when the document has no text yet
+    """
+    text = document_text(document)
+    if not text:
+        document.analysis_artifact = None
+        return None
+
+    artifact = build_analysis_artifact(text)
+    document.analysis_artifact = artifact
+    return artifact
+
+
+def refresh_analysis_artifacts(documents: Sequence) -> int:
+    """
+    Rebuild the artifacts of many Resumes and JobDescriptions in one batch (the caller commits)
+
+    Returns:
+        Number of documents that got an artifact
+    """
+    with_text = []
+    for document in documents:
+        if document_text(document):
+            with_text.append(document)
+        else:
+            document.analysis_artifact = None
+
+    artifacts = build_analysis_artifacts([document_text(document) for document in with_text])
+    for document, artifact in zip(with_text, artifacts):
+        document.analysis_artifact = artifact
+    return len(with_text)
+
+
+def get_analysis_artifact(document) -> Optional[Dict]:
+    """
+    Current artifact of a document, rebuilding it when stale
+
+    Rows created before artifacts existed, or whose text changed without a
+    rebuild, are backfilled here. The backfill is only flushed: the calling
+    route commits it together with the rest of its request.
+    """
+    artifact = document.analysis_artifact
+    if is_artifact_current(artifact, document_text(document)):
+        return artifact
+
+    artifact = refresh_analysis_artifact(document)
+    try:
+        db.session.flush()
+    except Exception as e:
+        logger.warning(f"Could not write analysis artifact for {document!r}: {e}")
+        raise
+    return artifact
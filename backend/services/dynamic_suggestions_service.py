@@ -7,9 +7,14 @@ No hardcoded suggestions - everything is based on real keyword comparison and NL
 
 import json
 import re
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterable, List, Set, Tuple
 from backend.models import Resume, JobDescription
 from backend.services.matching_service import MatchingService
+from backend.services.document_analysis import get_analysis_artifact
+from backend.services.nlp_provider import nlp_provider
+
+# Annotations read by _extract_nlp_keywords; the lemmatizer is skipped
+NLP_KEYWORD_ANNOTATIONS = ('ents', 'noun_chunks')
 
 class DynamicSuggestionsService:
     """Enhanced suggestions service with advanced NLP-based keyword analysis"""
@@ -17,19 +22,9 @@ class DynamicSuggestionsService:
     def __init__(self):
         self.matching_service = MatchingService()
 
-        # Initialize NLP components for better keyword analysis (lazy loading)
-        self.nlp = None  # Load spaCy model lazily when needed
-
     def _get_nlp_model(self):
-        """Load spaCy model lazily"""
-        if self.nlp is None:
-            try:
-                import spacy
-                self.nlp = spacy.load('en_core_web_sm')
-            except:
-                self.nlp = False  # Mark as unavailable
-                print("⚠️ spaCy not available - using basic keyword analysis")
-        return self.nlp if self.nlp is not False else None
+        """Shared spaCy model (see nlp_provider), or None when it is not installed"""
+        return nlp_provider.get()
 
     def analyze_keywords_advanced(self, resume_id: int, jd_id: int, user_id: int) -> Dict:
         """
@@ -44,11 +39,21 @@ class DynamicSuggestionsService:
             if not resume or not jd:
                 return {'success': False, 'message': 'Resume or JD not found'}
 
+            # NLP keywords come from the analysis artifact stored with each document
+            jd_artifact = get_analysis_artifact(jd) or {}
+            resume_artifact = get_analysis_artifact(resume) or {}
+
+            # Decoded once per request and shared with the matching service
+            jd_stored = jd.get_keywords()
+            resume_stored = resume.get_keywords()
+
             # X = JD keywords (structured extraction)
-            jd_keywords = self._extract_structured_keywords(jd.job_text, jd.technical_skills, jd.soft_skills, jd.other_keywords)
+            jd_keywords = self._extract_structured_keywords(jd_stored['technical_skills'], jd_stored['soft_skills'],
+                                                            jd_stored['other_keywords'], jd_artifact.get('nlp_keywords'))
 
             # Y = Resume keywords (structured extraction)
-            resume_keywords = self._extract_structured_keywords(resume.extracted_text, resume.technical_skills, resume.soft_skills, resume.other_keywords)
+            resume_keywords = self._extract_structured_keywords(resume_stored['technical_skills'], resume_stored['soft_skills'],
+                                                                resume_stored['other_keywords'], resume_artifact.get('nlp_keywords'))
 
             # Z = Missing keywords (JD has but Resume doesn't)
             missing_keywords = self._find_missing_keywords(jd_keywords, resume_keywords)
@@ -77,18 +82,17 @@ class DynamicSuggestionsService:
         except Exception as e:
             return {'success': False, 'message': f'Analysis error: {str(e)}'}
 
-    def _extract_structured_keywords(self, text: str, tech_skills: str, soft_skills: str, other_keywords: str) -> Dict[str, Set[str]]:
-        """Extract and structure keywords from text and existing keyword fields"""
+    def _extract_structured_keywords(self, tech_skills, soft_skills, other_keywords,
+                                     nlp_keywords: Dict[str, List[str]] = None) -> Dict[str, Set[str]]:
+        """Structure keywords from the stored keyword fields and precomputed NLP keywords"""
 
         # Parse existing keyword fields
         tech_set = set(self._clean_keywords(self._parse_keywords(tech_skills)))
         soft_set = set(self._clean_keywords(self._parse_keywords(soft_skills)))
         other_set = set(self._clean_keywords(self._parse_keywords(other_keywords)))
 
-        # Extract additional keywords from text using NLP
-        nlp_model = self._get_nlp_model()
-        if nlp_model and text:
-            nlp_keywords = self._extract_nlp_keywords(text)
+        # Add keywords found by the NLP pass (see _extract_nlp_keywords)
+        if nlp_keywords:
             tech_set.update(nlp_keywords['technical'])
             soft_set.update(nlp_keywords['soft_skills'])
             other_set.update(nlp_keywords['other'])
@@ -162,12 +166,25 @@ class DynamicSuggestionsService:
 
     def _extract_nlp_keywords(self, text: str) -> Dict[str, List[str]]:
         """Extract keywords using NLP analysis"""
-        nlp_model = self._get_nlp_model()
-        if not nlp_model or not text:
+        if not text or not nlp_provider.available:
             return {'technical': [], 'soft_skills': [], 'other': []}
-
-        doc = nlp_model(text)
-
+        return self._keywords_from_doc(text, nlp_provider(text, needs=NLP_KEYWORD_ANNOTATIONS))
+
+    def _extract_nlp_keywords_many(self, texts: Iterable[str]) -> List[Dict[str, List[str]]]:
+        """_extract_nlp_keywords for many texts, annotated in nlp.pipe batches"""
+        texts = list(texts)
+        results = [{'technical': [], 'soft_skills': [], 'other': []} for _ in texts]
+        if not nlp_provider.available:
+            return results
+
+        indexed = [(i, text) for i, text in enumerate(texts) if text]
+        docs = nlp_provider.pipe((text for _, text in indexed), needs=NLP_KEYWORD_ANNOTATIONS)
+        for (i, text), doc in zip(indexed, docs):
+            results[i] = self._keywords_from_doc(text, doc)
+        return results
+
+    def _keywords_from_doc(self, text: str, doc) -> Dict[str, List[str]]:
+        """Categorized keywords of a text and its spaCy Doc"""
         # Technical keywords patterns
         tech_patterns = [
             r'\b(?:javascript|js|typescript|ts|python|java|c#|csharp|\.net|asp\.net)\b',
@@ -622,9 +639,12 @@ class DynamicSuggestionsService:
             }
     
     def _parse_keywords(self, keywords_str):
-        """Parse keywords from JSON string or comma-separated string"""
+        """Parse keywords from a decoded list, JSON string or comma-separated string"""
         if not keywords_str:
             return []
+
+        if isinstance(keywords_str, list):
+            return keywords_str
         
         try:
             # Try parsing as JSON first
@@ -10,12 +10,109 @@ from typing import Dict, List, Tuple, Set, Optional
 from collections import Counter
 from datetime import datetime
 from backend.models import db, Resume, JobDescription, MatchScore
+from backend.services.analysis_cache import AnalysisCache, content_hash, normalize_text
+from backend.services.document_analysis import get_analysis_artifact
+from backend.services.stage_timer import StageTrace, stage_metrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Semantic extraction vocabularies - regex alternatives for each skill/level
+TECHNICAL_SKILL_TERMS = {
+    'javascript': [r'javascript', r'js', r'node\.?js', r'typescript', r'ts', r'react', r'angular', r'vue'],
+    'python': [r'python', r'py', r'django', r'flask', r'fastapi', r'pandas', r'numpy'],
+    'java': [r'java', r'spring', r'hibernate', r'maven', r'gradle'],
+    'csharp': [r'c#', r'csharp', r'\.net', r'asp\.net', r'entity framework'],
+    'database': [r'sql', r'mysql', r'postgresql', r'mongodb', r'redis', r'database', r'db'],
+    'cloud': [r'aws', r'azure', r'gcp', r'google cloud', r'amazon web services', r'cloud'],
+    'devops': [r'docker', r'kubernetes', r'jenkins', r'ci/cd', r'devops', r'terraform'],
+    'web': [r'html', r'css', r'sass', r'less', r'bootstrap', r'tailwind', r'responsive'],
+    'api': [r'api', r'rest', r'restful', r'graphql', r'microservices', r'json'],
+    'testing': [r'testing', r'unit test', r'integration test', r'tdd', r'bdd', r'jest', r'pytest']
+}
+
+SOFT_SKILL_TERMS = {
+    'leadership': [r'leadership', r'lead', r'manage', r'mentor', r'coach', r'supervise'],
+    'communication': [r'communication', r'present', r'collaborate', r'negotiate', r'articulate'],
+    'teamwork': [r'team', r'collaborate', r'cooperation', r'cross-functional', r'partnership'],
+    'problem_solving': [r'problem.solving', r'troubleshoot', r'analyze', r'debug', r'resolve'],
+    'project_management': [r'project.management', r'agile', r'scrum', r'kanban', r'planning'],
+    'adaptability': [r'adapt', r'flexible', r'versatile', r'learn', r'growth'],
+    'creativity': [r'creative', r'innovative', r'design', r'brainstorm', r'ideate'],
+    'time_management': [r'time.management', r'prioritize', r'deadline', r'efficient', r'organize']
+}
+
+EDUCATION_TERMS = {
+    'bachelor': [r'bachelor', r'b\.?s\.?', r'b\.?a\.?', r'undergraduate'],
+    'master': [r'master', r'm\.?s\.?', r'm\.?a\.?', r'mba', r'graduate'],
+    'phd': [r'phd', r'ph\.?d\.?', r'doctorate', r'doctoral'],
+    'certification': [r'certified', r'certification', r'certificate']
+}
+
+
+class CategoryPattern:
+    """
+    One compiled regex covering every skill in a category
+
+    Alternatives are merged into named groups so a single finditer pass yields
+    per-skill frequencies. A term listed under several skills (e.g. 'collaborate')
+    gets its own group that credits all of its owners, matching the counts of the
+    original one-findall-per-skill approach.
+    """
+
+    def __init__(self, skill_terms: Dict[str, List[str]]):
+        # Map each distinct term to every skill that lists it
+        term_owners: Dict[str, List[str]] = {}
+        for skill, terms in skill_terms.items():
+            for term in terms:
+                owners = term_owners.setdefault(term, [])
+                if skill not in owners:
+                    owners.append(skill)
+
+        # One named group per distinct owner set, in first-seen order
+        group_terms: Dict[Tuple[str, ...], List[str]] = {}
+        for term, owners in term_owners.items():
+            group_terms.setdefault(tuple(owners), []).append(term)
+
+        self.group_skills: Dict[str, Tuple[str, ...]] = {}
+        alternatives = []
+        for owners, terms in group_terms.items():
+            group_name = '__'.join(owners)
+            self.group_skills[group_name] = owners
+            alternatives.append(f"(?P<{group_name}>{'|'.join(terms)})")
+
+        self.regex = re.compile(r'\b(?:' + '|'.join(alternatives) + r')\b', re.IGNORECASE)
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Count matches per skill in one pass; skills without matches are omitted"""
+        counts: Dict[str, int] = {}
+        group_skills = self.group_skills
+        for match in self.regex.finditer(text):
+            for skill in group_skills[match.lastgroup]:
+                counts[skill] = counts.get(skill, 0) + 1
+        return counts
+
+
+# Compiled pattern registry shared by every RealTimeLLMService instance
+TECHNICAL_SKILL_PATTERN = CategoryPattern(TECHNICAL_SKILL_TERMS)
+SOFT_SKILL_PATTERN = CategoryPattern(SOFT_SKILL_TERMS)
+EDUCATION_PATTERN = CategoryPattern(EDUCATION_TERMS)
+
+# Experience patterns may overlap on the same phrase, so each keeps its own pass
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years?\s*(?:of\s*)?experience', re.IGNORECASE),
+    re.compile(r'(\d+)\+?\s*years?\s*in', re.IGNORECASE),
+    re.compile(r'experience\s*(?:of\s*)?(\d+)\+?\s*years?', re.IGNORECASE)
+]
+
+KEY_PHRASE_PATTERNS = [
+    re.compile(r'(?:developed|created|implemented|designed|built|managed|led|improved)\s+[^.]{10,50}', re.IGNORECASE),
+    re.compile(r'(?:responsible for|experience in|skilled in|proficient in)\s+[^.]{10,50}', re.IGNORECASE)
+]
+
+
 class RealTimeLLMService:
     """
     Real-time LLM service for accurate resume-job description analysis
@@ -25,6 +122,9 @@ class RealTimeLLMService:
     def __init__(self):
         self.logger = logger
 
+        # Content-addressed cache so unchanged documents are never re-analyzed
+        self.analysis_cache = AnalysisCache()
+
         # Enhanced skill synonyms with semantic understanding
         self.skill_synonyms = {
             'javascript': ['js', 'node.js', 'nodejs', 'ecmascript', 'es6', 'es2015', 'typescript', 'ts'],
@@ -64,55 +164,101 @@ class RealTimeLLMService:
             job_description_text: Raw job description text
 
         Returns:
-            Dict containing comprehensive real-time analysis
+            Dict containing comprehensive real-time analysis, with the milliseconds
+            spent per stage under 'stage_timings'
         """
+        trace = stage_metrics.trace('analyze_resume_realtime')
         try:
+            resume_text = normalize_text(resume_text)
+            job_description_text = normalize_text(job_description_text)
+
             if not resume_text or not job_description_text:
                 return {'success': False, 'error': 'Missing resume or job description text'}
 
-            # Perform real-time semantic analysis
-            resume_analysis = self._analyze_text_semantically(resume_text)
-            jd_analysis = self._analyze_text_semantically(job_description_text)
+            # Re-scanning an identical pair is served straight from the cache
+            resume_hash = content_hash(resume_text)
+            jd_hash = content_hash(job_description_text)
+            with trace.span('cache_lookup'):
+                cached_result = self.analysis_cache.get_pair(resume_hash, jd_hash)
+            if cached_result is not None:
+                cached_result['timestamp'] = datetime.utcnow().isoformat()
+                cached_result['stage_timings'] = trace.finish()
+                return cached_result
+
+            # Perform real-time semantic analysis (only for documents not seen before)
+            with trace.span('semantic_analysis.resume'):
+                resume_analysis = self._get_document_analysis(resume_text, resume_hash)
+            with trace.span('semantic_analysis.job_description'):
+                jd_analysis = self._get_document_analysis(job_description_text, jd_hash)
+
+            result = self._compare_analyses(resume_text, resume_analysis, jd_analysis, trace)
+            self.analysis_cache.set_pair(resume_hash, jd_hash, result)
+            # Timings describe this call, so they are added after caching
+            result['stage_timings'] = trace.finish()
+            return result
 
-            # Calculate real-time matching scores
+        except Exception as e:
+            self.logger.error(f"Error in real-time analysis: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def _compare_analyses(self, resume_text: str, resume_analysis: Dict, jd_analysis: Dict,
+                          trace: Optional[StageTrace] = None) -> Dict:
+        """
+        Build the full match result from two precomputed document analyses
+
+        Args:
+            resume_text: Normalized resume text (used for ATS and density checks)
+            resume_analysis: Semantic analysis of the resume
+            jd_analysis: Semantic analysis of the job description
+            trace: Stage trace of the calling operation (a 'compare_analyses' one when omitted)
+
+        Returns:
+            Dict in the analyze_resume_realtime response format
+        """
+        if trace is None:
+            trace = stage_metrics.trace('compare_analyses')
+
+        # Calculate real-time matching scores
+        with trace.span('realtime_match'):
             match_results = self._calculate_realtime_match(resume_analysis, jd_analysis)
 
-            # Generate contextual recommendations
+        # Generate contextual recommendations
+        with trace.span('recommendations'):
             recommendations = self._generate_contextual_recommendations(
                 resume_analysis, jd_analysis, match_results
             )
 
-            # Calculate ATS compatibility score
+        # Calculate ATS compatibility score
+        with trace.span('ats_compatibility'):
             ats_score = self._calculate_ats_compatibility(resume_text, jd_analysis)
 
-            return {
-                'success': True,
-                'timestamp': datetime.utcnow().isoformat(),
-                'overall_match_score': match_results['overall_score'],
-                'category_scores': {
-                    'technical_skills': match_results['technical_score'],
-                    'soft_skills': match_results['soft_skills_score'],
-                    'experience_match': match_results['experience_score'],
-                    'education_match': match_results['education_score'],
-                    'ats_compatibility': ats_score
-                },
-                'detailed_analysis': {
-                    'matched_skills': match_results['matched_skills'],
-                    'missing_skills': match_results['missing_skills'],
-                    'skill_gaps': match_results['skill_gaps'],
-                    'strength_areas': match_results['strength_areas']
-                },
-                'recommendations': recommendations,
-                'keyword_analysis': {
-                    'resume_keywords': resume_analysis['extracted_keywords'],
-                    'jd_keywords': jd_analysis['extracted_keywords'],
-                    'keyword_density': self._calculate_keyword_density(resume_text, jd_analysis)
-                }
-            }
+        with trace.span('keyword_density'):
+            keyword_density = self._calculate_keyword_density(resume_text, jd_analysis)
 
-        except Exception as e:
-            self.logger.error(f"Error in real-time analysis: {e}")
-            return {'success': False, 'error': str(e)}
+        return {
+            'success': True,
+            'timestamp': datetime.utcnow().isoformat(),
+            'overall_match_score': match_results['overall_score'],
+            'category_scores': {
+                'technical_skills': match_results['technical_score'],
+                'soft_skills': match_results['soft_skills_score'],
+                'experience_match': match_results['experience_score'],
+                'education_match': match_results['education_score'],
+                'ats_compatibility': ats_score
+            },
+            'detailed_analysis': {
+                'matched_skills': match_results['matched_skills'],
+                'missing_skills': match_results['missing_skills'],
+                'skill_gaps': match_results['skill_gaps'],
+                'strength_areas': match_results['strength_areas']
+            },
+            'recommendations': recommendations,
+            'keyword_analysis': {
+                'resume_keywords': resume_analysis['extracted_keywords'],
+                'jd_keywords': jd_analysis['extracted_keywords'],
+                'keyword_density': keyword_density
+            }
+        }
 
     def calculate_enhanced_match_score(self, resume_id: int, job_description_id: int, user_id: int) -> Dict:
         """
@@ -126,13 +272,45 @@ class RealTimeLLMService:
             if not resume or not job_description:
                 return {'success': False, 'error': 'Resume or job description not found'}
 
-            # Use real-time analysis for stored documents
-            return self.analyze_resume_realtime(resume.extracted_text, job_description.job_text)
+            if not resume.extracted_text or not job_description.job_text:
+                return {'success': False, 'error': 'Missing resume or job description text'}
+
+            # Stored documents carry their analysis, so only the comparison runs here
+            trace = stage_metrics.trace('calculate_enhanced_match_score')
+            with trace.span('analysis_artifacts'):
+                resume_artifact = get_analysis_artifact(resume)
+                jd_artifact = get_analysis_artifact(job_description)
+
+            result = self._compare_analyses(
+                normalize_text(resume.extracted_text),
+                resume_artifact['semantic'],
+                jd_artifact['semantic'],
+                trace
+            )
+            result['stage_timings'] = trace.finish()
+            return result
 
         except Exception as e:
             self.logger.error(f"Error in enhanced match calculation: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _get_document_analysis(self, text: str, text_hash: str) -> Dict:
+        """
+        Semantic analysis of a single document, served from the cache when possible
+
+        Args:
+            text: Normalized document text
+            text_hash: content_hash() of the text
+
+        Returns:
+            Dict with the same structure as _analyze_text_semantically
+        """
+        analysis = self.analysis_cache.get_document(text_hash)
+        if analysis is None:
+            analysis = self._analyze_text_semantically(text)
+            self.analysis_cache.set_document(text_hash, analysis)
+        return analysis
+
     def _analyze_text_semantically(self, text: str) -> Dict:
         """
         Advanced semantic analysis of text using NLP techniques
@@ -370,62 +548,17 @@ class RealTimeLLMService:
 
     def _extract_technical_skills_semantic(self, text: str) -> Dict[str, int]:
         """Extract technical skills with semantic understanding and frequency"""
-        skills_found = {}
-
-        # Enhanced technical skills patterns
-        tech_patterns = {
-            'javascript': r'\b(?:javascript|js|node\.?js|typescript|ts|react|angular|vue)\b',
-            'python': r'\b(?:python|py|django|flask|fastapi|pandas|numpy)\b',
-            'java': r'\b(?:java|spring|hibernate|maven|gradle)\b',
-            'csharp': r'\b(?:c#|csharp|\.net|asp\.net|entity framework)\b',
-            'database': r'\b(?:sql|mysql|postgresql|mongodb|redis|database|db)\b',
-            'cloud': r'\b(?:aws|azure|gcp|google cloud|amazon web services|cloud)\b',
-            'devops': r'\b(?:docker|kubernetes|jenkins|ci/cd|devops|terraform)\b',
-            'web': r'\b(?:html|css|sass|less|bootstrap|tailwind|responsive)\b',
-            'api': r'\b(?:api|rest|restful|graphql|microservices|json)\b',
-            'testing': r'\b(?:testing|unit test|integration test|tdd|bdd|jest|pytest)\b'
-        }
-
-        for skill, pattern in tech_patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                skills_found[skill] = len(matches)
-
-        return skills_found
+        return TECHNICAL_SKILL_PATTERN.count(text)
 
     def _extract_soft_skills_semantic(self, text: str) -> Dict[str, int]:
         """Extract soft skills with semantic understanding"""
-        skills_found = {}
-
-        soft_patterns = {
-            'leadership': r'\b(?:leadership|lead|manage|mentor|coach|supervise)\b',
-            'communication': r'\b(?:communication|present|collaborate|negotiate|articulate)\b',
-            'teamwork': r'\b(?:team|collaborate|cooperation|cross-functional|partnership)\b',
-            'problem_solving': r'\b(?:problem.solving|troubleshoot|analyze|debug|resolve)\b',
-            'project_management': r'\b(?:project.management|agile|scrum|kanban|planning)\b',
-            'adaptability': r'\b(?:adapt|flexible|versatile|learn|growth)\b',
-            'creativity': r'\b(?:creative|innovative|design|brainstorm|ideate)\b',
-            'time_management': r'\b(?:time.management|prioritize|deadline|efficient|organize)\b'
-        }
-
-        for skill, pattern in soft_patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                skills_found[skill] = len(matches)
-
-        return skills_found
+        return SOFT_SKILL_PATTERN.count(text)
 
     def _analyze_experience_context(self, text: str) -> Dict:
         """Analyze experience context from text"""
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\+?\s*years?\s*in',
-            r'experience\s*(?:of\s*)?(\d+)\+?\s*years?'
-        ]
-
         years_found = []
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in EXPERIENCE_PATTERNS:
+            matches = pattern.findall(text)
             years_found.extend([int(match) for match in matches if match.isdigit()])
 
         return {
@@ -436,20 +569,7 @@ class RealTimeLLMService:
 
     def _analyze_education_context(self, text: str) -> Dict:
         """Analyze education context from text"""
-        education_patterns = {
-            'bachelor': r'\b(?:bachelor|b\.?s\.?|b\.?a\.?|undergraduate)\b',
-            'master': r'\b(?:master|m\.?s\.?|m\.?a\.?|mba|graduate)\b',
-            'phd': r'\b(?:phd|ph\.?d\.?|doctorate|doctoral)\b',
-            'certification': r'\b(?:certified|certification|certificate)\b'
-        }
-
-        education_found = {}
-        for level, pattern in education_patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                education_found[level] = len(matches)
-
-        return education_found
+        return EDUCATION_PATTERN.count(text)
 
     def _extract_key_phrases(self, text: str) -> List[str]:
         """Extract key phrases using simple NLP techniques"""
@@ -459,13 +579,8 @@ class RealTimeLLMService:
 
         for sentence in sentences[:10]:  # Limit to first 10 sentences
             # Extract phrases with action verbs
-            action_patterns = [
-                r'(?:developed|created|implemented|designed|built|managed|led|improved)\s+[^.]{10,50}',
-                r'(?:responsible for|experience in|skilled in|proficient in)\s+[^.]{10,50}'
-            ]
-
-            for pattern in action_patterns:
-                matches = re.findall(pattern, sentence, re.IGNORECASE)
+            for pattern in KEY_PHRASE_PATTERNS:
+                matches = pattern.findall(sentence)
                 key_phrases.extend(matches[:3])  # Limit matches per sentence
 
         return key_phrases[:15]  # Return top 15 key phrases
@@ -2,14 +2,72 @@
 File parsing service for extracting text from PDF and DOC files
 """
 import os
+import threading
+import multiprocessing
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import deque
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import PyPDF2
-from docx import Document
 import logging
+from backend.services.text_normalizer import clean_lines
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Reasonable limit for resume text (database field limits)
+MAX_TEXT_LENGTH = 50000
+TRUNCATION_MARKER = "... [truncated]"
+
+# Optional page-parallel PDF extraction (env PDF_EXTRACTION_PROCESSES, 0 disables it)
+PDF_EXTRACTION_PROCESSES = int(os.getenv('PDF_EXTRACTION_PROCESSES', '0'))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '16'))
+PDF_PAGES_PER_TASK = 4
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+# WordprocessingML elements read by the streaming DOCX extractor
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCX_BODY, DOCX_PARAGRAPH, DOCX_RUN, DOCX_TEXT = _W + 'body', _W + 'p', _W + 'r', _W + 't'
+DOCX_TABLE_ROW, DOCX_TABLE_CELL = _W + 'tr', _W + 'tc'
+DOCX_RUN_CHARACTERS = {_W + 'tab': '\t', _W + 'br': '\n', _W + 'cr': '\n'}
+# Legacy copies of drawings/text boxes, skipped so their text is not read twice
+DOCX_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+
+def _get_pdf_pool():
+    """Shared process pool for page-parallel PDF extraction (spawned, safe from worker threads)"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_EXTRACTION_PROCESSES,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return _pdf_pool
+
+
+def _reset_pdf_pool():
+    """Drop a broken process pool so the next parallel extraction starts a fresh one"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_pool = None
+
+
+def _extract_pdf_page_range(file_path, start, stop):
+    """Cleaned lines of pages [start, stop) of a PDF - runs in a pool process"""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [
+            FileParser._normalize_lines(pdf_reader.pages[page_num].extract_text() or "")
+            for page_num in range(start, stop)
+        ]
+
+
 class FileParser:
     """Service for parsing resume files and extracting text content"""
     
@@ -25,8 +83,6 @@ class FileParser:
             tuple: (success: bool, text: str, error: str)
         """
         try:
-            text = ""
-            
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 
@@ -34,16 +90,23 @@ class FileParser:
                 if pdf_reader.is_encrypted:
                     return False, "", "PDF is password protected and cannot be processed"
                 
-                # Extract text from all pages
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    page_text = page.extract_text()
-                    
-                    if page_text:
-                        text += page_text + "\n"
-                
-                # Clean up the text
-                text = FileParser._clean_extracted_text(text)
+                # Clean up the text page by page, stopping once the length budget is used up
+                text = None
+                page_count = len(pdf_reader.pages)
+                if PDF_EXTRACTION_PROCESSES > 0 and page_count >= PDF_PARALLEL_MIN_PAGES:
+                    try:
+                        text = FileParser._join_within_budget(
+                            FileParser._iter_pdf_pages_parallel(file_path, page_count)
+                        )
+                    except BrokenProcessPool as pool_error:
+                        logger.warning(f"PDF process pool failed, extracting sequentially: {pool_error}")
+                        _reset_pdf_pool()
+
+                if text is None:
+                    text = FileParser._join_within_budget(
+                        FileParser._normalize_lines(page_text)
+                        for page_text in FileParser.iter_pdf_page_texts(pdf_reader)
+                    )
                 
                 if not text.strip():
                     return False, "", "No readable text found in PDF. The file might be image-based or corrupted."
@@ -56,10 +119,88 @@ class FileParser:
             logger.error(error_msg)
             return False, "", error_msg
     
+    @staticmethod
+    def iter_pdf_page_texts(pdf_reader):
+        """
+        Yield the raw text of each PDF page, one page at a time
+
+        Args:
+            pdf_reader (PyPDF2.PdfReader): Open reader
+
+        Yields:
+            str: Page text (pages without text are skipped)
+        """
+        for page in pdf_reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                yield page_text
+
+    @staticmethod
+    def _iter_pdf_pages_parallel(file_path, page_count):
+        """
+        Yield cleaned page lines in page order, extracting page ranges on the process pool
+
+        Only a window of ranges is in flight at a time, so a consumer that stops
+        early (length budget reached) does not pay for the rest of the document.
+        """
+        pool = _get_pdf_pool()
+        ranges = iter([
+            (start, min(start + PDF_PAGES_PER_TASK, page_count))
+            for start in range(0, page_count, PDF_PAGES_PER_TASK)
+        ])
+        window = deque()
+
+        def submit_next():
+            page_range = next(ranges, None)
+            if page_range is not None:
+                window.append(pool.submit(_extract_pdf_page_range, file_path, *page_range))
+
+        for _ in range(PDF_EXTRACTION_PROCESSES * 2):
+            submit_next()
+
+        try:
+            while window:
+                page_blocks = window.popleft().result()
+                submit_next()
+                for lines in page_blocks:
+                    yield lines
+        finally:
+            for future in window:
+                future.cancel()
+
+    @staticmethod
+    def _join_within_budget(line_blocks, max_length=MAX_TEXT_LENGTH):
+        """
+        Join blocks of cleaned lines, consuming no more blocks than the length budget needs
+
+        Produces exactly _clean_extracted_text() of the concatenated blocks.
+
+        Args:
+            line_blocks: Iterable of cleaned line lists (e.g. one per page)
+            max_length (int): Length after which the text is truncated
+
+        Returns:
+            str: Cleaned, possibly truncated text
+        """
+        lines = []
+        length = -1  # no separator before the first line
+        for block in line_blocks:
+            for line in block:
+                lines.append(line)
+                length += len(line) + 1
+            if length > max_length:
+                break
+
+        return FileParser._truncate_text('\n'.join(lines), max_length)
+
     @staticmethod
     def extract_text_from_docx(file_path_or_file):
         """
-        Extract text from DOCX file using python-docx
+        Extract text from DOCX file, streaming word/document.xml
+
+        Paragraphs and table rows are read in document order and parsing stops as
+        soon as the length budget is used up; images and other parts of the
+        package are never read.
 
         Args:
             file_path_or_file: Either a file path (str) or a file object
@@ -71,30 +212,15 @@ class FileParser:
             # Handle both file paths and file objects
             if hasattr(file_path_or_file, 'read'):
                 # It's a file object (from Flask request)
-                doc = Document(file_path_or_file)
                 source_info = "uploaded file"
             else:
                 # It's a file path
-                doc = Document(file_path_or_file)
                 source_info = file_path_or_file
 
-            text = ""
-            
-            # Extract text from paragraphs
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text += paragraph.text + "\n"
-            
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            text += cell.text + " "
-                    text += "\n"
-            
-            # Clean up the text
-            text = FileParser._clean_extracted_text(text)
+            with closing(FileParser.iter_docx_blocks(file_path_or_file)) as blocks:
+                text = FileParser._join_within_budget(
+                    FileParser._normalize_lines(block) for block in blocks
+                )
             
             if not text.strip():
                 return False, "", "No readable text found in DOCX file."
@@ -106,7 +232,81 @@ class FileParser:
             error_msg = f"Error parsing DOCX file: {str(e)}"
             logger.error(error_msg)
             return False, "", error_msg
-    
+
+    @staticmethod
+    def iter_docx_blocks(file_path_or_file):
+        """
+        Yield the raw text of each paragraph and table row of a DOCX, in document order
+
+        The main document part is parsed incrementally and every finished top-level
+        element is discarded, so memory stays flat however long the document is.
+        A table row is yielded as its non-empty cells, each followed by a space
+        (paragraphs of a cell, including nested tables, are joined with newlines).
+
+        Args:
+            file_path_or_file: File path or seekable file object of the DOCX package
+
+        Yields:
+            str: Paragraph or table row text
+        """
+        with zipfile.ZipFile(file_path_or_file) as package:
+            with package.open('word/document.xml') as part:
+                paragraphs = []  # text pieces of each open paragraph (text boxes nest them)
+                cells = []       # paragraph texts of each open table cell
+                rows = []        # cell texts of each open table row
+                run_depth = skip_depth = depth = 0
+                body = None
+
+                for event, element in ET.iterparse(part, events=('start', 'end')):
+                    tag = element.tag
+
+                    if event == 'start':
+                        depth += 1
+                        if skip_depth or tag == DOCX_FALLBACK:
+                            skip_depth += 1
+                        elif tag == DOCX_PARAGRAPH:
+                            paragraphs.append([])
+                        elif tag == DOCX_RUN:
+                            run_depth += 1
+                        elif tag == DOCX_TABLE_CELL:
+                            cells.append([])
+                        elif tag == DOCX_TABLE_ROW:
+                            rows.append([])
+                        elif tag == DOCX_BODY:
+                            body = element
+                        continue
+
+                    depth -= 1
+                    if skip_depth:
+                        skip_depth -= 1
+                        continue
+
+                    block = None
+                    if run_depth and paragraphs and tag == DOCX_TEXT:
+                        paragraphs[-1].append(element.text or '')
+                    elif run_depth and paragraphs and tag in DOCX_RUN_CHARACTERS:
+                        paragraphs[-1].append(DOCX_RUN_CHARACTERS[tag])
+                    elif tag == DOCX_RUN:
+                        run_depth -= 1
+                    elif tag == DOCX_PARAGRAPH:
+                        block = ''.join(paragraphs.pop())
+                    elif tag == DOCX_TABLE_CELL:
+                        cell_text = '\n'.join(cells.pop())
+                        if rows and cell_text.strip():
+                            rows[-1].append(cell_text)
+                    elif tag == DOCX_TABLE_ROW:
+                        block = ''.join(cell_text + ' ' for cell_text in rows.pop())
+
+                    if block is not None:
+                        if cells:
+                            cells[-1].append(block)
+                        elif block.strip():
+                            yield block
+
+                    # Drop finished top-level elements (document=1, body=2, children=3)
+                    if depth == 2 and body is not None:
+                        body.clear()
+
     @staticmethod
     def extract_text_from_doc(file_path):
         """
@@ -212,37 +412,29 @@ class FileParser:
         if not text:
             return ""
 
-        import re
+        return FileParser._truncate_text('\n'.join(FileParser._normalize_lines(text)))
 
-        # Step 1: Remove null bytes and other problematic characters
-        # Remove null bytes (0x00) that cause PostgreSQL errors
-        text = text.replace('\x00', '')
-
-        # Remove other control characters except newlines, tabs, and carriage returns
-        text = re.sub(r'[\x01-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
-
-        # Step 2: Normalize unicode characters
-        import unicodedata
-        text = unicodedata.normalize('NFKD', text)
+    @staticmethod
+    def _normalize_lines(text):
+        """
+        Clean extracted text line by line
 
-        # Step 3: Remove excessive whitespace
-        lines = text.split('\n')
-        cleaned_lines = []
+        Every step only looks within a line, so blocks of text (such as PDF pages)
+        can be cleaned independently and joined later.
 
-        for line in lines:
-            line = line.strip()
-            if line:  # Only keep non-empty lines
-                # Remove excessive spaces within the line
-                line = re.sub(r' +', ' ', line)
-                cleaned_lines.append(line)
+        Args:
+            text (str): Raw extracted text
 
-        # Join lines with single newlines
-        cleaned_text = '\n'.join(cleaned_lines)
+        Returns:
+            list: Non-empty cleaned lines
+        """
+        return clean_lines(text)
 
-        # Step 4: Ensure the text is not too long (database field limits)
-        max_length = 50000  # Reasonable limit for resume text
+    @staticmethod
+    def _truncate_text(cleaned_text, max_length=MAX_TEXT_LENGTH):
+        """Step 4: Ensure the text is not too long (database field limits)"""
         if len(cleaned_text) > max_length:
-            cleaned_text = cleaned_text[:max_length] + "... [truncated]"
+            cleaned_text = cleaned_text[:max_length] + TRUNCATION_MARKER
 
         return cleaned_text
     
@@ -0,0 +1,228 @@
+"""
+Inverted keyword index over job descriptions
+Maps normalized keywords to a user's job description ids for fast "best matching jobs" lookups
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+
+from backend.models import db, JobDescription
+
+logger = logging.getLogger(__name__)
+
+KEYWORD_CATEGORIES = ('technical_skills', 'soft_skills', 'other_keywords')
+
+# Users whose index is kept in memory at once (least recently used are dropped)
+DEFAULT_MAX_USERS = 1000
+
+
+class CorpusStatistics:
+    """
+    Keyword document frequencies over a user's job descriptions
+
+    Snapshot used by the IDF-weighted scoring algorithms; an empty corpus gives
+    every keyword the same weight.
+    """
+
+    def __init__(self, document_count: int = 0,
+                 document_frequencies: Optional[Dict[Tuple[str, str], int]] = None,
+                 average_lengths: Optional[Dict[str, float]] = None):
+        self.document_count = document_count
+        self.document_frequencies = document_frequencies or {}
+        self.average_lengths = average_lengths or {}
+
+    def document_frequency(self, category: str, keyword: str) -> int:
+        """Job descriptions containing a normalized keyword in a category"""
+        return self.document_frequencies.get((category, keyword), 0)
+
+
+class _UserIndex:
+    """Postings for one user: (category, keyword) -> JD ids, plus the reverse map for removals"""
+
+    def __init__(self):
+        self.postings: Dict[Tuple[str, str], Set[int]] = {}
+        self.documents: Dict[int, Set[Tuple[str, str]]] = {}
+        self.signature = None
+        self.statistics: Optional[CorpusStatistics] = None
+
+    def get_statistics(self) -> CorpusStatistics:
+        """Corpus statistics, recomputed after the postings change"""
+        if self.statistics is None:
+            lengths = {category: 0 for category in KEYWORD_CATEGORIES}
+            for terms in self.documents.values():
+                for category, _ in terms:
+                    lengths[category] += 1
+            count = len(self.documents)
+            self.statistics = CorpusStatistics(
+                document_count=count,
+                document_frequencies={term: len(ids) for term, ids in self.postings.items()},
+                average_lengths={category: total / count for category, total in lengths.items()} if count else {}
+            )
+        return self.statistics
+
+    def add(self, jd_id: int, keywords: Dict[str, List[str]]) -> None:
+        self.remove(jd_id)
+        self.statistics = None
+        terms = {
+            (category, keyword.lower().strip())
+            for category in KEYWORD_CATEGORIES
+            for keyword in keywords.get(category, [])
+        }
+        self.documents[jd_id] = terms
+        for term in terms:
+            self.postings.setdefault(term, set()).add(jd_id)
+
+    def remove(self, jd_id: int) -> None:
+        self.statistics = None
+        for term in self.documents.pop(jd_id, ()):
+            ids = self.postings.get(term)
+            if ids is not None:
+                ids.discard(jd_id)
+                if not ids:
+                    del self.postings[term]
+
+
+class KeywordIndex:
+    """
+    In-process inverted index from keyword to JobDescription ids, per user
+
+    A user's index is built lazily from the stored keyword columns and kept in
+    step by the JD routes. Each lookup also compares a cheap aggregate signature
+    (count, id sum, latest update) against the database, so changes made by
+    another worker trigger a rebuild instead of serving stale postings.
+    """
+
+    def __init__(self, max_users: Optional[int] = None):
+        if max_users is None:
+            max_users = int(os.getenv('KEYWORD_INDEX_MAX_USERS', DEFAULT_MAX_USERS))
+        self.max_users = max_users
+        self._users: 'OrderedDict[int, _UserIndex]' = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _active_job_descriptions(user_id: int):
+        return JobDescription.query.filter_by(user_id=user_id, is_active=True)
+
+    def _signature(self, user_id: int) -> Tuple:
+        """Aggregate fingerprint of a user's active job descriptions"""
+        row = db.session.query(
+            func.count(JobDescription.id),
+            func.sum(JobDescription.id),
+            func.max(JobDescription.updated_at)
+        ).filter(
+            JobDescription.user_id == user_id,
+            JobDescription.is_active == True
+        ).one()
+        return tuple(row)
+
+    def _build(self, user_id: int) -> _UserIndex:
+        index = _UserIndex()
+        job_descriptions = self._active_job_descriptions(user_id).filter(
+            JobDescription.keywords_extracted == True
+        ).all()
+        for job_description in job_descriptions:
+            index.add(job_description.id, job_description.get_keywords())
+        index.signature = self._signature(user_id)
+        logger.info(f"Keyword index built for user {user_id}: "
+                    f"{len(index.documents)} job descriptions, {len(index.postings)} keywords")
+        return index
+
+    def _get_user_index(self, user_id: int) -> _UserIndex:
+        """Fresh index for a user, rebuilding it if the database has moved on"""
+        signature = self._signature(user_id)
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is not None and index.signature == signature:
+                self._users.move_to_end(user_id)
+                return index
+
+        index = self._build(user_id)
+        with self._lock:
+            self._users[user_id] = index
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        return index
+
+    def update_job_description(self, job_description: JobDescription) -> None:
+        """Index a created, updated or duplicated job description (call after commit)"""
+        try:
+            user_id = int(job_description.user_id)
+            with self._lock:
+                index = self._users.get(user_id)
+                if index is None:
+                    return  # Built lazily on the next lookup
+
+                if job_description.is_active and job_description.keywords_extracted:
+                    index.add(job_description.id, job_description.get_keywords())
+                else:
+                    index.remove(job_description.id)
+                index.signature = self._signature(user_id)
+        except Exception as e:
+            logger.error(f"Keyword index update failed for job description {job_description.id}: {e}")
+            self.invalidate(job_description.user_id)
+
+    def remove_job_description(self, user_id: int, jd_id: int) -> None:
+        """Drop a deleted job description from the index (call after commit)"""
+        try:
+            user_id = int(user_id)
+            with self._lock:
+                index = self._users.get(user_id)
+                if index is None:
+                    return
+                index.remove(jd_id)
+                index.signature = self._signature(user_id)
+        except Exception as e:
+            logger.error(f"Keyword index removal failed for job description {jd_id}: {e}")
+            self.invalidate(user_id)
+
+    def invalidate(self, user_id: int) -> None:
+        """Forget a user's index so it is rebuilt on the next lookup"""
+        with self._lock:
+            self._users.pop(int(user_id), None)
+
+    def find_candidates(self, user_id: int, keywords: Dict[str, List[str]],
+                        limit: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Job descriptions sharing keywords with a document, by overlap count
+
+        Args:
+            user_id: Owner of the job descriptions
+            keywords: get_keywords() dict of the resume
+            limit: Maximum number of candidates (None = all)
+
+        Returns:
+            List of (jd_id, overlap_count), highest overlap first; JDs without
+            any shared keyword are not returned
+        """
+        index = self._get_user_index(int(user_id))
+
+        terms = {
+            (category, keyword.lower().strip())
+            for category in KEYWORD_CATEGORIES
+            for keyword in keywords.get(category, [])
+        }
+
+        overlap: Dict[int, int] = {}
+        with self._lock:
+            for term in terms:
+                for jd_id in index.postings.get(term, ()):
+                    overlap[jd_id] = overlap.get(jd_id, 0) + 1
+
+        ranked = sorted(overlap.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
+
+    def corpus_statistics(self, user_id: int) -> CorpusStatistics:
+        """Keyword document frequencies over a user's active job descriptions"""
+        index = self._get_user_index(int(user_id))
+        with self._lock:
+            return index.get_statistics()
+
+
+# Shared by the JD routes (incremental updates) and matching routes (lookups)
+job_keyword_index = KeywordIndex()
@@ -6,36 +6,16 @@ import string
 import logging
 from collections import Counter
 from typing import List, Dict, Tuple, Set
+from backend.services.skill_automaton import SkillAutomaton
+from backend.services.text_normalizer import keyword_text
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Try to import NLP libraries
-try:
-    import nltk
-    from nltk.corpus import stopwords
-    from nltk.tokenize import word_tokenize, sent_tokenize
-    from nltk.stem import WordNetLemmatizer
-    from nltk.tag import pos_tag
-    NLTK_AVAILABLE = True
-except ImportError:
-    NLTK_AVAILABLE = False
-    logger.warning("NLTK not available. Using basic keyword extraction.")
-
-try:
-    import spacy
-    SPACY_AVAILABLE = True
-except ImportError:
-    SPACY_AVAILABLE = False
-    logger.warning("SpaCy not available. Using basic keyword extraction.")
-
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
-    logger.warning("Scikit-learn not available. Using basic keyword extraction.")
+from backend.services.nlp_provider import nlp_provider
+from backend.services.nlp_resources import nltk_resources
+from backend.services.tfidf_model import corpus_tfidf_model, TFIDF_MODEL_AVAILABLE
 
 class KeywordParser:
     """Service for parsing and extracting keywords from resume and job description text"""
@@ -43,7 +23,6 @@ class KeywordParser:
     def __init__(self):
         self.stop_words = self._get_stop_words()
         self.lemmatizer = self._get_lemmatizer()
-        self.nlp = None  # Load spaCy model lazily
         
         # Comprehensive technical skills dictionary for ASP.NET + Angular Full Stack
         self.technical_skills = {
@@ -140,16 +119,16 @@ class KeywordParser:
             'degree', 'bachelor', 'master', 'phd', 'diploma', 'certificate', 'training',
             'course', 'bootcamp', 'workshop', 'seminar', 'conference', 'publication'
         ]
+
+        # Compile every technical skill and its variations into one matcher
+        self.skill_automaton = self._build_skill_automaton()
     
     def _get_stop_words(self) -> Set[str]:
         """Get stop words for filtering"""
-        if NLTK_AVAILABLE:
-            try:
-                nltk.download('stopwords', quiet=True)
-                return set(stopwords.words('english'))
-            except:
-                pass
-        
+        stop_words = nltk_resources.get_stop_words()
+        if stop_words is not None:
+            return stop_words
+
         # Fallback stop words
         return {
             'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your',
@@ -166,23 +145,7 @@ class KeywordParser:
     
     def _get_lemmatizer(self):
         """Get lemmatizer for word normalization"""
-        if NLTK_AVAILABLE:
-            try:
-                nltk.download('wordnet', quiet=True)
-                nltk.download('omw-1.4', quiet=True)
-                return WordNetLemmatizer()
-            except:
-                pass
-        return None
-    
-    def _get_spacy_model(self):
-        """Get SpaCy model for advanced NLP"""
-        if SPACY_AVAILABLE:
-            try:
-                return spacy.load('en_core_web_sm')
-            except OSError:
-                logger.warning("SpaCy model 'en_core_web_sm' not found. Install with: python -m spacy download en_core_web_sm")
-        return None
+        return nltk_resources.get_lemmatizer()
     
     def extract_keywords(self, text: str, max_keywords: int = 50) -> Dict[str, List[str]]:
         """
@@ -233,17 +196,8 @@ class KeywordParser:
             }
     
     def _clean_text(self, text: str) -> str:
-        """Clean and preprocess text"""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep important ones
-        text = re.sub(r'[^\w\s\-\.\+\#]', ' ', text)
-        
-        return text.strip()
+        """Clean and preprocess text (shared canonical form, cached per document)"""
+        return keyword_text(text)
     
     def _extract_technical_skills(self, text: str) -> List[str]:
         """Extract technical skills from text"""
@@ -286,27 +240,25 @@ class KeywordParser:
 
     def _extract_technical_skills_comprehensive(self, text: str) -> List[str]:
         """Extract technical skills using comprehensive categorized approach"""
-        found_skills = []
-        text_lower = text.lower()
+        # Single pass over the text - each hit maps back to its canonical skill
+        return list(self.skill_automaton.find_skills(text.lower()))
 
-        # Extract from all technical skill categories
+    def _build_skill_automaton(self) -> SkillAutomaton:
+        """Build the multi-pattern matcher for all technical skills and their variations"""
+        patterns = []
         for category, skills in self.technical_skills.items():
             for skill in skills:
                 skill_lower = skill.lower()
+                patterns.append((skill_lower, skill))
 
-                # Check for exact match
-                if skill_lower in text_lower:
-                    found_skills.append(skill)
-                    continue
-
-                # Check for variations and common alternatives
-                variations = self._get_skill_variations(skill_lower)
-                for variation in variations:
-                    if variation in text_lower and variation != skill_lower:
-                        found_skills.append(skill)
-                        break
+                # Variations identical to the skill itself are already covered
+                for variation in self._get_skill_variations(skill_lower):
+                    if variation != skill_lower:
+                        patterns.append((variation, skill))
 
-        return list(set(found_skills))  # Remove duplicates
+        automaton = SkillAutomaton(patterns)
+        logger.info(f"Built skill automaton with {len(patterns)} patterns ({automaton.pattern_states} states)")
+        return automaton
 
     def _get_skill_variations(self, skill: str) -> List[str]:
         """Get common variations of a technical skill"""
@@ -371,17 +323,17 @@ class KeywordParser:
         keywords = []
         
         # Method 1: Use TF-IDF if available
-        if SKLEARN_AVAILABLE:
+        if TFIDF_MODEL_AVAILABLE:
             tfidf_keywords = self._extract_tfidf_keywords(text, max_keywords)
             keywords.extend(tfidf_keywords)
         
         # Method 2: Use NLTK if available
-        if NLTK_AVAILABLE:
+        if nltk_resources.tagging_available:
             nltk_keywords = self._extract_nltk_keywords(text, max_keywords)
             keywords.extend(nltk_keywords)
         
         # Method 3: Use SpaCy if available
-        if self.nlp:
+        if nlp_provider.available:
             spacy_keywords = self._extract_spacy_keywords(text, max_keywords)
             keywords.extend(spacy_keywords)
         
@@ -396,26 +348,9 @@ class KeywordParser:
         return keywords[:max_keywords]
     
     def _extract_tfidf_keywords(self, text: str, max_keywords: int) -> List[str]:
-        """Extract keywords using TF-IDF"""
+        """Extract keywords using TF-IDF (IDF fitted over all stored resumes and JDs)"""
         try:
-            # For single documents, don't use max_df to avoid the error
-            vectorizer = TfidfVectorizer(
-                max_features=max_keywords,
-                stop_words='english',
-                ngram_range=(1, 2),
-                min_df=1
-                # Removed max_df to avoid "max_df corresponds to < documents than min_df" error
-            )
-            
-            tfidf_matrix = vectorizer.fit_transform([text])
-            feature_names = vectorizer.get_feature_names_out()
-            scores = tfidf_matrix.toarray()[0]
-            
-            # Get top keywords
-            keyword_scores = list(zip(feature_names, scores))
-            keyword_scores.sort(key=lambda x: x[1], reverse=True)
-            
-            return [kw for kw, score in keyword_scores[:max_keywords] if score > 0]
+            return corpus_tfidf_model.top_keywords(text, max_keywords)
             
         except Exception as e:
             logger.error(f"Error in TF-IDF extraction: {e}")
@@ -424,14 +359,11 @@ class KeywordParser:
     def _extract_nltk_keywords(self, text: str, max_keywords: int) -> List[str]:
         """Extract keywords using NLTK"""
         try:
-            nltk.download('punkt', quiet=True)
-            nltk.download('averaged_perceptron_tagger', quiet=True)
-            
             # Tokenize
-            tokens = word_tokenize(text)
+            tokens = nltk_resources.tokenize(text)
             
             # POS tagging
-            pos_tags = pos_tag(tokens)
+            pos_tags = nltk_resources.pos_tag(tokens)
             
             # Extract nouns and adjectives
             keywords = []
@@ -453,14 +385,10 @@ class KeywordParser:
     def _extract_spacy_keywords(self, text: str, max_keywords: int) -> List[str]:
         """Extract keywords using SpaCy"""
         try:
-            # Load spaCy model lazily
-            if self.nlp is None:
-                self.nlp = self._get_spacy_model()
-
-            if self.nlp is None:
+            # Shared model; the dependency parser is not needed here
+            doc = nlp_provider(text, needs=('lemma', 'ents'))
+            if doc is None:
                 return []  # spaCy not available
-
-            doc = self.nlp(text)
             
             keywords = []
             for token in doc:
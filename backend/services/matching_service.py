@@ -4,8 +4,11 @@ Implements keyword matching algorithms to compare resumes with job descriptions
 """
 
 import logging
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Optional
+from sqlalchemy import and_
 from backend.models import db, Resume, JobDescription, MatchScore
+from backend.services.keyword_index import job_keyword_index
+from backend.services.scoring_engine import ScoringAlgorithm, get_scoring_algorithm
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,12 +18,16 @@ logger = logging.getLogger(__name__)
 class MatchingService:
     """
     Service for calculating matching scores between resumes and job descriptions
+
+    Scores are computed by a pluggable algorithm (see scoring_engine) chosen per
+    call; each algorithm's scores are stored in their own MatchScore rows.
     """
-    
+
     def __init__(self):
         self.logger = logger
     
-    def calculate_match_score(self, resume_id: int, job_description_id: int, user_id: int) -> Dict:
+    def calculate_match_score(self, resume_id: int, job_description_id: int, user_id: int,
+                              algorithm: Optional[str] = None) -> Dict:
         """
         Calculate comprehensive matching score between resume and job description
         
@@ -28,11 +35,14 @@ class MatchingService:
             resume_id: ID of the resume
             job_description_id: ID of the job description
             user_id: ID of the user (for security)
+            algorithm: Scoring algorithm name (None = default)
             
         Returns:
             Dict containing matching results and score details
         """
         try:
+            scorer = get_scoring_algorithm(algorithm)
+
             # Get resume and job description
             resume = Resume.query.filter_by(
                 id=resume_id,
@@ -61,75 +71,25 @@ class MatchingService:
             # Get keywords
             resume_keywords = resume.get_keywords()
             jd_keywords = job_description.get_keywords()
-            
-            # Calculate individual category scores
-            technical_score = self._calculate_jaccard_similarity(
-                resume_keywords['technical_skills'],
-                jd_keywords['technical_skills']
-            )
-            
-            soft_skills_score = self._calculate_jaccard_similarity(
-                resume_keywords['soft_skills'],
-                jd_keywords['soft_skills']
-            )
-            
-            other_keywords_score = self._calculate_jaccard_similarity(
-                resume_keywords['other_keywords'],
-                jd_keywords['other_keywords']
-            )
-            
-            # Calculate overall score (weighted average)
-            overall_score = self._calculate_weighted_score(
-                technical_score, soft_skills_score, other_keywords_score
-            )
-            
-            # Count total keywords and matches
-            total_resume_keywords = (
-                len(resume_keywords['technical_skills']) +
-                len(resume_keywords['soft_skills']) +
-                len(resume_keywords['other_keywords'])
-            )
-            
-            total_jd_keywords = (
-                len(jd_keywords['technical_skills']) +
-                len(jd_keywords['soft_skills']) +
-                len(jd_keywords['other_keywords'])
-            )
-            
-            # Count total matched keywords
-            matched_keywords = self._count_total_matches(resume_keywords, jd_keywords)
-            
+
+            scores = scorer.score(resume_keywords, jd_keywords, self._corpus_for(scorer, user_id))
+
             # Save or update match score in database
             match_score = self._save_match_score(
                 user_id=user_id,
                 resume_id=resume_id,
                 job_description_id=job_description_id,
-                overall_score=overall_score,
-                technical_score=technical_score,
-                soft_skills_score=soft_skills_score,
-                other_keywords_score=other_keywords_score,
-                total_resume_keywords=total_resume_keywords,
-                total_jd_keywords=total_jd_keywords,
-                matched_keywords=matched_keywords
+                algorithm_used=scorer.name,
+                **scores
             )
-            
-            self.logger.info(f"Match score calculated: {overall_score:.2f}% for resume {resume_id} vs JD {job_description_id}")
+
+            self.logger.info(f"Match score calculated ({scorer.name}): {scores['overall_score']:.2f}% for resume {resume_id} vs JD {job_description_id}")
             
             return {
                 'success': True,
+                'algorithm': scorer.name,
                 'match_score': match_score.to_dict(include_details=True),
-                'detailed_scores': {
-                    'technical_score': technical_score,
-                    'soft_skills_score': soft_skills_score,
-                    'other_keywords_score': other_keywords_score,
-                    'overall_score': overall_score
-                },
-                'keyword_analysis': {
-                    'total_resume_keywords': total_resume_keywords,
-                    'total_jd_keywords': total_jd_keywords,
-                    'matched_keywords': matched_keywords,
-                    'match_percentage': (matched_keywords / max(total_jd_keywords, 1)) * 100
-                }
+                **self._format_score_details(scores)
             }
             
         except Exception as e:
@@ -138,62 +98,275 @@ class MatchingService:
                 'success': False,
                 'error': str(e)
             }
-    
-    def _calculate_jaccard_similarity(self, set1: List[str], set2: List[str]) -> float:
+
+    def calculate_batch_match_scores(self, resume_id: int, user_id: int,
+                                     job_description_ids: Optional[List[int]] = None,
+                                     algorithm: Optional[str] = None) -> Dict:
         """
-        Calculate Jaccard similarity between two keyword sets
-        
-        Jaccard similarity = |A ∩ B| / |A ∪ B|
-        
+        Score one resume against many job descriptions in a single pass
+
+        All job descriptions and their existing match scores are loaded with one
+        query, scored in memory, and every MatchScore row is upserted in one
+        transaction.
+
         Args:
-            set1: First set of keywords
-            set2: Second set of keywords
-            
+            resume_id: ID of the resume
+            user_id: ID of the user (for security)
+            job_description_ids: JDs to score against (None = all active JDs of the user)
+            algorithm: Scoring algorithm name (None = default)
+
         Returns:
-            Similarity score as percentage (0-100)
+            Dict with per-JD results sorted by overall score, plus skipped JD ids
         """
-        if not set1 and not set2:
-            return 100.0  # Both empty = perfect match
-        
-        if not set1 or not set2:
-            return 0.0  # One empty = no match
-        
-        # Convert to sets for intersection and union operations
-        s1 = set(keyword.lower().strip() for keyword in set1)
-        s2 = set(keyword.lower().strip() for keyword in set2)
-        
-        # Calculate Jaccard similarity
-        intersection = len(s1.intersection(s2))
-        union = len(s1.union(s2))
-        
-        if union == 0:
-            return 0.0
-        
-        similarity = (intersection / union) * 100
-        return round(similarity, 2)
-    
-    def _calculate_weighted_score(self, technical: float, soft_skills: float, other: float) -> float:
+        try:
+            scorer = get_scoring_algorithm(algorithm)
+
+            resume = Resume.query.filter_by(
+                id=resume_id,
+                user_id=user_id,
+                is_active=True
+            ).first()
+
+            if not resume:
+                raise ValueError(f"Resume {resume_id} not found")
+
+            if not resume.keywords_extracted:
+                raise ValueError(f"Resume {resume_id} keywords not extracted yet")
+
+            # One query for the JDs together with any existing score for this resume
+            query = db.session.query(JobDescription, MatchScore).outerjoin(
+                MatchScore,
+                and_(
+                    MatchScore.job_description_id == JobDescription.id,
+                    MatchScore.resume_id == resume_id,
+                    MatchScore.user_id == user_id,
+                    MatchScore.algorithm_used == scorer.name,
+                    MatchScore.is_active == True
+                )
+            ).filter(
+                JobDescription.user_id == user_id,
+                JobDescription.is_active == True
+            )
+            if job_description_ids is not None:
+                query = query.filter(JobDescription.id.in_(job_description_ids))
+
+            job_descriptions = {}
+            existing_scores = {}
+            for job_description, match_score in query.all():
+                job_descriptions[job_description.id] = job_description
+                if match_score is not None and job_description.id not in existing_scores:
+                    existing_scores[job_description.id] = match_score
+
+            scorable = []
+            skipped = []
+            for jd_id, job_description in job_descriptions.items():
+                if job_description.keywords_extracted:
+                    scorable.append(job_description)
+                else:
+                    skipped.append({'job_description_id': jd_id, 'reason': 'keywords not extracted yet'})
+
+            all_scores = self.score_many(
+                resume.get_keywords(),
+                [job_description.get_keywords() for job_description in scorable],
+                scorer=scorer,
+                user_id=user_id
+            )
+
+            results = []
+            for job_description, scores in zip(scorable, all_scores):
+                match_score = self._upsert_match_score(
+                    existing_scores.get(job_description.id),
+                    user_id=user_id,
+                    resume_id=resume_id,
+                    job_description_id=job_description.id,
+                    algorithm_used=scorer.name,
+                    **scores
+                )
+                results.append((job_description, match_score, scores))
+
+            if job_description_ids is not None:
+                for jd_id in job_description_ids:
+                    if jd_id not in job_descriptions:
+                        skipped.append({'job_description_id': jd_id, 'reason': 'not found'})
+
+            # Serialize between flush (assigns ids) and commit: commit expires every
+            # loaded row, and reading them afterwards would reload each one separately
+            db.session.flush()
+            results.sort(key=lambda item: item[2]['overall_score'], reverse=True)
+            response = {
+                'success': True,
+                'resume_id': resume_id,
+                'algorithm': scorer.name,
+                'results': [
+                    {
+                        'job_description': {
+                            'id': job_description.id,
+                            'title': job_description.title,
+                            'company_name': job_description.company_name
+                        },
+                        'match_score': match_score.to_dict(include_details=True),
+                        **self._format_score_details(scores)
+                    }
+                    for job_description, match_score, scores in results
+                ],
+                'skipped': skipped
+            }
+            db.session.commit()
+
+            self.logger.info(f"Batch match ({scorer.name}) scored resume {resume_id} against {len(results)} job descriptions")
+            return response
+
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Error calculating batch match scores: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def find_best_matching_jobs(self, resume_id: int, user_id: int, limit: int = 5,
+                                candidate_pool: Optional[int] = None, algorithm: Optional[str] = None) -> Dict:
         """
-        Calculate weighted overall score
-        
-        Weights:
-        - Technical skills: 50%
-        - Soft skills: 20%
-        - Other keywords: 30%
+        Top-k job descriptions for a resume without scoring every pair
+
+        The inverted keyword index narrows the user's JDs down to the ones
+        sharing the most keywords with the resume; only those candidates are
+        fully scored. Nothing is written to MatchScore.
+
+        Args:
+            resume_id: ID of the resume
+            user_id: ID of the user (for security)
+            limit: Number of job descriptions to return
+            candidate_pool: Candidates to fully score (default: 4 x limit, at least 20)
+            algorithm: Scoring algorithm name (None = default)
+
+        Returns:
+            Dict with ranked results (scores plus keyword overlap) and candidate counts
         """
-        weighted_score = (technical * 0.5) + (soft_skills * 0.2) + (other * 0.3)
-        return round(weighted_score, 2)
-    
-    def _count_total_matches(self, resume_keywords: Dict, jd_keywords: Dict) -> int:
-        """Count total number of matched keywords across all categories"""
-        total_matches = 0
-        
-        for category in ['technical_skills', 'soft_skills', 'other_keywords']:
-            resume_set = set(keyword.lower().strip() for keyword in resume_keywords[category])
-            jd_set = set(keyword.lower().strip() for keyword in jd_keywords[category])
-            total_matches += len(resume_set.intersection(jd_set))
-        
-        return total_matches
+        try:
+            scorer = get_scoring_algorithm(algorithm)
+
+            resume = Resume.query.filter_by(
+                id=resume_id,
+                user_id=user_id,
+                is_active=True
+            ).first()
+
+            if not resume:
+                raise ValueError(f"Resume {resume_id} not found")
+
+            if not resume.keywords_extracted:
+                raise ValueError(f"Resume {resume_id} keywords not extracted yet")
+
+            resume_keywords = resume.get_keywords()
+            candidate_pool = candidate_pool or max(limit * 4, 20)
+            candidates = job_keyword_index.find_candidates(user_id, resume_keywords, limit=candidate_pool)
+            overlap = dict(candidates)
+
+            job_descriptions = JobDescription.query.filter(
+                JobDescription.id.in_(list(overlap)),
+                JobDescription.user_id == user_id,
+                JobDescription.is_active == True
+            ).all() if overlap else []
+
+            all_scores = self.score_many(
+                resume_keywords,
+                [job_description.get_keywords() for job_description in job_descriptions],
+                scorer=scorer,
+                user_id=user_id
+            )
+
+            ranked = sorted(
+                zip(job_descriptions, all_scores),
+                key=lambda item: (item[1]['overall_score'], overlap[item[0].id]),
+                reverse=True
+            )[:limit]
+
+            return {
+                'success': True,
+                'resume_id': resume_id,
+                'algorithm': scorer.name,
+                'results': [
+                    {
+                        'job_description': {
+                            'id': job_description.id,
+                            'title': job_description.title,
+                            'company_name': job_description.company_name
+                        },
+                        'keyword_overlap': overlap[job_description.id],
+                        **self._format_score_details(scores)
+                    }
+                    for job_description, scores in ranked
+                ],
+                'candidates_considered': len(job_descriptions)
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error finding best matching jobs: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def score_many(self, resume_keywords: Dict, jd_keywords_list: List[Dict],
+                   scorer: Optional[ScoringAlgorithm] = None, user_id: Optional[int] = None) -> List[Dict]:
+        """
+        Score one resume's keywords against many job descriptions
+
+        Args:
+            resume_keywords: get_keywords() dict of the resume
+            jd_keywords_list: get_keywords() dicts of the job descriptions
+            scorer: Scoring algorithm (None = default)
+            user_id: Owner of the job descriptions, whose corpus weights IDF algorithms
+
+        Returns:
+            List of MatchScore column dicts in the order of jd_keywords_list
+        """
+        scorer = scorer or get_scoring_algorithm()
+        return scorer.score_many(resume_keywords, jd_keywords_list, self._corpus_for(scorer, user_id))
+
+    @staticmethod
+    def _corpus_for(scorer: ScoringAlgorithm, user_id: Optional[int]):
+        """Keyword statistics of the user's job descriptions, when the algorithm uses them"""
+        if not scorer.uses_corpus or user_id is None:
+            return None
+        return job_keyword_index.corpus_statistics(user_id)
+
+    def score_keyword_matrix(self, resume_keywords_list: List[Dict], jd_keywords_list: List[Dict],
+                             algorithm: Optional[str] = None, user_id: Optional[int] = None) -> Dict:
+        """
+        Score every resume against every job description (bulk re-scoring)
+
+        Args:
+            resume_keywords_list: get_keywords() dicts of m resumes
+            jd_keywords_list: get_keywords() dicts of n job descriptions
+            algorithm: Scoring algorithm name (None = default)
+            user_id: Owner of the job descriptions, whose corpus weights IDF algorithms
+
+        Returns:
+            Dict of m x n numpy arrays, see ScoringAlgorithm.score_matrix
+            (Jaccard adds overlap_score)
+        """
+        scorer = get_scoring_algorithm(algorithm)
+        return scorer.score_matrix(resume_keywords_list, jd_keywords_list, self._corpus_for(scorer, user_id))
+
+    @staticmethod
+    def _format_score_details(scores: Dict) -> Dict:
+        """Response sections shared by single and batch match endpoints"""
+        return {
+            'detailed_scores': {
+                'technical_score': scores['technical_score'],
+                'soft_skills_score': scores['soft_skills_score'],
+                'other_keywords_score': scores['other_keywords_score'],
+                'overall_score': scores['overall_score']
+            },
+            'keyword_analysis': {
+                'total_resume_keywords': scores['total_resume_keywords'],
+                'total_jd_keywords': scores['total_jd_keywords'],
+                'matched_keywords': scores['matched_keywords'],
+                'match_percentage': (scores['matched_keywords'] / max(scores['total_jd_keywords'], 1)) * 100
+            }
+        }
     
     def _save_match_score(self, **kwargs) -> MatchScore:
         """Save or update match score in database"""
@@ -202,25 +375,26 @@ class MatchingService:
             user_id=kwargs['user_id'],
             resume_id=kwargs['resume_id'],
             job_description_id=kwargs['job_description_id'],
+            algorithm_used=kwargs['algorithm_used'],
             is_active=True
         ).first()
         
+        match_score = self._upsert_match_score(existing_score, **kwargs)
+        db.session.commit()
+        return match_score
+
+    def _upsert_match_score(self, existing_score: Optional[MatchScore], **kwargs) -> MatchScore:
+        """Update an existing match score or add a new one to the session (no commit)"""
         if existing_score:
             # Update existing score
             for key, value in kwargs.items():
                 if hasattr(existing_score, key):
                     setattr(existing_score, key, value)
-            existing_score.algorithm_used = 'jaccard'
-            match_score = existing_score
-        else:
-            # Create new score
-            match_score = MatchScore(
-                algorithm_used='jaccard',
-                **kwargs
-            )
-            db.session.add(match_score)
-        
-        db.session.commit()
+            return existing_score
+
+        # Create new score
+        match_score = MatchScore(**kwargs)
+        db.session.add(match_score)
         return match_score
     
     def get_match_history(self, user_id: int, limit: int = 10) -> List[Dict]:
@@ -0,0 +1,126 @@
+"""
+Shared spaCy pipeline
+The model is loaded once per process, ideally in create_app() before gunicorn forks
+(gunicorn --preload) so every worker shares it copy-on-write. Callers state which
+annotations they need and only the components producing them run on their texts.
+"""
+
+import logging
+import os
+import threading
+from typing import Iterable, Iterator, Optional, Sequence
+
+try:
+    import spacy
+    SPACY_AVAILABLE = True
+except ImportError:
+    SPACY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Components each annotation depends on (en_core_web_* pipelines)
+ANNOTATION_COMPONENTS = {
+    'pos': ('tok2vec', 'tagger', 'attribute_ruler'),
+    'lemma': ('tok2vec', 'tagger', 'attribute_ruler', 'lemmatizer'),
+    'ents': ('ner',),
+    # Noun chunks are read from the dependency parse
+    'noun_chunks': ('tok2vec', 'tagger', 'attribute_ruler', 'parser'),
+}
+
+# Components no caller needs; excluded when the model is loaded
+UNUSED_COMPONENTS = ('senter',)
+
+# Texts per nlp.pipe() batch
+DEFAULT_BATCH_SIZE = 32
+
+
+class NLPProvider:
+    """Process-wide spaCy model with per-call component pruning"""
+
+    def __init__(self, model_name: Optional[str] = None):
+        """
+        Args:
+            model_name: spaCy package to load (env SPACY_MODEL, default en_core_web_sm)
+        """
+        self.model_name = model_name or os.getenv('SPACY_MODEL', 'en_core_web_sm')
+        self._nlp = None
+        self._load_attempted = False
+        self._lock = threading.Lock()
+        self._disabled = {}
+
+    @property
+    def available(self) -> bool:
+        """Whether the model is installed (loads it on first use)"""
+        return self.get() is not None
+
+    def get(self):
+        """The loaded Language object, or None when spaCy or the model is missing"""
+        if not self._load_attempted:
+            with self._lock:
+                if not self._load_attempted:
+                    self._nlp = self._load()
+                    self._load_attempted = True
+        return self._nlp
+
+    def _load(self):
+        if not SPACY_AVAILABLE:
+            logger.warning("SpaCy not available. Using basic keyword extraction.")
+            return None
+        try:
+            nlp = spacy.load(self.model_name, exclude=list(UNUSED_COMPONENTS))
+        except OSError:
+            logger.warning(f"SpaCy model '{self.model_name}' not found. "
+                           f"Install with: python -m spacy download {self.model_name}")
+            return None
+        logger.info(f"SpaCy model '{self.model_name}' loaded: {', '.join(nlp.pipe_names)}")
+        return nlp
+
+    def preload(self) -> bool:
+        """Load the model now instead of on the first request"""
+        return self.available
+
+    def _disabled_for(self, needs: Sequence[str]) -> list:
+        """Components whose output none of the requested annotations use"""
+        key = frozenset(needs)
+        if key not in self._disabled:
+            required = {component for annotation in key for component in ANNOTATION_COMPONENTS[annotation]}
+            self._disabled[key] = [name for name in self._nlp.pipe_names if name not in required]
+        return self._disabled[key]
+
+    def __call__(self, text: str, needs: Sequence[str]):
+        """
+        Annotate one text
+
+        Args:
+            text: Text to process
+            needs: Annotations used by the caller (keys of ANNOTATION_COMPONENTS)
+
+        Returns:
+            spaCy Doc, or None when the model is not available
+        """
+        nlp = self.get()
+        if nlp is None:
+            return None
+        return nlp(text, disable=self._disabled_for(needs))
+
+    def pipe(self, texts: Iterable[str], needs: Sequence[str],
+             batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator:
+        """
+        Annotate many texts in batches
+
+        Args:
+            texts: Texts to process
+            needs: Annotations used by the caller (keys of ANNOTATION_COMPONENTS)
+            batch_size: Texts per batch
+
+        Returns:
+            Iterator of spaCy Docs in input order (empty when the model is not available)
+        """
+        nlp = self.get()
+        if nlp is None:
+            return iter(())
+        return nlp.pipe(texts, disable=self._disabled_for(needs), batch_size=batch_size)
+
+
+# Shared by every service; preloaded by create_app()
+nlp_provider = NLPProvider()
@@ -0,0 +1,175 @@
+"""
+NLTK resource bootstrap
+The local NLTK data is validated once per process (create_app() calls bootstrap()) and
+the stop word set, tokenizers, POS tagger and lemmatizer are loaded at that point.
+Keyword extraction only uses these cached objects, so serving a request never reaches
+nltk.download() or reloads a pickle from disk.
+"""
+
+import logging
+import os
+import threading
+from typing import List, Optional, Set, Tuple
+
+try:
+    import nltk
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    from nltk.tag.perceptron import PerceptronTagger
+    from nltk.tokenize.destructive import NLTKWordTokenizer
+    NLTK_AVAILABLE = True
+except ImportError:
+    NLTK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# NLTK packages used by keyword extraction, with the data path each one provides
+REQUIRED_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'punkt': 'tokenizers/punkt',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'wordnet': 'corpora/wordnet',
+}
+PUNKT_MODEL = 'tokenizers/punkt/english.pickle'
+
+
+class NLTKResources:
+    """NLTK data loaded once per process; whatever is missing is reported at startup"""
+
+    def __init__(self):
+        self.missing: List[str] = []
+        self.stop_words: Optional[Set[str]] = None
+        self.lemmatizer = None
+        self._sentence_tokenizer = None
+        self._word_tokenizer = None
+        self._tagger = None
+        self._bootstrapped = False
+        self._lock = threading.Lock()
+
+    def bootstrap(self, strict: Optional[bool] = None, download: Optional[bool] = None) -> List[str]:
+        """
+        Validate the local NLTK data and load it (only the first call does any work)
+
+        Args:
+            strict: Raise when data is missing (env NLTK_STRICT, default false)
+            download: Fetch missing packages with nltk.download() first
+                      (env NLTK_AUTO_DOWNLOAD, default false; never use it where pods have no network)
+
+        Returns:
+            Names of the missing NLTK packages
+
+        Raises:
+            RuntimeError: In strict mode, when NLTK or any of its packages is missing
+        """
+        if strict is None:
+            strict = os.getenv('NLTK_STRICT', 'false').lower() == 'true'
+        if download is None:
+            download = os.getenv('NLTK_AUTO_DOWNLOAD', 'false').lower() == 'true'
+
+        with self._lock:
+            if not self._bootstrapped:
+                self._load(download)
+                self._bootstrapped = True
+
+        if strict and self.missing:
+            raise RuntimeError(self.describe_missing())
+        return self.missing
+
+    def _ensure(self) -> None:
+        if not self._bootstrapped:
+            self.bootstrap(strict=False)
+
+    def _load(self, download: bool) -> None:
+        if not NLTK_AVAILABLE:
+            logger.warning("NLTK not available. Using basic keyword extraction.")
+            self.missing = list(REQUIRED_RESOURCES)
+            return
+
+        missing = []
+        for package, path in REQUIRED_RESOURCES.items():
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                if not (download and nltk.download(package, quiet=True)):
+                    missing.append(package)
+
+        loaders = {
+            'stopwords': self._load_stop_words,
+            'punkt': self._load_tokenizers,
+            'averaged_perceptron_tagger': self._load_tagger,
+            'wordnet': self._load_lemmatizer,
+        }
+        for package, loader in loaders.items():
+            if package in missing:
+                continue
+            try:
+                loader()
+            except Exception as e:
+                logger.error(f"Could not load NLTK package '{package}': {e}")
+                missing.append(package)
+
+        self.missing = missing
+        if missing:
+            logger.error(self.describe_missing())
+        else:
+            logger.info("NLTK resources loaded")
+
+    def _load_stop_words(self):
+        self.stop_words = set(stopwords.words('english'))
+
+    def _load_tokenizers(self):
+        # The two stages of nltk.word_tokenize, with the Punkt model kept in memory
+        self._sentence_tokenizer = nltk.data.load(PUNKT_MODEL)
+        self._word_tokenizer = NLTKWordTokenizer()
+
+    def _load_tagger(self):
+        # nltk.pos_tag would unpickle the model again on every call
+        self._tagger = PerceptronTagger()
+
+    def _load_lemmatizer(self):
+        lemmatizer = WordNetLemmatizer()
+        lemmatizer.lemmatize('resources')  # reads WordNet now instead of on the first request
+        self.lemmatizer = lemmatizer
+
+    def describe_missing(self) -> str:
+        """Error message naming the missing data and how to install it"""
+        if not NLTK_AVAILABLE:
+            return "NLTK is not installed (pip install nltk)"
+        packages = ' '.join(self.missing)
+        return (f"NLTK data missing: {', '.join(self.missing)}; keyword extraction runs without it. "
+                f"Install with: python -m nltk.downloader {packages} "
+                f"(or point NLTK_DATA at a directory that has them)")
+
+    @property
+    def tagging_available(self) -> bool:
+        """Whether tokenize() and pos_tag() can be used"""
+        self._ensure()
+        return self._tagger is not None and self._sentence_tokenizer is not None
+
+    def tokenize(self, text: str) -> List[str]:
+        """Same tokens as nltk.word_tokenize(text)"""
+        self._ensure()
+        return [
+            token
+            for sentence in self._sentence_tokenizer.tokenize(text)
+            for token in self._word_tokenizer.tokenize(sentence)
+        ]
+
+    def pos_tag(self, tokens: List[str]) -> List[Tuple[str, str]]:
+        """Same tags as nltk.pos_tag(tokens)"""
+        self._ensure()
+        return self._tagger.tag(tokens)
+
+    def get_stop_words(self) -> Optional[Set[str]]:
+        """English stop words, or None when the corpus is missing"""
+        self._ensure()
+        return self.stop_words
+
+    def get_lemmatizer(self):
+        """WordNet lemmatizer, or None when WordNet is missing"""
+        self._ensure()
+        return self.lemmatizer
+
+
+# Bootstrapped by create_app(); the first use bootstraps it otherwise
+nltk_resources = NLTKResources()
@@ -0,0 +1,176 @@
+"""
+Keyset (cursor) pagination for list endpoints
+Pages continue from the (sort value, id) of the last row returned, so deep pages cost
+the same as the first one, and total counts are cached per user instead of recounted
+"""
+
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COUNT_TTL = 30  # seconds a cached total may lag writes made by other processes
+DEFAULT_COUNT_MAX_ENTRIES = 10000  # cached totals per process; least recently used are evicted
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor is malformed or was issued for a different ordering"""
+
+
+def encode_cursor(sort_key: str, descending: bool, value, row_id: int) -> str:
+    """
+    Opaque cursor pointing just past a row
+
+    Args:
+        sort_key: Name of the sort the cursor belongs to
+        descending: Sort direction
+        value: Sort column value of the last row
+        row_id: Primary key of the last row
+
+    Returns:
+        URL-safe string
+    """
+    if isinstance(value, datetime):
+        value = {'dt': value.isoformat()}
+    payload = json.dumps({'s': sort_key, 'd': descending, 'v': value, 'id': row_id},
+                         separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, sort_key: str, descending: bool) -> Tuple[object, int]:
+    """
+    (sort value, id) stored in a cursor
+
+    Raises:
+        InvalidCursor: If the cursor cannot be read or belongs to another ordering
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        value, row_id = payload['v'], int(payload['id'])
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value['dt'])
+    except (ValueError, TypeError, KeyError, UnicodeError) as e:
+        raise InvalidCursor(f'Malformed cursor: {e}')
+
+    if payload.get('s') != sort_key or payload.get('d') != descending:
+        raise InvalidCursor('Cursor was issued for a different sort order')
+    return value, row_id
+
+
+def keyset_page(query, sort_column, id_column, sort_key: str, descending: bool,
+                limit: int, cursor: Optional[str] = None,
+                row_of: Callable = lambda item: item) -> Tuple[List, Optional[str]]:
+    """
+    One page of a query ordered by (sort_column, id_column)
+
+    The sort column must be NOT NULL (or always populated) for rows to be reachable.
+
+    Args:
+        query: Filtered query, not yet ordered or limited
+        sort_column: Column to order by
+        id_column: Primary key column, breaks ties between equal sort values
+        sort_key: Name of the sort, embedded in the cursor
+        descending: Sort direction
+        limit: Page size
+        cursor: Cursor returned with the previous page, or None for the first page
+        row_of: Maps a result item to its mapped object (for queries selecting extra columns)
+
+    Returns:
+        Tuple of (items, next cursor or None on the last page)
+
+    Raises:
+        InvalidCursor: If the cursor cannot be used with this ordering
+    """
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort_key, descending)
+        # Row-value comparison, so the composite index can seek straight to the position
+        position = tuple_(sort_column, id_column)
+        query = query.filter(position < (value, row_id) if descending else position > (value, row_id))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    items = query.limit(limit + 1).all()
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = row_of(items[-1])
+    return items, encode_cursor(sort_key, descending, getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+class CountCache:
+    """
+    Per-user cache of list totals
+
+    Entries expire after a TTL and are dropped explicitly when this process writes
+    to the user's lists, so a total only lags writes made by other workers. Filter
+    and search keys are unbounded, so expired entries are dropped when read and the
+    least recently used ones are evicted beyond max_entries.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Args:
+            ttl: Seconds an entry stays valid (env LIST_COUNT_CACHE_TTL, 0 disables caching)
+            max_entries: Entries kept (env LIST_COUNT_CACHE_MAX_ENTRIES)
+        """
+        if ttl is None:
+            ttl = float(os.getenv('LIST_COUNT_CACHE_TTL', DEFAULT_COUNT_TTL))
+        if max_entries is None:
+            max_entries = int(os.getenv('LIST_COUNT_CACHE_MAX_ENTRIES', DEFAULT_COUNT_MAX_ENTRIES))
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple, Tuple[int, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_count(self, user_id, scope: str, key: Tuple, count: Callable[[], int]) -> int:
+        """
+        Cached total for a list, computed with count() on a miss
+
+        Args:
+            user_id: Owner of the list
+            scope: List name ('history', 'resumes', ...)
+            key: Anything else the total depends on (filters)
+            count: Computes the total
+        """
+        cache_key = (int(user_id), scope, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(cache_key)
+                    return entry[0]
+                del self._entries[cache_key]
+
+        total = count()
+        if self.ttl > 0:
+            with self._lock:
+                self._entries[cache_key] = (total, now + self.ttl)
+                self._entries.move_to_end(cache_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return total
+
+    def invalidate(self, user_id, *scopes: str) -> None:
+        """Drop the cached totals of a user (all lists when no scope is given)"""
+        user_id = int(user_id)
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == user_id and (not scopes or k[1] in scopes)]:
+                del self._entries[cache_key]
+
+
+list_count_cache = CountCache()
@@ -0,0 +1,301 @@
+"""
+Background processing of uploaded resumes
+Parsing, keyword extraction and analysis run on a local worker pool; the processing_jobs
+table is the durable queue, so jobs survive restarts and are visible to every worker
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm.exc import StaleDataError
+
+from backend.models import db, Resume, ProcessingJob
+from backend.services.file_parser import FileParser
+from backend.services.document_analysis import refresh_analysis_artifact
+from backend.services.tfidf_model import corpus_tfidf_model
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_STALE_SECONDS = 600  # a running job not finished after this long is assumed lost
+MAX_ATTEMPTS = 3
+
+# Pipeline stages and the progress reported when each one starts
+STAGES = {
+    'queued': 0,
+    'parsing': 10,
+    'extracting_keywords': 60,
+    'analyzing': 80,
+    'completed': 100
+}
+
+_keyword_parser = None
+_keyword_parser_lock = threading.Lock()
+
+
+def get_keyword_parser():
+    """Shared KeywordParser (building its skill automaton is done once per process)"""
+    global _keyword_parser
+    if _keyword_parser is None:
+        with _keyword_parser_lock:
+            if _keyword_parser is None:
+                from backend.services.keyword_parser import KeywordParser
+                _keyword_parser = KeywordParser()
+    return _keyword_parser
+
+
+def process_resume_upload(resume: Resume,
+                          report: Optional[Callable[[str], None]] = None) -> Tuple[bool, Optional[str]]:
+    """
+    Parse an uploaded resume file, extract keywords and store its analysis artifact
+
+    Keyword extraction and analysis failures are logged but do not fail the upload.
+    The caller commits.
+
+    Args:
+        resume: Resume whose file has been saved
+        report: Optional callback invoked with each stage name as it starts
+
+    Returns:
+        Tuple of (parsing_success, parse_error)
+    """
+    report = report or (lambda stage: None)
+
+    report('parsing')
+    success, extracted_text, parse_error = FileParser.parse_resume_file(resume.file_path, resume.file_type)
+
+    if not success:
+        resume.upload_status = 'failed'
+        resume.error_message = parse_error
+        return False, parse_error
+
+    resume.extracted_text = extracted_text
+    corpus_tfidf_model.add_document(extracted_text)
+
+    # US-05: Automatically extract keywords after successful text extraction
+    report('extracting_keywords')
+    try:
+        keywords = get_keyword_parser().extract_keywords(extracted_text)
+        resume.set_keywords(
+            technical_skills=keywords['technical_skills'],
+            soft_skills=keywords['soft_skills'],
+            other_keywords=keywords['other_keywords']
+        )
+        logger.info(f"Keywords automatically extracted for resume {resume.id}")
+    except Exception as keyword_error:
+        logger.error(f"Failed to extract keywords for resume {resume.id}: {keyword_error}")
+
+    # Store the analysis artifact so matching never re-parses this text
+    report('analyzing')
+    try:
+        refresh_analysis_artifact(resume)
+    except Exception as analysis_error:
+        logger.error(f"Failed to analyze resume {resume.id}: {analysis_error}")
+
+    resume.upload_status = 'completed'
+    return True, None
+
+
+class ProcessingQueue:
+    """
+    Local worker pool fed from the processing_jobs table
+
+    A job is claimed with a conditional UPDATE (queued -> running), so the same
+    job is never processed twice even when several gunicorn workers recover the
+    queue at startup. Jobs left queued, or running past the stale timeout, by a
+    process that died are picked up again by init_app().
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, stale_seconds: Optional[int] = None):
+        """
+        Args:
+            max_workers: Worker threads per process (env UPLOAD_WORKERS)
+            stale_seconds: Age after which a running job is requeued (env PROCESSING_JOB_STALE_SECONDS)
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv('UPLOAD_WORKERS', DEFAULT_WORKERS))
+        if stale_seconds is None:
+            stale_seconds = int(os.getenv('PROCESSING_JOB_STALE_SECONDS', DEFAULT_STALE_SECONDS))
+
+        self.max_workers = max(1, max_workers)
+        self.stale_seconds = stale_seconds
+        self._app = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._fork_hook_registered = False
+
+    def init_app(self, app) -> None:
+        """Bind the queue to an app and resume jobs interrupted by a restart"""
+        self._app = app
+        # Recovery may start the pool before gunicorn --preload forks its workers
+        if not self._fork_hook_registered and hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+            self._fork_hook_registered = True
+        if app.config.get('ASYNC_UPLOAD_PROCESSING'):
+            self.recover()
+
+    def _after_fork(self) -> None:
+        """
+        Forget the parent's pool in a forked child
+
+        Only the forking thread survives a fork, so an inherited executor has no
+        threads and would never run what the child submits. Jobs the parent
+        already submitted stay with the parent.
+        """
+        self._lock = threading.Lock()
+        self._executor = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def create_job(self, resume: Resume) -> ProcessingJob:
+        """Add a queued job for a resume to the session (the caller commits, then enqueues)"""
+        job = ProcessingJob(user_id=resume.user_id, resume=resume, status='queued', stage='queued', progress=0)
+        db.session.add(job)
+        return job
+
+    def enqueue(self, job_id: int) -> None:
+        """Hand a committed job to the worker pool"""
+        if self._app is None:
+            from flask import current_app
+            self._app = current_app._get_current_object()
+        self._get_executor().submit(self._run, job_id)
+
+    def recover(self) -> int:
+        """
+        Requeue jobs lost by a previous process and submit every queued job
+
+        Returns:
+            Number of jobs submitted
+        """
+        with self._app.app_context():
+            try:
+                stale_before = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+                stale_jobs = ProcessingJob.query.filter(
+                    ProcessingJob.status == 'running',
+                    ProcessingJob.started_at < stale_before
+                ).all()
+                for job in stale_jobs:
+                    if (job.attempts or 0) >= MAX_ATTEMPTS:
+                        self._mark_failed(job, f'Processing did not finish after {job.attempts} attempts')
+                        if job.resume is not None:
+                            job.resume.upload_status = 'failed'
+                            job.resume.error_message = 'Processing failed. Please try uploading again.'
+                    else:
+                        job.status = 'queued'
+                        job.stage = 'queued'
+                        job.progress = STAGES['queued']
+                db.session.commit()
+
+                job_ids = [job_id for (job_id,) in db.session.query(ProcessingJob.id).filter(
+                    ProcessingJob.status == 'queued'
+                ).order_by(ProcessingJob.id).all()]
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Processing queue recovery failed: {e}")
+                return 0
+            finally:
+                db.session.remove()
+
+        for job_id in job_ids:
+            self.enqueue(job_id)
+        if job_ids:
+            logger.info(f"Processing queue recovered {len(job_ids)} job(s)")
+        return len(job_ids)
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='resume-processing')
+            return self._executor
+
+    @staticmethod
+    def _claim(job_id: int) -> bool:
+        """Atomically move a job from queued to running; False if someone else owns it"""
+        result = db.session.execute(
+            update(ProcessingJob)
+            .where(ProcessingJob.id == job_id, ProcessingJob.status == 'queued')
+            .values(status='running', stage='parsing', progress=STAGES['parsing'],
+                    attempts=ProcessingJob.attempts + 1, started_at=datetime.utcnow(),
+                    error_message=None)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def _mark_failed(job: ProcessingJob, message: str) -> None:
+        job.status = 'failed'
+        job.error_message = message
+        job.finished_at = datetime.utcnow()
+
+    def _run(self, job_id: int) -> None:
+        with self._app.app_context():
+            try:
+                if not self._claim(job_id):
+                    return
+                self._process(job_id)
+            except StaleDataError:
+                db.session.rollback()
+                logger.info(f"Resume of processing job {job_id} was deleted during processing")
+            except Exception as e:
+                logger.error(f"Processing job {job_id} failed: {e}", exc_info=True)
+                db.session.rollback()
+                try:
+                    job = ProcessingJob.query.get(job_id)
+                    if job is not None:
+                        self._mark_failed(job, str(e))
+                        if job.resume is not None:
+                            job.resume.upload_status = 'failed'
+                            job.resume.error_message = 'Processing failed. Please try uploading again.'
+                        db.session.commit()
+                except Exception as status_error:
+                    db.session.rollback()
+                    logger.error(f"Could not record failure of processing job {job_id}: {status_error}")
+            finally:
+                db.session.remove()
+
+    def _process(self, job_id: int) -> None:
+        job = ProcessingJob.query.get(job_id)
+        resume = job.resume if job is not None else None
+        if resume is None:
+            # The resume was deleted while the job waited
+            if job is not None:
+                self._mark_failed(job, 'Resume no longer exists')
+                db.session.commit()
+            return
+
+        def report(stage: str) -> None:
+            job.stage = stage
+            job.progress = STAGES[stage]
+            db.session.commit()
+
+        started = datetime.utcnow()
+        success, parse_error = process_resume_upload(resume, report=report)
+
+        job.finished_at = datetime.utcnow()
+        if success:
+            job.status = 'completed'
+            job.stage = 'completed'
+            job.progress = STAGES['completed']
+        else:
+            job.status = 'failed'
+            job.error_message = parse_error
+        db.session.commit()
+
+        logger.info(f"Processing job {job_id} for resume {resume.id} {job.status} "
+                    f"in {(job.finished_at - started).total_seconds():.2f}s")
+
+
+# Shared by the upload routes (enqueue, status) and app startup (recovery)
+resume_processing_queue = ProcessingQueue()
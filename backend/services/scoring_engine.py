@@ -0,0 +1,350 @@
+"""
+Pluggable keyword scoring algorithms
+Every algorithm scores one resume against a batch of job descriptions with sparse
+matrix operations and reports the same MatchScore columns, so the algorithm can be
+chosen per request and compared on the stored scores (MatchScore.algorithm_used)
+"""
+
+import logging
+import math
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Set
+
+from backend.services.keyword_index import CorpusStatistics
+
+# SciPy ships with scikit-learn, which is already a requirement
+try:
+    import numpy as np
+    from scipy import sparse
+    VECTORIZED_SCORING_AVAILABLE = True
+except ImportError:
+    VECTORIZED_SCORING_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCORING_ALGORITHM = os.getenv('SCORING_ALGORITHM', 'jaccard')
+
+# Keyword categories and their weight in the overall score
+CATEGORY_WEIGHTS = {
+    'technical_skills': 0.5,
+    'soft_skills': 0.2,
+    'other_keywords': 0.3
+}
+
+SCORE_KEYS = {
+    'technical_skills': 'technical_score',
+    'soft_skills': 'soft_skills_score',
+    'other_keywords': 'other_keywords_score'
+}
+
+# MatchScore columns every algorithm fills, in the order of the per-pair dicts
+SCORE_COLUMNS = (
+    'technical_score', 'soft_skills_score', 'other_keywords_score', 'overall_score',
+    'total_resume_keywords', 'total_jd_keywords', 'matched_keywords'
+)
+
+EMPTY_CORPUS = CorpusStatistics()
+
+
+def _normalized(keywords: Sequence[str]) -> Set[str]:
+    return {keyword.lower().strip() for keyword in keywords}
+
+
+if VECTORIZED_SCORING_AVAILABLE:
+    # Element-wise round(); np.round scales by 100 first and disagrees on values such as 4.285
+    _round2 = np.frompyfunc(lambda value: round(value, 2), 1, 1)
+
+
+def round_scores(values):
+    """Round to 2 decimals exactly like Python's round(), matching the per-pair scores"""
+    return _round2(values).astype(np.float64)
+
+
+def to_score_dicts(matrix_scores: Dict, row: int = 0) -> List[Dict]:
+    """Per-JD MatchScore column dicts (plain Python numbers) for one resume row of score_matrix()"""
+    columns = [matrix_scores[key][row].tolist() for key in SCORE_COLUMNS]
+    return [dict(zip(SCORE_COLUMNS, values)) for values in zip(*columns)]
+
+
+class ScoringAlgorithm(ABC):
+    """
+    Base class: a similarity (0-100) per keyword category, combined with CATEGORY_WEIGHTS
+
+    Subclasses implement _similarity() on the binary keyword matrices of one
+    category. Edge cases are shared by all algorithms: two empty categories
+    score 100, one empty category scores 0.
+    """
+
+    name = None
+    # Whether the algorithm weights keywords by their document frequency among the user's JDs
+    uses_corpus = False
+
+    def score(self, resume_keywords: Dict, jd_keywords: Dict,
+              corpus: Optional[CorpusStatistics] = None) -> Dict:
+        """Score one resume against one job description"""
+        return self.score_many(resume_keywords, [jd_keywords], corpus)[0]
+
+    def score_many(self, resume_keywords: Dict, jd_keywords_list: List[Dict],
+                   corpus: Optional[CorpusStatistics] = None) -> List[Dict]:
+        """
+        Score one resume against many job descriptions in one matrix pass
+
+        Args:
+            resume_keywords: get_keywords() dict of the resume
+            jd_keywords_list: get_keywords() dicts of the job descriptions
+            corpus: Keyword statistics of the user's job descriptions (IDF algorithms)
+
+        Returns:
+            List of MatchScore column dicts (category scores, overall score and
+            keyword counts) in the order of jd_keywords_list
+        """
+        if not jd_keywords_list:
+            return []
+        return to_score_dicts(self.score_matrix([resume_keywords], jd_keywords_list, corpus))
+
+    def score_matrix(self, resume_keywords_list: Sequence[Dict], jd_keywords_list: Sequence[Dict],
+                     corpus: Optional[CorpusStatistics] = None) -> Dict:
+        """
+        Score every resume against every job description
+
+        Returns:
+            Dict of m x n numpy arrays keyed like MatchScore columns (SCORE_COLUMNS)
+        """
+        if not VECTORIZED_SCORING_AVAILABLE:
+            raise RuntimeError("Vectorized scoring requires numpy and scipy")
+
+        corpus = corpus or EMPTY_CORPUS
+        m, n = len(resume_keywords_list), len(jd_keywords_list)
+        result = {}
+        overall = np.zeros((m, n))
+        matched = np.zeros((m, n))
+
+        for category, weight in CATEGORY_WEIGHTS.items():
+            # Column space of this batch only; the weights are looked up per column
+            columns: Dict[str, int] = {}
+            resume_rows = [[columns.setdefault(term, len(columns)) for term in _normalized(k[category])]
+                           for k in resume_keywords_list]
+            jd_rows = [[columns.setdefault(term, len(columns)) for term in _normalized(k[category])]
+                       for k in jd_keywords_list]
+            resume_matrix = self._encode(resume_rows, len(columns))
+            jd_matrix = self._encode(jd_rows, len(columns))
+
+            intersection = (resume_matrix @ jd_matrix.T).toarray()
+            resume_sizes = np.asarray(resume_matrix.sum(axis=1)).ravel()
+            jd_sizes = np.asarray(jd_matrix.sum(axis=1)).ravel()
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                similarity = self._similarity(
+                    category, columns, corpus, resume_matrix, jd_matrix, intersection, resume_sizes, jd_sizes
+                )
+            resume_empty = (resume_sizes == 0)[:, None]
+            jd_empty = (jd_sizes == 0)[None, :]
+            similarity = np.where(resume_empty | jd_empty, 0.0, np.nan_to_num(similarity))
+            similarity = round_scores(np.where(resume_empty & jd_empty, 100.0, similarity))
+
+            result[SCORE_KEYS[category]] = similarity
+            overall += similarity * weight
+            matched += intersection
+
+        resume_totals = np.array([sum(len(k[c]) for c in CATEGORY_WEIGHTS) for k in resume_keywords_list])
+        jd_totals = np.array([sum(len(k[c]) for c in CATEGORY_WEIGHTS) for k in jd_keywords_list])
+
+        result['overall_score'] = round_scores(overall)
+        result['total_resume_keywords'] = np.repeat(resume_totals[:, None], n, axis=1)
+        result['total_jd_keywords'] = np.repeat(jd_totals[None, :], m, axis=0)
+        result['matched_keywords'] = matched.astype(np.int64)
+        return result
+
+    @staticmethod
+    def _encode(rows: List[List[int]], width: int):
+        """CSR binary matrix from per-row column indices"""
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in rows])
+        indices = np.fromiter((c for row in rows for c in row), dtype=np.int64, count=int(indptr[-1]))
+        return sparse.csr_matrix((np.ones(len(indices)), indices, indptr), shape=(len(rows), width))
+
+    @abstractmethod
+    def _similarity(self, category, columns, corpus, resume_matrix, jd_matrix,
+                    intersection, resume_sizes, jd_sizes):
+        """m x n similarity (0-100) for one category; empty rows are handled by the caller"""
+
+
+class JaccardScorer(ScoringAlgorithm):
+    """|A ∩ B| / |A ∪ B| per category (the original MatchingService score)"""
+
+    name = 'jaccard'
+
+    # Batches smaller than this are cheaper to score with plain Python sets
+    VECTORIZED_MIN_BATCH = 8
+
+    def score_many(self, resume_keywords, jd_keywords_list, corpus=None):
+        if not VECTORIZED_SCORING_AVAILABLE or len(jd_keywords_list) < self.VECTORIZED_MIN_BATCH:
+            return [self._score_pair(resume_keywords, jd_keywords) for jd_keywords in jd_keywords_list]
+        return super().score_many(resume_keywords, jd_keywords_list, corpus)
+
+    def score_matrix(self, resume_keywords_list, jd_keywords_list, corpus=None):
+        """
+        Jaccard scores of every pair, plus overlap_score: |A ∩ B| / min(|A|, |B|)
+        over all categories (0-100), which bulk re-scoring reports alongside them
+        """
+        result = super().score_matrix(resume_keywords_list, jd_keywords_list, corpus)
+        resume_unique = np.array([sum(len(_normalized(k[c])) for c in CATEGORY_WEIGHTS)
+                                  for k in resume_keywords_list])
+        jd_unique = np.array([sum(len(_normalized(k[c])) for c in CATEGORY_WEIGHTS)
+                              for k in jd_keywords_list])
+        smaller = np.minimum(resume_unique[:, None], jd_unique[None, :])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            overlap = np.where(smaller > 0, result['matched_keywords'] / smaller * 100, 0.0)
+        result['overlap_score'] = round_scores(overlap)
+        return result
+
+    def _similarity(self, category, columns, corpus, resume_matrix, jd_matrix,
+                    intersection, resume_sizes, jd_sizes):
+        union = resume_sizes[:, None] + jd_sizes[None, :] - intersection
+        return intersection / union * 100
+
+    @staticmethod
+    def _score_pair(resume_keywords: Dict, jd_keywords: Dict) -> Dict:
+        """Set-based scoring of a single pair; same results as the matrix path"""
+        category_scores = {}
+        matched_keywords = 0
+        for category in CATEGORY_WEIGHTS:
+            resume_set = _normalized(resume_keywords[category])
+            jd_set = _normalized(jd_keywords[category])
+            if not resume_set and not jd_set:
+                score = 100.0
+            elif not resume_set or not jd_set:
+                score = 0.0
+            else:
+                score = round(len(resume_set & jd_set) / len(resume_set | jd_set) * 100, 2)
+            category_scores[SCORE_KEYS[category]] = score
+            matched_keywords += len(resume_set & jd_set)
+
+        overall_score = round(sum(
+            category_scores[SCORE_KEYS[category]] * weight for category, weight in CATEGORY_WEIGHTS.items()
+        ), 2)
+
+        return {
+            **category_scores,
+            'overall_score': overall_score,
+            'total_resume_keywords': sum(len(resume_keywords[c]) for c in CATEGORY_WEIGHTS),
+            'total_jd_keywords': sum(len(jd_keywords[c]) for c in CATEGORY_WEIGHTS),
+            'matched_keywords': matched_keywords
+        }
+
+
+class _IdfWeightedScorer(ScoringAlgorithm):
+    """Base for algorithms that weight keywords by their rarity among the user's JDs"""
+
+    uses_corpus = True
+
+    def _weights(self, category: str, columns: Dict[str, int], corpus: CorpusStatistics):
+        """Weight per batch column"""
+        weights = np.empty(len(columns))
+        for term, column in columns.items():
+            weights[column] = self._idf(corpus.document_frequency(category, term), corpus.document_count)
+        return weights
+
+    @staticmethod
+    def _idf(document_frequency: int, document_count: int) -> float:
+        # Smoothed IDF (as in scikit-learn): 1 for a keyword in every JD, never zero
+        return math.log((1 + document_count) / (1 + document_frequency)) + 1
+
+
+class WeightedJaccardScorer(_IdfWeightedScorer):
+    """Σ idf over A ∩ B / Σ idf over A ∪ B: shared rare keywords count more than common ones"""
+
+    name = 'weighted_jaccard'
+
+    def _similarity(self, category, columns, corpus, resume_matrix, jd_matrix,
+                    intersection, resume_sizes, jd_sizes):
+        weights = self._weights(category, columns, corpus)
+        shared = (resume_matrix.multiply(weights[None, :]).tocsr() @ jd_matrix.T).toarray()
+        resume_weight = resume_matrix @ weights
+        jd_weight = jd_matrix @ weights
+        return shared / (resume_weight[:, None] + jd_weight[None, :] - shared) * 100
+
+
+class TfidfCosineScorer(_IdfWeightedScorer):
+    """Cosine similarity of the TF-IDF keyword vectors (binary term frequency)"""
+
+    name = 'cosine'
+
+    def _similarity(self, category, columns, corpus, resume_matrix, jd_matrix,
+                    intersection, resume_sizes, jd_sizes):
+        weights = self._weights(category, columns, corpus)
+        resume_vectors = resume_matrix.multiply(weights[None, :]).tocsr()
+        jd_vectors = jd_matrix.multiply(weights[None, :]).tocsr()
+        dot = (resume_vectors @ jd_vectors.T).toarray()
+        resume_norms = np.sqrt(np.asarray(resume_vectors.multiply(resume_vectors).sum(axis=1)).ravel())
+        jd_norms = np.sqrt(np.asarray(jd_vectors.multiply(jd_vectors).sum(axis=1)).ravel())
+        return np.minimum(dot / (resume_norms[:, None] * jd_norms[None, :]), 1.0) * 100
+
+
+class BM25Scorer(_IdfWeightedScorer):
+    """
+    Okapi BM25 with the job description's keywords as the query and the resume as the document
+
+    Keywords carry no term frequency, so a matched keyword contributes
+    idf * (k1 + 1) / (1 + k1 * (1 - b + b * |resume| / avgdl)), where avgdl is the
+    average keyword count of the user's JDs in the category. The sum is divided by
+    the score of a resume of average length containing every JD keyword (Σ idf),
+    and capped at 100. Unlike Jaccard, extra resume keywords only cost through the
+    length normalization.
+    """
+
+    name = 'bm25'
+    k1 = 1.2
+    b = 0.75
+
+    @staticmethod
+    def _idf(document_frequency: int, document_count: int) -> float:
+        # BM25 IDF with the +1 inside the log, so keywords in most JDs still score above zero
+        return math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _similarity(self, category, columns, corpus, resume_matrix, jd_matrix,
+                    intersection, resume_sizes, jd_sizes):
+        weights = self._weights(category, columns, corpus)
+        matched_idf = (resume_matrix.multiply(weights[None, :]).tocsr() @ jd_matrix.T).toarray()
+        query_idf = jd_matrix @ weights
+
+        average_length = corpus.average_lengths.get(category) or 0
+        if average_length > 0:
+            length_ratio = resume_sizes / average_length
+        else:
+            length_ratio = np.ones(len(resume_sizes))
+        saturation = (self.k1 + 1) / (1 + self.k1 * (1 - self.b + self.b * length_ratio))
+
+        return np.minimum(matched_idf * saturation[:, None] / query_idf[None, :], 1.0) * 100
+
+
+def _available_algorithms() -> Dict[str, ScoringAlgorithm]:
+    scorers = [JaccardScorer()]
+    if VECTORIZED_SCORING_AVAILABLE:
+        scorers += [WeightedJaccardScorer(), TfidfCosineScorer(), BM25Scorer()]
+    else:
+        logger.warning("NumPy/SciPy not available. Only Jaccard scoring is enabled.")
+    return {scorer.name: scorer for scorer in scorers}
+
+
+# Stateless, shared by every request
+SCORING_ALGORITHMS = _available_algorithms()
+
+
+def get_scoring_algorithm(name: Optional[str] = None) -> ScoringAlgorithm:
+    """
+    Scoring algorithm by name
+
+    Args:
+        name: Algorithm name (None = env SCORING_ALGORITHM, default jaccard)
+
+    Raises:
+        ValueError: If the algorithm is unknown or unavailable
+    """
+    name = (name or DEFAULT_SCORING_ALGORITHM).strip().lower()
+    algorithm = SCORING_ALGORITHMS.get(name)
+    if algorithm is None:
+        raise ValueError(f"Unknown scoring algorithm '{name}'. "
+                         f"Available: {', '.join(sorted(SCORING_ALGORITHMS))}")
+    return algorithm
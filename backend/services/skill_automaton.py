@@ -0,0 +1,105 @@
+"""
+Aho-Corasick automaton for single-pass multi-pattern skill matching
+"""
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+class SkillAutomaton:
+    """
+    Multi-pattern substring matcher built once from a skill dictionary.
+
+    Every pattern (a canonical skill or one of its variations) is compiled into a
+    deterministic automaton, so scanning a text costs one transition per character
+    no matter how many patterns are registered. Each hit is mapped back to the
+    canonical skill(s) that own the matched pattern.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]]):
+        """
+        Build the automaton
+
+        Args:
+            patterns: (pattern, canonical_skill) pairs - a skill may own many patterns
+        """
+        goto: List[Dict[str, int]] = [{}]
+        owners: List[Set[str]] = [set()]
+
+        # Step 1: build the trie of all patterns
+        for pattern, skill in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    owners.append(set())
+                state = next_state
+            owners[state].add(skill)
+
+        self.pattern_states = len(goto)
+        self._transitions, self._outputs = self._compile(goto, owners)
+
+    @staticmethod
+    def _compile(goto: List[Dict[str, int]], owners: List[Set[str]]):
+        """
+        Add failure links and flatten them into a complete transition table.
+
+        States are visited breadth-first, so the failure target of a state is always
+        complete before the state itself. Only transitions leaving the root are
+        stored implicitly (a missing key means "back to root").
+        """
+        transitions: List[Dict[str, int]] = [dict(goto[0])]
+        transitions.extend({} for _ in range(len(goto) - 1))
+        failure = [0] * len(goto)
+
+        queue = deque()
+        for child in goto[0].values():
+            queue.append(child)
+
+        while queue:
+            state = queue.popleft()
+            fail_transitions = transitions[failure[state]]
+
+            # Inherit the failure state's moves, then override with our own edges
+            table = dict(fail_transitions)
+            for char, child in goto[state].items():
+                table[char] = child
+                failure[child] = fail_transitions.get(char, 0)
+                queue.append(child)
+            transitions[state] = table
+
+            # A state also reports every pattern that ends at its failure target
+            owners[state] |= owners[failure[state]]
+
+        outputs: List[Optional[FrozenSet[str]]] = [
+            frozenset(skills) if skills else None for skills in owners
+        ]
+        return transitions, outputs
+
+    def find_skills(self, text: str) -> Set[str]:
+        """
+        Scan text once and return every canonical skill with at least one hit
+
+        Args:
+            text (str): Text to scan (patterns are matched case-sensitively, so
+                callers should pass lowercased text for lowercase patterns)
+
+        Returns:
+            set: Canonical skills found in the text
+        """
+        found: Set[str] = set()
+        transitions = self._transitions
+        outputs = self._outputs
+
+        state = 0
+        for char in text:
+            state = transitions[state].get(char, 0)
+            hits = outputs[state]
+            if hits:
+                found |= hits
+
+        return found
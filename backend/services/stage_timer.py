@@ -0,0 +1,195 @@
+"""
+Per-stage timing of the analysis pipeline
+Code wraps each stage in a span; durations go into in-process histograms (one
+per operation and stage, served by GET /api/metrics) and into a trace the
+caller can return or store with the scan
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets in milliseconds; slower samples land in an overflow bucket
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class StageHistogram:
+    """Bucketed latency distribution of one stage with count, sum, min and max"""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.bounds = tuple(buckets_ms)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def observe(self, duration_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        self.min_ms = duration_ms if self.min_ms is None else min(self.min_ms, duration_ms)
+        self.max_ms = duration_ms if self.max_ms is None else max(self.max_ms, duration_ms)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimated quantile, interpolated linearly inside the bucket it falls in
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Milliseconds (0.0 without samples)
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max_ms
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                # Never report beyond what was actually observed
+                return min(max(estimate, self.min_ms), self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum_ms': round(self.sum_ms, 3),
+            'mean_ms': round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            'min_ms': round(self.min_ms or 0.0, 3),
+            'max_ms': round(self.max_ms or 0.0, 3),
+            'p50_ms': round(self.quantile(0.5), 3),
+            'p90_ms': round(self.quantile(0.9), 3),
+            'p99_ms': round(self.quantile(0.99), 3),
+            'buckets': [
+                {'le_ms': bound, 'count': count}
+                for bound, count in zip(list(self.bounds) + ['+Inf'], self.counts)
+            ],
+        }
+
+
+class StageTrace:
+    """
+    Stage durations of one operation (e.g. one analyze_resume_realtime call)
+
+    Spans of the same stage within a trace add up, so a stage run per document
+    shows its total time.
+    """
+
+    def __init__(self, metrics: 'StageMetrics', operation: str):
+        self.metrics = metrics
+        self.operation = operation
+        self.timings: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time the enclosed block as one run of the stage"""
+        if not self.metrics.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.timings[stage] = round(self.timings.get(stage, 0.0) + duration_ms, 3)
+            self.metrics.record(self.operation, stage, duration_ms)
+
+    def finish(self) -> Dict[str, float]:
+        """
+        Record the whole operation as stage 'total'
+
+        Returns:
+            Milliseconds per stage, 'total' included (empty when timing is disabled)
+        """
+        if self.metrics.enabled:
+            duration_ms = (time.perf_counter() - self._started) * 1000
+            self.timings['total'] = round(duration_ms, 3)
+            self.metrics.record(self.operation, 'total', duration_ms)
+        return dict(self.timings)
+
+
+class StageMetrics:
+    """
+    Thread-safe registry of stage histograms, keyed by operation and stage
+
+    Histograms live in the process, so with gunicorn every worker reports its
+    own share of the traffic.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        """
+        Args:
+            enabled: Record timings (env STAGE_TIMING_ENABLED, default true)
+            buckets_ms: Histogram bucket upper bounds in milliseconds
+        """
+        if enabled is None:
+            enabled = os.getenv('STAGE_TIMING_ENABLED', 'true').lower() == 'true'
+        self.enabled = enabled
+        self.buckets_ms = tuple(buckets_ms)
+        self._histograms: Dict[str, Dict[str, StageHistogram]] = {}
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+
+    def trace(self, operation: str) -> StageTrace:
+        """Start timing one run of an operation"""
+        return StageTrace(self, operation)
+
+    @contextmanager
+    def span(self, operation: str, stage: str):
+        """Time the enclosed block into the histogram of one stage, outside any trace"""
+        with self.trace(operation).span(stage):
+            yield
+
+    def record(self, operation: str, stage: str, duration_ms: float) -> None:
+        """Add one duration to the histogram of an operation stage"""
+        with self._lock:
+            stages = self._histograms.setdefault(operation, {})
+            histogram = stages.get(stage)
+            if histogram is None:
+                histogram = stages[stage] = StageHistogram(self.buckets_ms)
+            histogram.observe(duration_ms)
+
+    def snapshot(self, operations: Optional[List[str]] = None) -> Dict:
+        """
+        Current histograms
+
+        Args:
+            operations: Only these operations (all when omitted)
+
+        Returns:
+            Dict with the process id, uptime and {operation: {stage: histogram}}
+        """
+        with self._lock:
+            stages = {
+                operation: {stage: histogram.to_dict() for stage, histogram in histograms.items()}
+                for operation, histograms in self._histograms.items()
+                if not operations or operation in operations
+            }
+        return {
+            'enabled': self.enabled,
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.time() - self._started_at, 1),
+            'operations': stages,
+        }
+
+    def reset(self) -> None:
+        """Drop every histogram"""
+        with self._lock:
+            self._histograms.clear()
+            self._started_at = time.time()
+
+
+# Global instance shared by the services and the metrics route
+stage_metrics = StageMetrics()
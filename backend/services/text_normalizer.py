@@ -0,0 +1,102 @@
+"""
+Shared text normalization
+Each normal form is built in one pass instead of a chain of regex substitutions:
+ASCII text (the common case) goes through str.translate tables, other text through a
+single equivalent regex. The keyword forms are memoized per document text so every
+extractor working on the same resume or job description reuses them
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List
+
+# Documents (resumes, job descriptions) whose normalized forms are kept
+NORMALIZED_CACHE_SIZE = 128
+
+# Control characters removed from extracted text; newlines, tabs and carriage returns stay
+CONTROL_CHARS = ''.join(chr(c) for c in [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
+CONTROL_CHARS_TABLE = str.maketrans('', '', CONTROL_CHARS)
+CONTROL_CHARS_PATTERN = re.compile('[' + re.escape(CONTROL_CHARS) + ']')
+MULTIPLE_SPACES_PATTERN = re.compile(r' {2,}')
+
+# Characters kept by the keyword form besides letters, digits, underscores and whitespace
+KEYWORD_PUNCTUATION = '-.+#'
+
+# ASCII punctuation and control characters become spaces in the keyword form
+KEYWORD_TABLE = {
+    c: ' ' for c in range(128)
+    if not (chr(c).isalnum() or chr(c).isspace() or chr(c) == '_' or chr(c) in KEYWORD_PUNCTUATION)
+}
+# Same mapping for text with characters outside ASCII, which the table cannot enumerate
+KEYWORD_SYMBOLS_PATTERN = re.compile(r'[^\w\s\-\.\+\#]')
+
+# Plural and adjective forms folded onto one term before keyword lookup
+STEMS = {
+    'restful': 'rest',
+    'api': 'api', 'apis': 'api',
+    'database': 'database', 'databases': 'database',
+    'framework': 'framework', 'frameworks': 'framework',
+    'service': 'service', 'services': 'service',
+    'component': 'component', 'components': 'component',
+    'microservice': 'microservices', 'microservices': 'microservices',
+    'container': 'container', 'containers': 'container',
+    'technology': 'technology', 'technologies': 'technology',
+}
+STEMS_PATTERN = re.compile(r'\b(?:' + '|'.join(sorted(STEMS, key=len, reverse=True)) + r')\b')
+
+
+def clean_lines(text: str) -> List[str]:
+    """
+    Clean extracted text line by line
+
+    Removes control characters, applies NFKD normalization, strips every line,
+    collapses runs of spaces and drops empty lines. Every step only looks within
+    a line, so blocks of text (such as PDF pages) can be cleaned independently.
+
+    Args:
+        text: Raw extracted text
+
+    Returns:
+        Non-empty cleaned lines
+    """
+    if text.isascii():
+        text = text.translate(CONTROL_CHARS_TABLE)
+    else:
+        text = unicodedata.normalize('NFKD', CONTROL_CHARS_PATTERN.sub('', text))
+    # Space runs never cross a newline, so the whole block is collapsed at once
+    text = MULTIPLE_SPACES_PATTERN.sub(' ', text)
+    return [line for line in map(str.strip, text.split('\n')) if line]
+
+
+@lru_cache(maxsize=NORMALIZED_CACHE_SIZE)
+def keyword_text(text: str) -> str:
+    """
+    Canonical form used for keyword matching
+
+    Lowercased, punctuation other than - . + # replaced by spaces, whitespace
+    collapsed to single spaces. Cached per text.
+
+    Args:
+        text: Document text
+
+    Returns:
+        Normalized text
+    """
+    text = text.lower()
+    text = text.translate(KEYWORD_TABLE) if text.isascii() else KEYWORD_SYMBOLS_PATTERN.sub(' ', text)
+    return ' '.join(text.split())
+
+
+@lru_cache(maxsize=NORMALIZED_CACHE_SIZE)
+def stemmed_text(text: str) -> str:
+    """
+    Lowercased text with the STEMS variants replaced in a single regex pass (cached per text)
+
+    Args:
+        text: Document text
+
+    Returns:
+        Text with folded terms
+    """
+    return STEMS_PATTERN.sub(lambda match: STEMS[match.group()], text.lower())
@@ -0,0 +1,318 @@
+"""
+Corpus-level TF-IDF model for keyword extraction
+Document frequencies are counted over all stored resumes and job descriptions and
+persisted, so extracting keywords from a document only transforms it with fitted IDF
+weights. New documents are counted as they are stored and the weights are refitted
+in the background as the corpus grows.
+"""
+
+import heapq
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import joblib
+    from sklearn.feature_extraction.text import CountVectorizer
+    TFIDF_MODEL_AVAILABLE = True
+except ImportError:
+    TFIDF_MODEL_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: refits of separate processes are not serialized
+
+logger = logging.getLogger(__name__)
+
+if not TFIDF_MODEL_AVAILABLE:
+    logger.warning("Scikit-learn not available. Using basic keyword extraction.")
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_MODEL_PATH = os.path.join(project_root, 'database', 'tfidf_model.joblib')
+
+# Terms in fewer documents get no weight of their own and count as rare
+MIN_DOCUMENT_FREQUENCY = 2
+# Terms kept in the persisted counts; the least frequent are dropped beyond this
+MAX_STORED_TERMS = 500000
+# Seconds between checks whether another process saved a newer model
+RELOAD_CHECK_SECONDS = 60
+
+
+class CorpusTfidfModel:
+    """
+    IDF weights fitted over the stored documents, applied to one document at a time
+
+    Tokenization matches the previous per-document TfidfVectorizer (English stop
+    words, unigrams and bigrams); term frequencies are sublinear. Counts of
+    documents added since the last fit are merged into the persisted counts on the
+    next refit, which runs once the corpus has grown by refit_growth (at least
+    refit_min_documents documents). Several
+    processes can share one model file: refits are serialized with a file lock and
+    every process picks up the newest saved model.
+    """
+
+    def __init__(self, path: Optional[str] = None, refit_min_documents: Optional[int] = None,
+                 refit_growth: Optional[float] = None):
+        """
+        Args:
+            path: Model file (env TFIDF_MODEL_PATH, default database/tfidf_model.joblib)
+            refit_min_documents: New documents needed before a refit (env TFIDF_REFIT_MIN_DOCUMENTS)
+            refit_growth: Corpus growth ratio that triggers a refit (env TFIDF_REFIT_GROWTH)
+        """
+        if refit_min_documents is None:
+            refit_min_documents = int(os.getenv('TFIDF_REFIT_MIN_DOCUMENTS', '25'))
+        if refit_growth is None:
+            refit_growth = float(os.getenv('TFIDF_REFIT_GROWTH', '0.05'))
+
+        self.path = path or os.getenv('TFIDF_MODEL_PATH', DEFAULT_MODEL_PATH)
+        self.refit_min_documents = refit_min_documents
+        self.refit_growth = refit_growth
+
+        self.document_count = 0
+        self.idf: Dict[str, float] = {}
+        self.rare_idf = self._idf(1, 0)
+
+        self._analyzer = None
+        self._pending = Counter()
+        self._pending_documents = 0
+        self._lock = threading.Lock()
+        self._refit_thread = None
+        self._loaded_mtime = None
+        self._last_reload_check = 0.0
+
+    @property
+    def analyzer(self):
+        """Tokenizer producing the terms of a document"""
+        if self._analyzer is None:
+            self._analyzer = CountVectorizer(stop_words='english', ngram_range=(1, 2)).build_analyzer()
+        return self._analyzer
+
+    @staticmethod
+    def _idf(document_frequency: int, document_count: int) -> float:
+        # Smoothed IDF, as computed by TfidfVectorizer
+        return math.log((1 + document_count) / (1 + document_frequency)) + 1
+
+    def _apply(self, document_count: int, frequencies: Dict[str, int]) -> None:
+        """Replace the in-memory weights"""
+        idf = {
+            term: self._idf(frequency, document_count)
+            for term, frequency in frequencies.items()
+            if frequency >= MIN_DOCUMENT_FREQUENCY
+        }
+        self.idf, self.rare_idf, self.document_count = idf, self._idf(1, document_count), document_count
+
+    # ------------------------------------------------------------------
+    # Extraction
+    # ------------------------------------------------------------------
+
+    def top_keywords(self, text: str, max_keywords: int) -> List[str]:
+        """
+        Highest TF-IDF terms of a document
+
+        Args:
+            text: Document text
+            max_keywords: Number of terms to return
+
+        Returns:
+            Terms ordered by score (ties alphabetically)
+        """
+        self._maybe_reload()
+        idf, rare_idf = self.idf, self.rare_idf
+        counts = Counter(self.analyzer(text))
+        # Sublinear TF (1 + log tf), so filler words repeated throughout a document
+        # do not outrank distinctive ones
+        return [term for _, term in heapq.nsmallest(
+            max_keywords,
+            ((-(1 + math.log(count)) * idf.get(term, rare_idf), term) for term, count in counts.items())
+        )]
+
+    # ------------------------------------------------------------------
+    # Corpus maintenance
+    # ------------------------------------------------------------------
+
+    def add_document(self, text: str) -> None:
+        """Count a newly stored resume or job description (refits in the background when due)"""
+        if not text:
+            return
+        terms = set(self.analyzer(text))
+        with self._lock:
+            self._pending.update(terms)
+            self._pending_documents += 1
+            due = self._pending_documents >= max(self.refit_min_documents,
+                                                 self.refit_growth * self.document_count)
+        if due:
+            self.refit_async()
+
+    def refit_async(self) -> None:
+        """Refit on a background thread unless one is already running"""
+        with self._lock:
+            if self._refit_thread is not None and self._refit_thread.is_alive():
+                return
+            self._refit_thread = threading.Thread(target=self.refit, name='tfidf-refit', daemon=True)
+            self._refit_thread.start()
+
+    def refit(self) -> None:
+        """Merge the documents added since the last fit into the saved counts and refit"""
+        with self._lock:
+            pending, pending_documents = self._pending, self._pending_documents
+            self._pending, self._pending_documents = Counter(), 0
+        if not pending_documents:
+            return
+
+        try:
+            with self._file_lock():
+                document_count, frequencies = self._read()
+                frequencies.update(pending)
+                self._save(document_count + pending_documents, frequencies)
+            logger.info(f"TF-IDF model refitted with {pending_documents} new documents "
+                        f"({self.document_count} in total)")
+        except Exception as e:
+            logger.error(f"TF-IDF refit failed: {e}")
+            with self._lock:
+                self._pending.update(pending)
+                self._pending_documents += pending_documents
+
+    def rebuild(self, texts: Iterable[str]) -> int:
+        """
+        Fit the model from scratch over a full corpus and save it
+
+        Args:
+            texts: Every stored document text
+
+        Returns:
+            Number of documents counted
+        """
+        analyzer = self.analyzer
+        frequencies = Counter()
+        document_count = 0
+        for text in texts:
+            if text:
+                frequencies.update(set(analyzer(text)))
+                document_count += 1
+
+        with self._file_lock():
+            self._save(document_count, frequencies)
+        logger.info(f"TF-IDF model rebuilt from {document_count} documents, {len(self.idf)} weighted terms")
+        return document_count
+
+    def rebuild_from_database(self) -> int:
+        """Fit the model over all active resumes and job descriptions (needs an app context)"""
+        from backend.models import db, Resume, JobDescription
+
+        def corpus():
+            resumes = db.session.query(Resume.extracted_text).filter(
+                Resume.is_active == True, Resume.extracted_text.isnot(None)
+            )
+            job_descriptions = db.session.query(JobDescription.job_text).filter(JobDescription.is_active == True)
+            for query in (resumes, job_descriptions):
+                for (text,) in query.yield_per(200):
+                    yield text
+
+        return self.rebuild(corpus())
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def init_app(self, app) -> None:
+        """
+        Load the saved model, or fit one from the database in the background if there
+        is none or it was fitted on no documents (env TFIDF_BUILD_ON_START=false
+        skips the initial fit)
+        """
+        if not TFIDF_MODEL_AVAILABLE:
+            return
+        if self._load_fitted() or os.getenv('TFIDF_BUILD_ON_START', 'true').lower() != 'true':
+            return
+
+        def build():
+            try:
+                with app.app_context():
+                    # Another worker may have finished the same build meanwhile
+                    if not self._load_fitted():
+                        self.rebuild_from_database()
+            except Exception as e:
+                logger.error(f"Initial TF-IDF model build failed: {e}")
+
+        threading.Thread(target=build, name='tfidf-build', daemon=True).start()
+
+    def load(self) -> bool:
+        """Load the saved model; returns False when there is none"""
+        try:
+            mtime = os.path.getmtime(self.path)
+            document_count, frequencies = self._read()
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.error(f"Could not load TF-IDF model {self.path}: {e}")
+            return False
+
+        self._apply(document_count, frequencies)
+        self._loaded_mtime = mtime
+        logger.info(f"TF-IDF model loaded: {document_count} documents, {len(self.idf)} weighted terms")
+        return True
+
+    def _load_fitted(self) -> bool:
+        """Load the saved model; False when there is none or it holds no documents"""
+        return self.load() and self.document_count > 0
+
+    def _maybe_reload(self) -> None:
+        """Pick up a model saved by another process (checked at most every RELOAD_CHECK_SECONDS)"""
+        now = time.monotonic()
+        if now - self._last_reload_check < RELOAD_CHECK_SECONDS:
+            return
+        self._last_reload_check = now
+        try:
+            if os.path.getmtime(self.path) != self._loaded_mtime:
+                self.load()
+        except OSError:
+            pass
+
+    def _read(self):
+        """(document count, term frequencies) saved on disk, empty if there is no file yet"""
+        try:
+            state = joblib.load(self.path)
+        except FileNotFoundError:
+            return 0, Counter()
+        return state['document_count'], Counter(state['document_frequencies'])
+
+    def _save(self, document_count: int, frequencies: Counter) -> None:
+        """Write the counts atomically and switch to the new weights"""
+        if len(frequencies) > MAX_STORED_TERMS:
+            frequencies = Counter(dict(frequencies.most_common(MAX_STORED_TERMS)))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        joblib.dump({'document_count': document_count, 'document_frequencies': dict(frequencies)}, temp_path)
+        os.replace(temp_path, self.path)
+
+        self._apply(document_count, frequencies)
+        self._loaded_mtime = os.path.getmtime(self.path)
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock serializing read-merge-write cycles of all processes"""
+        if fcntl is None:
+            yield
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f'{self.path}.lock', 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# Shared by keyword extraction and the code storing new documents
+corpus_tfidf_model = CorpusTfidfModel()
@@ -0,0 +1,192 @@
+"""
+Materialized dashboard statistics per user
+Keeps the user_stats summary in step with ScanHistory so dashboard loads read one row
+instead of aggregating every scan
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import case, func
+
+from backend.models import db, Resume, ScanHistory, UserStats
+
+logger = logging.getLogger(__name__)
+
+BUCKET_COLUMNS = {
+    'excellent': 'excellent_count',
+    'good': 'good_count',
+    'fair': 'fair_count',
+    'poor': 'poor_count'
+}
+
+
+class UserStatsService:
+    """Incremental maintenance and reads of the user_stats summary table"""
+
+    def record_scan(self, scan: ScanHistory) -> None:
+        """
+        Fold a new scan into its user's summary (call before committing the scan)
+
+        The summary row is locked for the update, so concurrent scans of the same
+        user are applied one after the other. Users without a summary yet are left
+        alone; get_stats() builds it from ScanHistory on the next dashboard load.
+
+        Args:
+            scan: ScanHistory added to the current session
+        """
+        stats = UserStats.query.filter_by(user_id=scan.user_id).with_for_update().first()
+        if stats is None:
+            return
+
+        db.session.flush()  # assigns scan.id
+        score = scan.overall_match_score or 0
+        stats.total_scans += 1
+        stats.score_sum += score
+        stats.min_score = score if stats.min_score is None else min(stats.min_score, score)
+        stats.max_score = score if stats.max_score is None else max(stats.max_score, score)
+        stats.last_scan_id = max(stats.last_scan_id or 0, scan.id)
+
+        bucket = BUCKET_COLUMNS[ScanHistory.score_category_for(score)]
+        setattr(stats, bucket, getattr(stats, bucket) + 1)
+
+        if scan.resume_id:
+            # Assign a new dict so the JSON column is flagged as changed
+            resume_scores = dict(stats.resume_scores or {})
+            count, total = resume_scores.get(str(scan.resume_id), [0, 0.0])
+            resume_scores[str(scan.resume_id)] = [count + 1, total + score]
+            stats.resume_scores = resume_scores
+
+    def rebuild(self, user_id: int) -> UserStats:
+        """
+        Recompute a user's summary from ScanHistory (the caller commits)
+
+        Used to backfill users whose scans predate the summary table.
+        """
+        user_id = int(user_id)
+        row = db.session.query(
+            func.max(ScanHistory.id),
+            func.count(ScanHistory.id),
+            func.coalesce(func.sum(ScanHistory.overall_match_score), 0.0),
+            func.min(ScanHistory.overall_match_score),
+            func.max(ScanHistory.overall_match_score),
+            *[
+                func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+                for condition in self._bucket_conditions()
+            ]
+        ).filter(ScanHistory.user_id == user_id).one()
+
+        per_resume = db.session.query(
+            ScanHistory.resume_id,
+            func.count(ScanHistory.id),
+            func.sum(ScanHistory.overall_match_score)
+        ).filter(
+            ScanHistory.user_id == user_id,
+            ScanHistory.resume_id.isnot(None)
+        ).group_by(ScanHistory.resume_id).all()
+
+        stats = UserStats.query.get(user_id)
+        if stats is None:
+            stats = UserStats(user_id=user_id)
+            db.session.add(stats)
+
+        (stats.last_scan_id, stats.total_scans, stats.score_sum, stats.min_score, stats.max_score,
+         stats.excellent_count, stats.good_count, stats.fair_count, stats.poor_count) = row
+        stats.resume_scores = {
+            str(resume_id): [count, total] for resume_id, count, total in per_resume
+        }
+        return stats
+
+    def get_stats(self, user_id: int) -> Dict:
+        """
+        Dashboard statistics of a user
+
+        A missing or stale summary is rebuilt and flushed; the caller commits it.
+
+        Returns:
+            Dict with total_scans, recent_scans_7_days, score_statistics,
+            score_distribution and top_performing_resume (or None)
+        """
+        user_id = int(user_id)
+        stats = UserStats.query.get(user_id)
+        latest_scan_id = db.session.query(func.max(ScanHistory.id)).filter(
+            ScanHistory.user_id == user_id
+        ).scalar()
+
+        # Missing for users with older scans; out of date if a write bypassed record_scan
+        if stats is None or stats.last_scan_id != latest_scan_id:
+            # Only flushed: the calling route commits it together with the rest of its request
+            stats = self.rebuild(user_id)
+            try:
+                db.session.flush()
+            except Exception as e:
+                logger.warning(f"Could not write stats summary for user {user_id}: {e}")
+                raise
+
+        # A sliding window cannot be kept incrementally; this count only touches recent rows
+        seven_days_ago = datetime.utcnow() - timedelta(days=7)
+        recent_scans = ScanHistory.query.filter(
+            ScanHistory.user_id == user_id,
+            ScanHistory.created_at >= seven_days_ago
+        ).count()
+
+        average = stats.score_sum / stats.total_scans if stats.total_scans else None
+
+        return {
+            'total_scans': stats.total_scans,
+            'recent_scans_7_days': recent_scans,
+            'score_statistics': {
+                'average_score': round(average, 2) if average else 0,
+                'highest_score': round(stats.max_score, 2) if stats.max_score else 0,
+                'lowest_score': round(stats.min_score, 2) if stats.min_score else 0
+            },
+            'score_distribution': {
+                'excellent': stats.excellent_count,  # 80-100%
+                'good': stats.good_count,            # 60-79%
+                'fair': stats.fair_count,            # 40-59%
+                'poor': stats.poor_count             # 0-39%
+            },
+            'top_performing_resume': self._top_resume(user_id, stats.resume_scores or {})
+        }
+
+    @staticmethod
+    def _bucket_conditions():
+        """SQL conditions matching ScanHistory.score_category_for, in BUCKET_COLUMNS order"""
+        score = ScanHistory.overall_match_score
+        return (
+            score >= 80,
+            (score >= 60) & (score < 80),
+            (score >= 40) & (score < 60),
+            score < 40
+        )
+
+    @staticmethod
+    def _top_resume(user_id: int, resume_scores: Dict) -> Optional[Dict]:
+        """Active resume with the highest average scan score"""
+        if not resume_scores:
+            return None
+
+        active_resumes = Resume.query.with_entities(
+            Resume.id, Resume.title, Resume.original_filename
+        ).filter(
+            Resume.user_id == user_id,
+            Resume.is_active == True,
+            Resume.id.in_([int(resume_id) for resume_id in resume_scores])
+        ).all()
+        if not active_resumes:
+            return None
+
+        def average(resume):
+            count, total = resume_scores[str(resume.id)]
+            return total / count
+
+        best = max(active_resumes, key=average)
+        count, _ = resume_scores[str(best.id)]
+        return {
+            'id': best.id,
+            'title': best.title or 'Untitled Resume',
+            'filename': best.original_filename,
+            'average_score': round(average(best), 2),
+            'scan_count': count
+        }
@@ -1494,21 +1494,16 @@ function handleFileSelect(event) {
             })
             .then(result => {
                 console.log('✅ Upload result:', result);
-                if (result && result.success) {
-                    showNotification('Resume uploaded and keywords extracted!', 'success');
+                if (result && result.success && result.processing_job) {
+                    // Parsing runs in the background - poll until keywords are ready
+                    console.log('📄 Resume ID:', result.resume?.id, '⏳ Processing job:', result.processing_job.id);
+                    showNotification('Resume uploaded, extracting keywords...', 'info');
+                    loadSavedResumes();
+                    waitForResumeProcessing(result.status_url, token);
+                } else if (result && result.success) {
                     console.log('📄 Resume ID:', result.resume?.id);
                     console.log('🔍 Keywords extracted:', result.keywords_extracted);
-
-                    // Refresh the dashboard data
-                    loadDashboardStats();
-                    loadSavedResumes();
-                    loadRecentScanHistory();
-
-                    // Calculate matching score if both resume and JD exist
-                    calculateMatchingScoreIfReady();
-
-                    // DO NOT auto-load suggestions - user must click the buttons manually
-                    console.log('📝 Resume uploaded successfully. User can now generate suggestions manually.');
+                    onResumeProcessed();
                 } else if (result) {
                     console.log('❌ Upload failed:', result.message);
                     showNotification(result.message || 'Upload failed', 'error');
@@ -1528,6 +1523,57 @@ function handleFileSelect(event) {
     }
 }
 
+function onResumeProcessed() {
+    showNotification('Resume uploaded and keywords extracted!', 'success');
+
+    // Refresh the dashboard data
+    loadDashboardStats();
+    loadSavedResumes();
+    loadRecentScanHistory();
+
+    // Calculate matching score if both resume and JD exist
+    calculateMatchingScoreIfReady();
+
+    // DO NOT auto-load suggestions - user must click the buttons manually
+    console.log('📝 Resume uploaded successfully. User can now generate suggestions manually.');
+}
+
+function waitForResumeProcessing(statusUrl, token, attempt = 0) {
+    const POLL_INTERVAL_MS = 1500;
+    const MAX_ATTEMPTS = 80;  // ~2 minutes
+
+    if (attempt >= MAX_ATTEMPTS) {
+        showNotification('Resume is still processing. Refresh the page in a moment.', 'info');
+        return;
+    }
+
+    setTimeout(() => {
+        fetch(`${API_BASE_URL}${statusUrl}`, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        })
+        .then(response => response.json())
+        .then(status => {
+            const job = status.processing_job;
+            console.log('⏳ Processing status:', job?.stage, job?.progress);
+
+            if (!status.success) {
+                showNotification(status.message || 'Could not check processing status', 'error');
+            } else if (status.upload_status === 'completed') {
+                onResumeProcessed();
+            } else if (status.upload_status === 'failed') {
+                loadSavedResumes();
+                showNotification(`Resume parsing failed: ${status.error_message || job?.error_message || 'Unknown error'}`, 'error');
+            } else {
+                waitForResumeProcessing(statusUrl, token, attempt + 1);
+            }
+        })
+        .catch(error => {
+            console.error('❌ Processing status error:', error);
+            waitForResumeProcessing(statusUrl, token, attempt + 1);
+        });
+    }, POLL_INTERVAL_MS);
+}
+
 function handleDragOver(event) {
     event.preventDefault();
     event.currentTarget.style.borderColor = '#94a3af';